@@ -5,21 +5,40 @@ Provides REST API for frontend integration without relative imports
 
 import os
 import base64
+import copy
+import json
+import math
+import shutil
 import tempfile
 import sys
+import time
 from pathlib import Path
 
 # Add src directory to Python path
 src_path = Path(__file__).parent / 'src'
 sys.path.insert(0, str(src_path))
 
-from flask import Flask, request, jsonify, send_from_directory
+from flask import Flask, Response, g, request, jsonify, send_from_directory, stream_with_context
 from flask_cors import CORS
+from werkzeug.exceptions import RequestEntityTooLarge
 import logging
 
 # Import modules directly
-from convert import run as convert_run
-from utils import load_env, load_yaml_config
+from convert import perform_data_quality_check, run as convert_run
+from excel_parser import frame_records, read_excel_records, read_table
+from file_store import FileStore
+from jira_client import JiraConfig
+from job_manager import JobManager
+from parse_pool import ParsePool, ParsePoolBusy
+from result_cache import LRUCache
+from run_metrics import RunMetrics
+import service_metrics
+import tracing
+from speculative import SpeculativeEnrichment
+from utils import load_env, sha256_file, validate_config
+
+# Settings below and the OpenAI key may come from .env
+load_env()
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -31,15 +50,219 @@ CORS(app)  # Enable CORS for frontend integration
 # Configuration
 UPLOAD_FOLDER = 'uploads'
 ALLOWED_EXTENSIONS = {'xlsx', 'xls', 'csv'}
+JOB_STATE_FOLDER = 'jobs'
+JOB_WORKERS = int(os.environ.get('JOB_WORKERS', '2'))
+JOB_RETENTION_SECONDS = int(os.environ.get('JOB_RETENTION_SECONDS', str(7 * 24 * 3600)))
+JOB_MAX_FINISHED = int(os.environ.get('JOB_MAX_FINISHED', '500'))
+MAX_UPLOAD_MB = int(os.environ.get('MAX_UPLOAD_MB', '50'))
+FILE_STORE_FOLDER = 'files'
+FILE_STORE_TTL_SECONDS = int(os.environ.get('FILE_STORE_TTL_SECONDS', str(24 * 3600)))
+FILE_STORE_MAX_MB = int(os.environ.get('FILE_STORE_MAX_MB', '1024'))
+UPLOAD_CHUNK_SIZE = 1024 * 1024
+REQUIRED_VALIDATION_FIELDS = ['requirement_id', 'requirement', 'description', 'priority']
+VALID_PRIORITIES = ['P0', 'P1', 'P2', 'P3', 'P4']
+VALIDATION_PAGE_SIZE = 100
+MAX_VALIDATION_PAGE_SIZE = 1000
+VALIDATION_CACHE_ENTRIES = int(os.environ.get('VALIDATION_CACHE_ENTRIES', '16'))
+PARSE_WORKERS = int(os.environ.get('PARSE_WORKERS', '2'))
+PARSE_QUEUE_LIMIT = int(os.environ.get('PARSE_QUEUE_LIMIT', '8'))
+PARSE_RETRY_AFTER_SECONDS = 5
+
+# Reject oversized bodies before they are read
+app.config['MAX_CONTENT_LENGTH'] = MAX_UPLOAD_MB * 1024 * 1024
 
 # Ensure upload directory exists
 os.makedirs(UPLOAD_FOLDER, exist_ok=True)
 
+# Sheet parsing runs in worker processes, forked by __main__ before the server starts
+# (an embedding server should call parse_pool.start() likewise; otherwise on first use)
+parse_pool = ParsePool(PARSE_WORKERS, PARSE_QUEUE_LIMIT)
+service_metrics.PARSE_TASKS_PENDING.set_function(parse_pool.pending)
+
+# Background LLM enrichment started at validate time, keyed by file hash
+speculative_enrichment = SpeculativeEnrichment()
+
+# Uploaded workbooks stored once by content hash and referenced by fileId
+file_store = FileStore(FILE_STORE_FOLDER, ttl_seconds=FILE_STORE_TTL_SECONDS, max_bytes=FILE_STORE_MAX_MB * 1024 * 1024)
+
+# Validation records per fileId, served page by page after /api/validate
+validation_cache = LRUCache(VALIDATION_CACHE_ENTRIES)
+
+# Background conversion jobs, persisted under JOB_STATE_FOLDER
+job_manager = JobManager(
+    JOB_STATE_FOLDER, max_workers=JOB_WORKERS,
+    retention_seconds=JOB_RETENTION_SECONDS, max_finished=JOB_MAX_FINISHED
+)
+service_metrics.JOBS_ACTIVE.set_function(job_manager.active_count)
+
+# Trace spans go to TRACE_FILE (JSON lines) or OTLP_ENDPOINT when configured
+tracing.configure_from_env()
+
+@app.before_request
+def start_request_timer():
+    g.request_started = time.perf_counter()
+    service_metrics.HTTP_REQUESTS_IN_FLIGHT.inc()
+    route = request.url_rule.rule if request.url_rule else 'unmatched'
+    g.trace_span, g.trace_token = tracing.begin_span(
+        f"{request.method} {route}",
+        **{'http.method': request.method, 'http.route': route}
+    )
+
+@app.after_request
+def record_request_metrics(response):
+    """Observe latency per route; streamed responses (SSE, NDJSON) are timed until their headers are ready"""
+    started = g.pop('request_started', None)
+    if started is not None:
+        service_metrics.HTTP_REQUESTS_IN_FLIGHT.dec()
+        endpoint = request.url_rule.rule if request.url_rule else 'unmatched'
+        service_metrics.HTTP_REQUEST_SECONDS.observe(
+            time.perf_counter() - started,
+            method=request.method,
+            endpoint=endpoint,
+            status=str(response.status_code)
+        )
+    span = g.get('trace_span')
+    if span is not None:
+        span.set_attribute('http.status_code', response.status_code)
+    return response
+
+@app.teardown_request
+def end_request_span(error=None):
+    span = g.pop('trace_span', None)
+    if span is not None:
+        if error is not None:
+            span.record_error(error)
+        tracing.finish_span(span, g.pop('trace_token', None))
+
 def allowed_file(filename):
     """Check if file extension is allowed"""
     return '.' in filename and \
            filename.rsplit('.', 1)[1].lower() in ALLOWED_EXTENSIONS
 
+class UploadError(Exception):
+    """Raised when a request does not carry a usable file upload"""
+    
+    def __init__(self, message, status=400):
+        super().__init__(message)
+        self.status = status
+
+def _temp_upload_file(filename):
+    return tempfile.NamedTemporaryFile(
+        delete=False,
+        suffix=f'.{filename.split(".")[-1]}',
+        dir=UPLOAD_FOLDER
+    )
+
+def save_stream_file(stream, filename):
+    """Copy a file-like upload to a temporary file in fixed-size chunks"""
+    temp_file = _temp_upload_file(filename)
+    try:
+        shutil.copyfileobj(stream, temp_file, UPLOAD_CHUNK_SIZE)
+        temp_file.close()
+        return temp_file.name
+    except Exception as e:
+        temp_file.close()
+        os.unlink(temp_file.name)
+        logger.error(f"Error saving uploaded file: {e}")
+        raise
+
+def _parse_bool(value):
+    if isinstance(value, bool):
+        return value
+    return str(value or '').strip().lower() in ('1', 'true', 'yes', 'on')
+
+def _parse_jira_config(value):
+    """jiraConfig as a dict, from a JSON string or an already decoded value ({} if absent)"""
+    if isinstance(value, str):
+        try:
+            value = json.loads(value or '{}')
+        except ValueError:
+            raise UploadError('jiraConfig must be a JSON object')
+    if value is None:
+        return {}
+    if not isinstance(value, dict):
+        raise UploadError('jiraConfig must be a JSON object')
+    return value
+
+def receive_upload():
+    """
+    Resolve the request's workbook to a file store entry
+    Returns (entry, file_name, options); the entry is pinned against eviction,
+    so call file_store.release(entry['id']) once the file is no longer needed.
+    
+    Supported request bodies:
+    - multipart/form-data with a 'file' part; options as form fields
+      (jiraConfig as a JSON string)
+    - a raw file body (e.g. application/octet-stream) with fileName and
+      options in the query string; the query string does not take jiraConfig,
+      send it as JSON in the X-Jira-Config header instead
+    - JSON with base64 'fileContent' (kept for existing clients)
+    Any of them may pass a 'fileId' from POST /api/files instead of the file.
+    
+    Multipart and raw bodies are spooled to disk in chunks instead of being
+    held in memory. options holds 'enableQualityCheck' and 'jiraConfig'.
+    """
+    try:
+        temp_file_path, file_id, file_name, options = _read_upload()
+    except RequestEntityTooLarge:
+        raise UploadError(f'File too large (limit {MAX_UPLOAD_MB} MB)', status=413)
+    
+    if temp_file_path:
+        entry = file_store.put(temp_file_path, file_name or 'requirements.xlsx', pin=True)
+    else:
+        entry = file_store.acquire(file_id)
+        if entry is None:
+            raise UploadError('Unknown or expired fileId; upload the file again', status=404)
+    return entry, file_name or entry['fileName'], options
+
+def _read_upload():
+    """Return (temp_file_path, file_id, file_name, options); exactly one of the first two is set"""
+    if request.mimetype == 'multipart/form-data':
+        upload = request.files.get('file')
+        file_id = request.form.get('fileId')
+        if not file_id and (upload is None or not upload.filename):
+            raise UploadError('No file provided')
+        file_name = request.form.get('fileName') or (upload.filename if upload else None)
+        options = {
+            'enableQualityCheck': _parse_bool(request.form.get('enableQualityCheck')),
+            'jiraConfig': _parse_jira_config(request.form.get('jiraConfig'))
+        }
+        if file_id:
+            return None, file_id, file_name, options
+        return save_stream_file(upload.stream, file_name), None, file_name, options
+    
+    if request.is_json:
+        data = request.get_json(silent=True)
+        if not data:
+            raise UploadError('No JSON data provided')
+        file_content = data.get('fileContent')
+        file_id = data.get('fileId')
+        if not file_content and not file_id:
+            raise UploadError('No file content provided')
+        file_name = data.get('fileName')
+        options = {
+            'enableQualityCheck': bool(data.get('enableQualityCheck', False)),
+            'jiraConfig': _parse_jira_config(data.get('jiraConfig'))
+        }
+        if file_id:
+            return None, file_id, file_name, options
+        file_name = file_name or 'requirements.xlsx'
+        return save_base64_file(file_content, file_name), None, file_name, options
+    
+    file_id = request.args.get('fileId')
+    file_name = request.args.get('fileName')
+    options = {
+        'enableQualityCheck': _parse_bool(request.args.get('enableQualityCheck')),
+        # Credentials stay out of URLs (and access logs)
+        'jiraConfig': _parse_jira_config(request.headers.get('X-Jira-Config'))
+    }
+    if file_id:
+        return None, file_id, file_name, options
+    if not request.content_length and not request.headers.get('Transfer-Encoding'):
+        raise UploadError('No file content provided')
+    file_name = file_name or 'requirements.xlsx'
+    return save_stream_file(request.stream, file_name), None, file_name, options
+
 def save_base64_file(base64_content, filename):
     """Save base64 content to temporary file"""
     try:
@@ -47,11 +270,7 @@ def save_base64_file(base64_content, filename):
         file_content = base64.b64decode(base64_content)
         
         # Create temporary file
-        temp_file = tempfile.NamedTemporaryFile(
-            delete=False, 
-            suffix=f'.{filename.split(".")[-1]}',
-            dir=UPLOAD_FOLDER
-        )
+        temp_file = _temp_upload_file(filename)
         temp_file.write(file_content)
         temp_file.close()
         
@@ -60,6 +279,48 @@ def save_base64_file(base64_content, filename):
         logger.error(f"Error saving base64 file: {e}")
         raise
 
+def _enrich_file(file_path, progress=None):
+    """Run the data quality check for a private copy of an upload, then remove the copy"""
+    try:
+        with tracing.start_span('enrichment', file=os.path.basename(file_path)):
+            # Failures propagate so the speculative registry does not keep them as results
+            return perform_data_quality_check(file_path, True, "1. Requirements - Internal", progress=progress, raise_errors=True)
+    finally:
+        try:
+            os.unlink(file_path)
+        except OSError:
+            pass
+
+def _private_copy(file_path, file_hash):
+    """Copy an upload under a unique name for one enrichment run"""
+    extension = file_path.rsplit('.', 1)[-1]
+    fd, private_copy = tempfile.mkstemp(dir=UPLOAD_FOLDER, prefix=f"enrich_{file_hash[:12]}_", suffix=f".{extension}")
+    os.close(fd)
+    shutil.copyfile(file_path, private_copy)
+    return private_copy
+
+def start_speculative_enrichment(file_path, progress=None, file_hash=None):
+    """Kick off background enrichment for an uploaded file unless it is already running; returns (hash key, started)"""
+    file_hash = file_hash or sha256_file(file_path)
+    # Only the caller that starts the job makes the private copy
+    _, started = speculative_enrichment.start(
+        file_hash, tracing.bind(_enrich_file), progress,
+        prepare=lambda: _private_copy(file_path, file_hash)
+    )
+    return file_hash, started
+
+def collect_enrichment(file_path, progress=None, file_hash=None):
+    """Reuse speculative enrichment for this file, waiting only for the unfinished part"""
+    file_hash = file_hash or sha256_file(file_path)
+    _, started = start_speculative_enrichment(file_path, progress, file_hash)
+    already_started = not started
+    service_metrics.CACHE_REQUESTS.inc(cache='enrichment', result='hit' if already_started else 'miss')
+    quality_data = speculative_enrichment.result(file_hash)
+    if already_started and progress and quality_data:
+        # Enrichment ran before this job subscribed; report it in one event
+        progress('rows_enriched', {'count': len(quality_data['results']), 'speculative': True})
+    return quality_data
+
 @app.route('/')
 def index():
     """Serve the main HTML page"""
@@ -80,14 +341,215 @@ def health_check():
     """Health check endpoint"""
     return jsonify({
         'status': 'healthy',
-        'message': 'Peak3 Requirements Automation API is running'
+        'message': 'Peak3 Requirements Automation API is running',
+        'parsePool': parse_pool.stats()
+    })
+
+@app.route('/api/metrics', methods=['GET'])
+def get_metrics():
+    """Service metrics in the Prometheus text exposition format"""
+    return Response(service_metrics.REGISTRY.render(), mimetype='text/plain; version=0.0.4')
+
+JIRA_CONFIG_REQUIRED_ERROR = 'Jira configuration required. Please fill in all Jira connection fields or set environment variables (JIRA_BASE_URL, JIRA_EMAIL, JIRA_API_TOKEN, JIRA_PROJECT_KEY).'
+
+def resolve_jira_config(jira_config):
+    """Return the request's Jira config, falling back to environment variables; None if neither is complete"""
+    if jira_config and jira_config.get('baseUrl'):
+        return jira_config
+    
+    # Try to load from environment variables
+    env_base_url = os.environ.get('JIRA_BASE_URL', '')
+    env_email = os.environ.get('JIRA_EMAIL', '')
+    env_token = os.environ.get('JIRA_API_TOKEN', '')
+    env_project = os.environ.get('JIRA_PROJECT_KEY', '')
+    
+    if env_base_url and env_email and env_token and env_project:
+        logger.info("Using Jira config from environment variables")
+        return {
+            'baseUrl': env_base_url,
+            'email': env_email,
+            'apiToken': env_token,
+            'projectKey': env_project
+        }
+    
+    logger.warning("No Jira config provided and environment variables not set")
+    return None
+
+# Conversion settings shared by every API request; only the project key varies
+REQUEST_EXCEL_CONFIG = {
+    'sheet_name': "1. Requirements - Internal",
+    'columns': {
+        'requirement_id': "Requirement ID",
+        'requirement': "Requirement",
+        'description': "Description",
+        'priority': "Priority",
+        'domain': "Domain",
+        'sub_domain': "Sub-domain",
+        'requirement_type': "Requirement type"
+    }
+}
+REQUEST_PRIORITY_MAPPING = {
+    "P0": "Highest",
+    "P1": "High",
+    "P2": "Medium",
+    "P3": "Low",
+    "P4": "Lowest"
+}
+
+def build_request_config(project_key='SCRUM'):
+    """Build the validated, in-memory conversion config for one API request"""
+    return validate_config({
+        'excel': copy.deepcopy(REQUEST_EXCEL_CONFIG),
+        'jira': {
+            'project_key': project_key,
+            'priority_mapping': dict(REQUEST_PRIORITY_MAPPING)
+        },
+        'llm': {
+            'enable_quality_check': True,
+            'enable_smart_summary': True
+        }
     })
 
+def config_sheet_name(config):
+    """Worksheet a request config reads from"""
+    return config['excel'].get('sheet_name', '1. Requirements - Internal')
+
+def convert_file(temp_file_path, jira_config, enable_quality_check=False, progress=None, wait_for_parser=False):
+    """
+    Run the dry-run check and the real conversion for a saved upload.
+    
+    Returns the formatted Jira results for the frontend, with the creation
+    run's timings and Jira API statistics under 'metrics'. The uploaded file
+    itself is left in place for the caller to clean up. The sheet is parsed
+    once in the parse pool; when the pool is full, ParsePoolBusy is raised
+    unless wait_for_parser is set (background jobs wait for a slot).
+    """
+    service_metrics.CONVERSIONS_IN_FLIGHT.inc()
+    try:
+        with tracing.start_span('convert_file', project_key=jira_config.get('projectKey', ''), quality_check=bool(enable_quality_check)):
+            return _convert_file(temp_file_path, jira_config, enable_quality_check, progress, wait_for_parser)
+    finally:
+        service_metrics.CONVERSIONS_IN_FLIGHT.dec()
+
+def _convert_file(temp_file_path, jira_config, enable_quality_check, progress, wait_for_parser):
+    logger.info(f"Using Jira config: {jira_config.get('baseUrl')} - {jira_config.get('projectKey')}")
+    
+    # Credentials stay scoped to this request; nothing is written to os.environ,
+    # so concurrent conversions for different Jira tenants do not interfere
+    request_jira_config = JiraConfig.from_request(jira_config)
+    
+    config = build_request_config(jira_config.get('projectKey', 'SCRUM'))
+    
+    def stage(name):
+        if progress:
+            progress('stage', {'stage': name})
+    
+    # Pick up enrichment started at validate time (or run it now)
+    quality_data = None
+    if enable_quality_check:
+        stage('enriching')
+        logger.info("Collecting LLM enrichment...")
+        quality_data = collect_enrichment(temp_file_path, progress)
+    
+    # Run conversion (dry run first to validate); both runs reuse one parse
+    stage('validating')
+    logger.info("Running dry run validation...")
+    records = parse_pool.run(read_excel_records, temp_file_path, config_sheet_name(config), block=wait_for_parser)
+    convert_run(
+        excel_path=temp_file_path,
+        config_path=None,
+        config=config,
+        dry_run=True,
+        enable_quality_check=False,  # Skip AI check in dry run
+        jira_config=request_jira_config,
+        quality_data=quality_data,
+        quiet=True,
+        records=records
+    )
+    logger.info("Dry run validation completed successfully")
+    
+    # Run actual conversion (skip AI check for speed)
+    stage('creating')
+    logger.info("Creating Jira tickets...")
+    metrics = RunMetrics(track_memory=False)
+    jira_tickets_raw = convert_run(
+        excel_path=temp_file_path,
+        config_path=None,
+        config=config,
+        enable_quality_check=False,  # Enrichment, if requested, was collected above
+        dry_run=False,
+        jira_config=request_jira_config,
+        quality_data=quality_data,
+        progress=progress,
+        metrics=metrics,
+        quiet=True,
+        records=records
+    )
+    logger.info("Jira ticket creation completed successfully")
+    
+    # Generate formatted results for frontend
+    results = generate_jira_results(jira_tickets_raw, jira_config)
+    results['metrics'] = metrics.summary()
+    return results
+
+@app.route('/api/files', methods=['POST'])
+def upload_file():
+    """
+    Store a requirements file once and return its fileId
+    Accepts the same upload formats as /api/process. Identical content maps to
+    the same fileId, which /api/validate, /api/process and /api/jobs accept in
+    place of the file itself.
+    """
+    try:
+        entry, file_name, _ = receive_upload()
+        file_store.release(entry['id'])
+        logger.info(f"Stored file {file_name} as {entry['id'][:12]}")
+        
+        return jsonify({
+            'success': True,
+            'fileId': entry['id'],
+            'fileName': file_name,
+            'size': entry['size']
+        }), 201
+        
+    except UploadError as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), e.status
+    except Exception as e:
+        logger.error(f"Error storing file: {e}")
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
+
+@app.route('/api/files/<file_id>', methods=['GET'])
+def get_file_info(file_id):
+    """Return metadata for a stored file, or 404 once it has been evicted"""
+    entry = file_store.get(file_id)
+    if not entry:
+        return jsonify({
+            'success': False,
+            'error': 'File not found'
+        }), 404
+    
+    return jsonify({
+        'success': True,
+        'fileId': entry['id'],
+        'fileName': entry['fileName'],
+        'size': entry['size'],
+        'storedAt': entry['storedAt']
+    })
+
+
 @app.route('/api/process', methods=['POST'])
 def process_requirements():
     """
     Process requirements file and create Jira tickets
-    Expected payload:
+    Accepts a multipart/form-data or raw file upload (see receive_upload), or
+    the legacy JSON payload:
     {
         "fileContent": "base64_encoded_file_content",
         "fileName": "requirements.xlsx",
@@ -100,267 +562,224 @@ def process_requirements():
     }
     """
     try:
-        # Get request data first
-        data = request.get_json()
-        if not data:
-            return jsonify({
-                'success': False,
-                'error': 'No JSON data provided'
-            }), 400
-        
-        file_content = data.get('fileContent')
-        file_name = data.get('fileName', 'requirements.xlsx')
-        jira_config = data.get('jiraConfig', {})
+        # Resolve the uploaded or previously stored file first
+        entry, file_name, options = receive_upload()
+        temp_file_path = entry['path']
         
-        # Debug: Log the received jira_config
-        logger.info(f"Received jira_config: {jira_config}")
-        
-        # If no jira_config provided, try environment variables or return error
-        if not jira_config or not jira_config.get('baseUrl'):
-            # Try to load from environment variables
-            env_base_url = os.environ.get('JIRA_BASE_URL', '')
-            env_email = os.environ.get('JIRA_EMAIL', '')
-            env_token = os.environ.get('JIRA_API_TOKEN', '')
-            env_project = os.environ.get('JIRA_PROJECT_KEY', '')
-            
-            if env_base_url and env_email and env_token and env_project:
-                logger.info("Using Jira config from environment variables")
-                jira_config = {
-                    'baseUrl': env_base_url,
-                    'email': env_email,
-                    'apiToken': env_token,
-                    'projectKey': env_project
-                }
-            else:
-                logger.warning("No Jira config provided and environment variables not set")
+        try:
+            # If no jira_config provided, try environment variables or return error
+            jira_config = resolve_jira_config(options['jiraConfig'])
+            if not jira_config:
                 return jsonify({
                     'success': False,
-                    'error': 'Jira configuration required. Please fill in all Jira connection fields or set environment variables (JIRA_BASE_URL, JIRA_EMAIL, JIRA_API_TOKEN, JIRA_PROJECT_KEY).'
+                    'error': JIRA_CONFIG_REQUIRED_ERROR
                 }), 400
+            
+            logger.info(f"Processing file: {file_name}")
+            enable_quality_check = options['enableQualityCheck']
+            jira_results = convert_file(temp_file_path, jira_config, enable_quality_check)
+            
+            return jsonify({
+                'success': True,
+                'message': 'Requirements processed and Jira tickets created successfully',
+                'fileName': file_name,
+                'fileId': entry['id'],
+                'jiraResults': jira_results
+            })
+            
+        finally:
+            # The stored file stays available for later requests until evicted
+            file_store.release(entry['id'])
+            
+    except UploadError as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), e.status
+    except ParsePoolBusy as e:
+        return parse_pool_busy(e)
+    except Exception as e:
+        logger.error(f"Error processing requirements: {e}")
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
+
+@app.route('/api/jobs', methods=['POST'])
+def create_job():
+    """
+    Start processing a requirements file in the background
+    Accepts the same payload as /api/process and returns immediately with a
+    job id; poll GET /api/jobs/<job_id> for status, progress and jiraResults.
+    """
+    try:
+        entry, file_name, options = receive_upload()
+        temp_file_path = entry['path']
+        enable_quality_check = options['enableQualityCheck']
         
-        if not file_content:
+        jira_config = resolve_jira_config(options['jiraConfig'])
+        if not jira_config:
+            file_store.release(entry['id'])
             return jsonify({
                 'success': False,
-                'error': 'No file content provided'
+                'error': JIRA_CONFIG_REQUIRED_ERROR
             }), 400
         
-        logger.info(f"Processing file: {file_name}")
-        logger.info(f"Using Jira config: {jira_config.get('baseUrl')} - {jira_config.get('projectKey')}")
-        
-        # Set environment variables FIRST, before loading any config
-        original_env = {}
-        env_vars = {
-            'JIRA_BASE_URL': jira_config.get('baseUrl'),
-            'JIRA_EMAIL': jira_config.get('email'),
-            'JIRA_API_TOKEN': jira_config.get('apiToken'),
-            'JIRA_PROJECT_KEY': jira_config.get('projectKey')
-        }
-        
-        # Backup original env vars and set new ones
-        for key, value in env_vars.items():
-            if value:
-                original_env[key] = os.environ.get(key)
-                os.environ[key] = value
-                logger.info(f"Set {key} = {value[:20]}..." if len(str(value)) > 20 else f"Set {key} = {value}")
+        def run_job(progress):
+            try:
+                return convert_file(temp_file_path, jira_config, enable_quality_check, progress=progress, wait_for_parser=True)
+            finally:
+                file_store.release(entry['id'])
         
-        # Load environment and configuration AFTER setting our values
-        # Don't call load_env() here as it might override our manually set values
-        # load_env()
+        # The job's spans continue the trace of the request that queued it
+        job_id = job_manager.submit(tracing.bind(run_job), {'fileName': file_name, 'fileId': entry['id']})
+        logger.info(f"Queued job {job_id} for file: {file_name}")
         
-        # Save file from base64 content
-        temp_file_path = save_base64_file(file_content, file_name)
+        return jsonify({
+            'success': True,
+            'jobId': job_id,
+            'fileId': entry['id'],
+            'statusUrl': f'/api/jobs/{job_id}'
+        }), 202
         
-        try:
-            # Create temporary config file for this request
-            config_data = {
-                'excel': {
-                    'sheet_name': "1. Requirements - Internal",
-                    'columns': {
-                        'requirement_id': "Requirement ID",
-                        'requirement': "Requirement",
-                        'description': "Description",
-                        'priority': "Priority",
-                        'domain': "Domain",
-                        'sub_domain': "Sub-domain",
-                        'requirement_type': "Requirement type"
-                    }
-                },
-                'jira': {
-                    'project_key': jira_config.get('projectKey', 'SCRUM'),
-                    'priority_mapping': {
-                        "P0": "Highest",
-                        "P1": "High",
-                        "P2": "Medium",
-                        "P3": "Low",
-                        "P4": "Lowest"
-                    }
-                },
-                'llm': {
-                    'enable_quality_check': True,
-                    'enable_smart_summary': True
-                }
-            }
-            
-            # Save config to temporary file
-            import yaml
-            temp_config_path = tempfile.NamedTemporaryFile(
-                delete=False, 
-                suffix='.yml',
-                mode='w'
-            )
-            yaml.dump(config_data, temp_config_path)
-            temp_config_path.close()
-            
-            try:
-                # Run conversion (dry run first to validate)
-                logger.info("Running dry run validation...")
-                convert_run(
-                    excel_path=temp_file_path,
-                    config_path=temp_config_path.name,
-                    dry_run=True,
-                    enable_quality_check=False,  # Skip AI check in dry run
-                    jira_config=jira_config
-                )
-                logger.info("Dry run validation completed successfully")
-                
-                # Run actual conversion (skip AI check for speed)
-                logger.info("Creating Jira tickets...")
-                jira_tickets_raw = convert_run(
-                    excel_path=temp_file_path,
-                    config_path=temp_config_path.name,
-                    enable_quality_check=False,  # Skip AI check for speed
-                    dry_run=False,
-                    jira_config=jira_config
-                )
-                logger.info("Jira ticket creation completed successfully")
-                
-                # Generate formatted results for frontend
-                jira_results = generate_jira_results(jira_tickets_raw, jira_config)
-                
-                return jsonify({
-                    'success': True,
-                    'message': 'Requirements processed and Jira tickets created successfully',
-                    'fileName': file_name,
-                    'jiraResults': jira_results
-                })
-                
-            finally:
-                # Restore original environment variables
-                for key, original_value in original_env.items():
-                    if original_value is None:
-                        os.environ.pop(key, None)
-                    else:
-                        os.environ[key] = original_value
-                
-                # Clean up temporary files
-                try:
-                    os.unlink(temp_file_path)
-                    os.unlink(temp_config_path.name)
-                except:
-                    pass
-                    
-        except Exception as e:
-            # Clean up temporary file on error
-            try:
-                os.unlink(temp_file_path)
-            except:
-                pass
-            raise e
-            
+    except UploadError as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), e.status
     except Exception as e:
-        logger.error(f"Error processing requirements: {e}")
+        logger.error(f"Error creating job: {e}")
         return jsonify({
             'success': False,
             'error': str(e)
         }), 500
 
 
+@app.route('/api/jobs/<job_id>', methods=['GET'])
+def get_job(job_id):
+    """Report a job's status, progress counters and, once finished, its jiraResults"""
+    job = job_manager.get(job_id)
+    if not job:
+        return jsonify({
+            'success': False,
+            'error': 'Job not found'
+        }), 404
+    
+    return jsonify({
+        'success': True,
+        'job': {
+            'id': job['id'],
+            'status': job['status'],
+            'fileName': job.get('fileName'),
+            'createdAt': job['createdAt'],
+            'startedAt': job['startedAt'],
+            'finishedAt': job['finishedAt'],
+            'progress': job['progress'],
+            'jiraResults': job['result'],
+            'error': job['error']
+        }
+    })
+
+
+@app.route('/api/jobs/<job_id>/events', methods=['GET'])
+def stream_job_events(job_id):
+    """
+    Stream a job's progress as Server-Sent Events
+    Events: job_status, stage, rows_parsed, row_enriched, rows_enriched,
+    epic_resolved, story_created, story_skipped, story_failed and job_finished.
+    Each event's data carries the event payload plus the current progress
+    counters (including stories/second throughput). Reconnecting clients
+    resume after the Last-Event-ID they received.
+    """
+    if not job_manager.get(job_id):
+        return jsonify({
+            'success': False,
+            'error': 'Job not found'
+        }), 404
+    
+    try:
+        after = int(request.headers.get('Last-Event-ID') or request.args.get('after', 0))
+    except ValueError:
+        after = 0
+    
+    def generate():
+        yield 'retry: 3000\n\n'
+        for event in job_manager.events(job_id, after=after):
+            if event is None:
+                yield ': keepalive\n\n'
+                continue
+            payload = json.dumps({'data': event['data'], 'progress': event['progress']})
+            yield f"id: {event['seq']}\nevent: {event['event']}\ndata: {payload}\n\n"
+    
+    return Response(stream_with_context(generate()), mimetype='text/event-stream', headers={
+        'Cache-Control': 'no-cache',
+        'X-Accel-Buffering': 'no'
+    })
+
+
 @app.route('/api/validate', methods=['POST'])
 def validate_requirements():
     """
     Validate requirements file without creating Jira tickets
+    Accepts the same upload formats as /api/process. The response carries the
+    totals and the first page of records; fetch further pages from
+    GET /api/validate/<fileId>/records. Pass ?pageSize=0 to get every record inline.
     """
     try:
-        data = request.get_json()
-        if not data:
-            return jsonify({
-                'success': False,
-                'error': 'No JSON data provided'
-            }), 400
-        
-        file_content = data.get('fileContent')
-        file_name = data.get('fileName', 'requirements.xlsx')
-        
-        if not file_content:
-            return jsonify({
-                'success': False,
-                'error': 'No file content provided'
-            }), 400
-        
-        # Save file from base64 content
-        temp_file_path = save_base64_file(file_content, file_name)
+        entry, file_name, options = receive_upload()
+        temp_file_path = entry['path']
+        enable_quality_check = options['enableQualityCheck']
         
         try:
-            # Create temporary config file
-            config_data = {
-                'excel': {
-                    'sheet_name': "1. Requirements - Internal",
-                    'columns': {
-                        'requirement_id': "Requirement ID",
-                        'requirement': "Requirement",
-                        'description': "Description",
-                        'priority': "Priority",
-                        'domain': "Domain",
-                        'sub_domain': "Sub-domain",
-                        'requirement_type': "Requirement type"
-                    }
-                },
-                'jira': {
-                    'project_key': 'SCRUM',
-                    'priority_mapping': {
-                        "P0": "Highest",
-                        "P1": "High",
-                        "P2": "Medium",
-                        "P3": "Low",
-                        "P4": "Lowest"
-                    }
-                }
-            }
+            # Start LLM enrichment now so it runs while the user reviews the results
+            if enable_quality_check and os.getenv("OPENAI_API_KEY"):
+                start_speculative_enrichment(temp_file_path, file_hash=entry['id'])
             
-            import yaml
-            temp_config_path = tempfile.NamedTemporaryFile(
-                delete=False, 
-                suffix='.yml',
-                mode='w'
+            config = build_request_config()
+            
+            # The workbook is parsed once in a worker process, which also builds the validation
+            # records and the plan; latencies measured here feed the plan, which runs out of process
+            records, validation_data, plan = parse_pool.run(
+                analyze_upload, temp_file_path, config, enable_quality_check, options['jiraConfig'].get('baseUrl'),
+                service_metrics.JIRA_REQUEST_SECONDS.mean(),
+                service_metrics.OPENAI_REQUEST_SECONDS.means('model', outcome='ok')
             )
-            yaml.dump(config_data, temp_config_path)
-            temp_config_path.close()
             
-            # Run dry run to validate
+            # Run dry run to validate (enrichment runs in the background instead)
             convert_run(
                 excel_path=temp_file_path,
-                config_path=temp_config_path.name,
-                dry_run=True
+                config_path=None,
+                dry_run=True,
+                enable_quality_check=False,
+                config=config,
+                quiet=True,
+                records=records
             )
             
-            # Generate validation data for frontend display
-            validation_data = generate_validation_data(temp_file_path, temp_config_path.name)
+            # Validation records are cached for paging and only the first page is returned inline
+            validation_cache.put(entry['id'], validation_data)
             
             return jsonify({
                 'success': True,
                 'message': 'File validation successful',
                 'fileName': file_name,
-                'validationData': validation_data
+                'fileId': entry['id'],
+                'validationData': summarize_validation_data(validation_data, entry['id']),
+                'plan': plan
             })
             
         finally:
-            # Clean up temporary files
-            try:
-                os.unlink(temp_file_path)
-                os.unlink(temp_config_path.name)
-            except:
-                pass
+            # The stored upload is kept for /api/process
+            file_store.release(entry['id'])
                 
+    except UploadError as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), e.status
+    except ParsePoolBusy as e:
+        return parse_pool_busy(e)
     except Exception as e:
         logger.error(f"Error validating requirements: {e}")
         return jsonify({
@@ -368,6 +787,58 @@ def validate_requirements():
             'error': str(e)
         }), 500
 
+@app.route('/api/validate/<file_id>/records', methods=['GET'])
+def get_validation_records(file_id):
+    """
+    Page through cached validation records for a file
+    Query parameters:
+    - page (1-based), pageSize (default 100, max 1000)
+    - status: all | valid | issues
+    - domain: exact domain match
+    - q: case-insensitive search in requirement ID and requirement text
+    - format=ndjson streams every matching record as one JSON object per line
+    """
+    validation_data = load_validation_data(file_id)
+    if validation_data is None:
+        return jsonify({
+            'success': False,
+            'error': 'No validation results for this file; validate it again'
+        }), 404
+    
+    records = filter_validation_records(
+        validation_data['records'],
+        status=request.args.get('status', 'all'),
+        domain=request.args.get('domain'),
+        query=request.args.get('q')
+    )
+    
+    if request.args.get('format') == 'ndjson':
+        def generate():
+            for record in records:
+                yield json.dumps(record) + '\n'
+        
+        return Response(stream_with_context(generate()), mimetype='application/x-ndjson', headers={
+            'X-Total-Count': str(len(records))
+        })
+    
+    try:
+        page = max(int(request.args.get('page', 1)), 1)
+        page_size = min(max(int(request.args.get('pageSize', VALIDATION_PAGE_SIZE)), 1), MAX_VALIDATION_PAGE_SIZE)
+    except ValueError:
+        return jsonify({
+            'success': False,
+            'error': 'page and pageSize must be integers'
+        }), 400
+    
+    return jsonify({
+        'success': True,
+        'page': page,
+        'pageSize': page_size,
+        'total': len(records),
+        'totalPages': max(math.ceil(len(records) / page_size), 1),
+        'records': records[(page - 1) * page_size:page * page_size]
+    })
+
 @app.errorhandler(404)
 def not_found(error):
     return jsonify({
@@ -382,8 +853,17 @@ def internal_error(error):
         'error': 'Internal server error'
     }), 500
 
-def generate_validation_data(excel_path, config_path):
-    """Generate validation data for frontend display"""
+@app.errorhandler(ParsePoolBusy)
+def parse_pool_busy(error):
+    response = jsonify({
+        'success': False,
+        'error': str(error)
+    })
+    response.headers['Retry-After'] = str(PARSE_RETRY_AFTER_SECONDS)
+    return response, 503
+
+def generate_validation_data(excel_path, config, df=None):
+    """Generate validation data for frontend display from an in-memory config (df: the sheet, if already read)"""
     try:
         import pandas as pd
         import sys
@@ -391,14 +871,12 @@ def generate_validation_data(excel_path, config_path):
         # Set encoding to UTF-8 to avoid Unicode issues
         sys.stdout.reconfigure(encoding='utf-8')
         
-        # Load configuration
-        config = load_yaml_config(config_path)
-        
-        # Read CSV file directly with pandas to avoid Unicode issues
-        if excel_path.endswith('.csv'):
-            df = pd.read_csv(excel_path, encoding='utf-8-sig')  # utf-8-sig handles BOM
-        else:
-            df = pd.read_excel(excel_path, sheet_name=config['excel'].get('sheet_name', '1. Requirements - Internal'))
+        if df is None:
+            # Read CSV file directly with pandas to avoid Unicode issues
+            if excel_path.endswith('.csv'):
+                df = pd.read_csv(excel_path, encoding='utf-8-sig')  # utf-8-sig handles BOM
+            else:
+                df = pd.read_excel(excel_path, sheet_name=config_sheet_name(config))
         
         # Debug: Print original column names
         logger.info(f"Original columns: {list(df.columns)}")
@@ -417,37 +895,7 @@ def generate_validation_data(excel_path, config_path):
         # Debug: Print mapped column names
         logger.info(f"Mapped columns: {list(df.columns)}")
         
-        validation_results = []
-        
-        for index, row in df.iterrows():
-            issues = []
-            
-            # Check for missing required fields
-            required_fields = ['requirement_id', 'requirement', 'description', 'priority']
-            for field in required_fields:
-                if pd.isna(row.get(field)) or str(row.get(field)).strip() == '':
-                    issues.append(f"Missing {field}")
-            
-            # Check priority format
-            priority = str(row.get('priority', '')).strip()
-            if priority and priority not in ['P0', 'P1', 'P2', 'P3', 'P4']:
-                issues.append(f"Invalid priority format: {priority}")
-            
-            # Check requirement length
-            requirement = str(row.get('requirement', '')).strip()
-            if requirement and len(requirement) < 10:
-                issues.append("Requirement too short (minimum 10 characters)")
-            
-            validation_results.append({
-                'requirementId': str(row.get('requirement_id', '')),
-                'requirement': requirement,
-                'description': str(row.get('description', '')),
-                'priority': priority,
-                'domain': str(row.get('domain', '')),
-                'subDomain': str(row.get('sub_domain', '')),
-                'hasIssues': len(issues) > 0,
-                'issues': issues
-            })
+        validation_results = build_validation_records(df)
         
         total_records = len(validation_results)
         valid_records = sum(1 for r in validation_results if not r['hasIssues'])
@@ -469,6 +917,149 @@ def generate_validation_data(excel_path, config_path):
             'records': []
         }
 
+def plan_conversion(file_path, config, enable_quality_check, jira_base_url=None, measured_jira_latency=None, measured_llm_latencies=None, df=None):
+    """
+    Projected Jira calls, LLM tokens and wall time for processing this file; None if planning fails
+    
+    Runs in a parse worker, whose metrics are empty, so the server passes the
+    latencies it measured (per model for the LLM; None falls back to the planner's defaults).
+    Only the Jira base URL is passed, so credentials never leave the request thread.
+    """
+    try:
+        from run_planner import plan_run
+        base_url = jira_base_url or os.getenv('JIRA_BASE_URL')
+        return plan_run(file_path, config, enable_quality_check=enable_quality_check, jira_base_url=base_url,
+                        measured_jira_latency=measured_jira_latency, measured_llm_latencies=measured_llm_latencies, df=df)
+    except Exception as e:
+        logger.warning(f"Could not plan conversion: {e}")
+        return None
+
+def analyze_upload(file_path, config, enable_quality_check, jira_base_url=None, measured_jira_latency=None, measured_llm_latencies=None):
+    """
+    Read an upload once and derive everything /api/validate needs from it
+    Returns (raw records for the dry run, validation data, plan); runs as a single parse worker call.
+    """
+    df = read_table(file_path, config_sheet_name(config))
+    records = frame_records(df)
+    validation_data = generate_validation_data(file_path, config, df=df)
+    plan = plan_conversion(file_path, config, enable_quality_check, jira_base_url,
+                           measured_jira_latency, measured_llm_latencies, df=df)
+    return records, validation_data, plan
+
+def summarize_validation_data(validation_data, file_id):
+    """Totals, filter options and the first page of records for the /api/validate response"""
+    try:
+        page_size = int(request.args.get('pageSize', VALIDATION_PAGE_SIZE))
+    except ValueError:
+        page_size = VALIDATION_PAGE_SIZE
+    records = validation_data['records']
+    if page_size <= 0:
+        page_size = len(records)
+    
+    return {
+        'totalRecords': validation_data['totalRecords'],
+        'validRecords': validation_data['validRecords'],
+        'issueRecords': validation_data['issueRecords'],
+        'domains': sorted({r['domain'] for r in records if r['domain'] and r['domain'] != 'nan'}),
+        'pageSize': page_size,
+        'records': records[:page_size],
+        'recordsUrl': f'/api/validate/{file_id}/records'
+    }
+
+def load_validation_data(file_id):
+    """Cached validation data for a stored file, recomputed if it dropped out of the cache"""
+    validation_data = validation_cache.get(file_id)
+    service_metrics.CACHE_REQUESTS.inc(cache='validation', result='hit' if validation_data is not None else 'miss')
+    if validation_data is not None:
+        return validation_data
+    
+    entry = file_store.acquire(file_id)
+    if entry is None:
+        return None
+    try:
+        validation_data = parse_pool.run(generate_validation_data, entry['path'], build_request_config())
+        validation_cache.put(file_id, validation_data)
+        return validation_data
+    finally:
+        file_store.release(file_id)
+
+def filter_validation_records(records, status='all', domain=None, query=None):
+    """Filter validation records by status (all/valid/issues), domain and a search term"""
+    if status == 'valid':
+        records = [r for r in records if not r['hasIssues']]
+    elif status == 'issues':
+        records = [r for r in records if r['hasIssues']]
+    if domain:
+        records = [r for r in records if r['domain'] == domain]
+    if query:
+        needle = query.lower()
+        records = [
+            r for r in records
+            if needle in r['requirementId'].lower() or needle in r['requirement'].lower()
+        ]
+    return records
+
+def _column_text(df, column):
+    """str() of every cell in a column as an object Series ('' if the column is absent)"""
+    import pandas as pd
+    if column not in df.columns:
+        return pd.Series([''] * len(df), index=df.index, dtype=object)
+    return pd.Series([str(v) for v in df[column].tolist()], index=df.index, dtype=object)
+
+def build_validation_records(df):
+    """
+    Validate every row column-wise and assemble the per-row records for the frontend.
+    
+    Issue masks are computed per column over the whole sheet; only the final
+    record dicts are built row by row.
+    """
+    import numpy as np
+    
+    issue_columns = []
+    for field in REQUIRED_VALIDATION_FIELDS:
+        if field in df.columns:
+            missing = (df[field].isna() | _column_text(df, field).str.strip().eq('')).to_numpy()
+        else:
+            missing = np.ones(len(df), dtype=bool)
+        issue_columns.append(np.where(missing, f"Missing {field}", None))
+    
+    priority = _column_text(df, 'priority').str.strip()
+    bad_priority = (priority.ne('') & ~priority.isin(VALID_PRIORITIES)).to_numpy()
+    issue_columns.append(np.where(bad_priority, "Invalid priority format: " + priority.to_numpy(dtype=object), None))
+    
+    requirement = _column_text(df, 'requirement').str.strip()
+    lengths = requirement.str.len()
+    too_short = (lengths.gt(0) & lengths.lt(10)).to_numpy()
+    issue_columns.append(np.where(too_short, "Requirement too short (minimum 10 characters)", None))
+    
+    issues_per_row = [[issue for issue in row_issues if issue is not None] for row_issues in zip(*issue_columns)]
+    
+    return [
+        {
+            'requirementId': requirement_id,
+            'requirement': requirement_text,
+            'description': description,
+            'priority': priority_text,
+            'domain': domain,
+            'subDomain': sub_domain,
+            'hasIssues': len(issues) > 0,
+            'issues': issues
+        }
+        for requirement_id, requirement_text, description, priority_text, domain, sub_domain, issues in zip(
+            _column_text(df, 'requirement_id').tolist(),
+            requirement.tolist(),
+            _column_text(df, 'description').tolist(),
+            priority.tolist(),
+            _column_text(df, 'domain').tolist(),
+            _column_text(df, 'sub_domain').tolist(),
+            issues_per_row
+        )
+    ]
+
+def public_jira_config(jira_config):
+    """Jira settings safe to return and persist; the email and API token never leave the request"""
+    return {key: jira_config.get(key, '') for key in ('baseUrl', 'projectKey')}
+
 def generate_jira_results(created_tickets, jira_config):
     """Generate Jira results for frontend display and export"""
     try:
@@ -492,7 +1083,7 @@ def generate_jira_results(created_tickets, jira_config):
         return {
             'createdTickets': len(tickets),
             'tickets': tickets,
-            'jiraConfig': jira_config
+            'jiraConfig': public_jira_config(jira_config)
         }
         
     except Exception as e:
@@ -500,13 +1091,18 @@ def generate_jira_results(created_tickets, jira_config):
         return {
             'createdTickets': 0,
             'tickets': [],
-            'jiraConfig': jira_config
+            'jiraConfig': public_jira_config(jira_config)
         }
 
 if __name__ == '__main__':
     # Create uploads directory if it doesn't exist
     os.makedirs('uploads', exist_ok=True)
     
+    # Fork the parse workers while this is the only thread. With debug=True the
+    # reloader re-runs this script in a child that serves; its watcher parent never does.
+    if os.environ.get('WERKZEUG_RUN_MAIN') == 'true':
+        parse_pool.start()
+    
     # Run the Flask app
     print("Starting Peak3 Requirements Automation Web Server...")
     print("Web Interface: http://localhost:5000")
@@ -0,0 +1,122 @@
+"""
+End-to-end throughput benchmark for convert.run against the local mock Jira.
+
+For each sheet size a synthetic sheet is generated, the mock Jira is reset,
+and run() creates every epic and story over HTTP. Reports stories/second,
+Jira API calls per story and wall time. Runs entirely offline.
+
+Usage:
+    python benchmarks/bench_convert.py --rows 1000,10000,50000 --latency-ms 5
+"""
+
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Dict, List
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT / "src"))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+# The client-side tenant budget is configured explicitly below (--client-rate)
+os.environ.setdefault("JIRA_RATE_LIMIT", "0")
+
+from convert import run  # noqa: E402
+from jira_client import JiraConfig  # noqa: E402
+from mock_jira import MockJiraServer  # noqa: E402
+from run_metrics import RunMetrics  # noqa: E402
+from synthetic_sheet import generate_sheet, write_sheet  # noqa: E402
+from tenant_scheduler import configure_tenant  # noqa: E402
+
+
+BENCH_CONFIG = {
+    "excel": {
+        "sheet_name": "1. Requirements - Internal",
+        "columns": {
+            "requirement_id": "Requirement ID",
+            "requirement": "Requirement",
+            "description": "Description",
+            "priority": "Priority",
+            "domain": "Domain",
+            "sub_domain": "Sub-domain",
+            "requirement_type": "Requirement type",
+        },
+    },
+    "jira": {
+        "project_key": "BENCH",
+        "priority_mapping": {"P0": "Highest", "P1": "High", "P2": "Medium", "P3": "Low", "P4": "Lowest"},
+    },
+}
+
+
+def bench_size(server: MockJiraServer, rows: int, workdir: str, seed: int) -> Dict[str, Any]:
+    sheet_path = write_sheet(generate_sheet(rows, seed=seed), os.path.join(workdir, f"sheet_{rows}.csv"))
+    server.state.reset()
+    jira_config = JiraConfig(server.url, "bench@example.com", "bench-token", "BENCH")
+
+    metrics = RunMetrics(track_memory=False)
+    started = time.perf_counter()
+    tickets = run(sheet_path, None, dry_run=False, enable_quality_check=False, jira_config=jira_config, config=BENCH_CONFIG, metrics=metrics, quiet=True)
+    wall = time.perf_counter() - started
+
+    stats = server.state.stats()
+    stories = len(tickets or [])
+    return {
+        "rows": rows,
+        "stories": stories,
+        "wallSeconds": round(wall, 3),
+        "storiesPerSecond": round(stories / wall, 1) if wall else 0.0,
+        "apiCalls": stats["totalCalls"],
+        "apiCallsPerStory": round(stats["totalCalls"] / stories, 2) if stories else 0.0,
+        "rejected429": stats["rejected"],
+        "callsByEndpoint": stats["calls"],
+        "stageSeconds": {name: stage["seconds"] for name, stage in metrics.summary()["stages"].items()},
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark convert.run against a local mock Jira")
+    parser.add_argument("--rows", default="1000,10000,50000", help="Comma-separated sheet sizes")
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="Mock latency per call")
+    parser.add_argument("--jitter-ms", type=float, default=0.0)
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fraction of calls answered with 429")
+    parser.add_argument("--rate-limit", type=float, default=0.0, help="Mock server requests/second (0 = unlimited)")
+    parser.add_argument("--retry-after", type=float, default=0.05, help="Retry-After seconds sent with 429s")
+    parser.add_argument("--client-rate", type=float, default=0.0, help="Client tenant budget in requests/second (0 = off)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json", dest="json_path", help="Also write results to this JSON file")
+    args = parser.parse_args()
+
+    results: List[Dict[str, Any]] = []
+    with MockJiraServer(
+        latency=args.latency_ms / 1000.0,
+        jitter=args.jitter_ms / 1000.0,
+        error_rate=args.error_rate,
+        rate_limit=args.rate_limit,
+        retry_after=args.retry_after,
+        seed=args.seed,
+    ) as server, tempfile.TemporaryDirectory() as workdir:
+        if args.client_rate > 0:
+            configure_tenant(server.url, args.client_rate)
+        print(f"Mock Jira at {server.url}")
+        print(f"{'rows':>8} {'stories':>8} {'wall s':>9} {'stories/s':>10} {'calls':>8} {'calls/story':>12} {'429s':>6}")
+        for rows in (int(r) for r in args.rows.split(",") if r.strip()):
+            result = bench_size(server, rows, workdir, args.seed)
+            results.append(result)
+            print(
+                f"{result['rows']:>8} {result['stories']:>8} {result['wallSeconds']:>9.2f} "
+                f"{result['storiesPerSecond']:>10.1f} {result['apiCalls']:>8} "
+                f"{result['apiCallsPerStory']:>12.2f} {result['rejected429']:>6}"
+            )
+
+    if args.json_path:
+        with open(args.json_path, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,170 @@
+"""
+Mixed-load latency benchmark for the API server.
+
+Starts the Flask app on a local threaded server, then runs several clients
+that keep uploading a large synthetic workbook to /api/validate while a
+probe measures /api/health every few milliseconds. With parsing in the
+request threads, each upload's pandas/openpyxl work holds the GIL and the
+probe's latency climbs. With the parse pool, it should stay close to idle.
+
+Each --workers value runs in a fresh interpreter, because the pool is
+configured from PARSE_WORKERS / PARSE_QUEUE_LIMIT when the app loads.
+Validations refused with 503 (pool full) are counted separately.
+
+Usage:
+    python benchmarks/bench_mixed_load.py --workers 0,2 --rows 20000 --clients 4 --duration 20
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, List
+
+import requests
+
+ROOT = Path(__file__).resolve().parent.parent
+
+
+def percentile(values: List[float], pct: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(int(len(ordered) * pct / 100), len(ordered) - 1)] if ordered else 0.0
+
+
+def run_config(args: argparse.Namespace) -> Dict[str, Any]:
+    """Run one configuration in this process and return its measurements."""
+    import logging
+
+    sys.path.insert(0, str(ROOT / "src"))
+    sys.path.insert(0, str(ROOT))
+    sys.path.insert(0, str(Path(__file__).resolve().parent))
+    from synthetic_sheet import generate_sheet, write_sheet
+
+    workdir = tempfile.mkdtemp(prefix="bench_mixed_")
+    os.chdir(workdir)
+    sheet_path = write_sheet(generate_sheet(args.rows, seed=args.seed), os.path.join(workdir, "sheet.xlsx"))
+    with open(sheet_path, "rb") as f:
+        sheet_bytes = f.read()
+
+    logging.disable(logging.WARNING)
+    import api_standalone
+    from werkzeug.serving import make_server
+
+    # Start the workers before measuring, as api_standalone's __main__ does
+    api_standalone.parse_pool.start()
+
+    server = make_server("127.0.0.1", 0, api_standalone.app, threaded=True)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base_url = f"http://127.0.0.1:{server.server_port}"
+
+    probe_ms: List[float] = []
+    idle_ms: List[float] = []
+    validate_ms: List[float] = []
+    statuses: Dict[int, int] = {}
+    lock = threading.Lock()
+    stop = threading.Event()
+    loaded = threading.Event()
+
+    def probe() -> None:
+        session = requests.Session()
+        while not stop.is_set():
+            started = time.perf_counter()
+            session.get(f"{base_url}/api/health", timeout=120)
+            elapsed = (time.perf_counter() - started) * 1000
+            (probe_ms if loaded.is_set() else idle_ms).append(elapsed)
+            time.sleep(args.probe_interval_ms / 1000)
+
+    def client() -> None:
+        session = requests.Session()
+        while not stop.is_set():
+            started = time.perf_counter()
+            response = session.post(
+                f"{base_url}/api/validate?pageSize=1",
+                files={"file": ("sheet.xlsx", sheet_bytes)},
+                data={"enableQualityCheck": "false"},
+                timeout=600,
+            )
+            elapsed = (time.perf_counter() - started) * 1000
+            with lock:
+                statuses[response.status_code] = statuses.get(response.status_code, 0) + 1
+                if response.status_code == 200:
+                    validate_ms.append(elapsed)
+            if response.status_code == 503:
+                time.sleep(0.5)
+
+    probe_thread = threading.Thread(target=probe)
+    probe_thread.start()
+    time.sleep(1.0)
+    loaded.set()
+    clients = [threading.Thread(target=client) for _ in range(args.clients)]
+    for thread in clients:
+        thread.start()
+    time.sleep(args.duration)
+    stop.set()
+    for thread in clients + [probe_thread]:
+        thread.join()
+    server.shutdown()
+    api_standalone.parse_pool.shutdown()
+
+    return {
+        "workers": int(os.environ["PARSE_WORKERS"]),
+        "rows": args.rows,
+        "clients": args.clients,
+        "healthIdleP50Ms": round(statistics.median(idle_ms), 1) if idle_ms else None,
+        "healthP50Ms": round(percentile(probe_ms, 50), 1),
+        "healthP95Ms": round(percentile(probe_ms, 95), 1),
+        "healthMaxMs": round(max(probe_ms), 1) if probe_ms else None,
+        "validations": len(validate_ms),
+        "validateP50Ms": round(percentile(validate_ms, 50), 1),
+        "rejected503": statuses.get(503, 0),
+        "errors": sum(count for status, count in statuses.items() if status not in (200, 503)),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Health-check latency while large uploads are being validated")
+    parser.add_argument("--workers", default="0,2", help="Comma-separated PARSE_WORKERS values to compare")
+    parser.add_argument("--queue-limit", type=int, default=8, help="PARSE_QUEUE_LIMIT for every run")
+    parser.add_argument("--rows", type=int, default=20000)
+    parser.add_argument("--clients", type=int, default=4, help="Concurrent clients uploading to /api/validate")
+    parser.add_argument("--duration", type=float, default=20.0, help="Seconds of load per configuration")
+    parser.add_argument("--probe-interval-ms", type=float, default=20.0)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json", dest="json_path", help="Also write results to this JSON file")
+    parser.add_argument("--single", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.single:
+        print(json.dumps(run_config(args)))
+        return
+
+    results = []
+    print(f"{'workers':>7} {'idle p50':>9} {'health p50':>11} {'p95':>8} {'max':>8} {'validations':>12} {'validate p50':>13} {'503s':>5} {'errors':>6}")
+    for workers in (int(w) for w in args.workers.split(",") if w.strip()):
+        env = dict(os.environ, PARSE_WORKERS=str(workers), PARSE_QUEUE_LIMIT=str(args.queue_limit))
+        argv = [sys.executable, __file__, "--single", "--rows", str(args.rows), "--clients", str(args.clients),
+                "--duration", str(args.duration), "--probe-interval-ms", str(args.probe_interval_ms), "--seed", str(args.seed)]
+        proc = subprocess.run(argv, env=env, capture_output=True, text=True)
+        if proc.returncode != 0:
+            raise RuntimeError(f"Run with {workers} worker(s) failed:\n{proc.stderr[-2000:]}")
+        result = json.loads(proc.stdout.strip().splitlines()[-1])
+        results.append(result)
+        print(
+            f"{workers:>7} {result['healthIdleP50Ms']:>9.1f} {result['healthP50Ms']:>11.1f} {result['healthP95Ms']:>8.1f} "
+            f"{result['healthMaxMs']:>8.1f} {result['validations']:>12} {result['validateP50Ms']:>13.1f} "
+            f"{result['rejected503']:>5} {result['errors']:>6}"
+        )
+
+    if args.json_path:
+        with open(args.json_path, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
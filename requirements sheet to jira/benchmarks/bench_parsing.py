@@ -0,0 +1,174 @@
+"""
+Micro-benchmarks for the sheet parsing hot path.
+
+Times read_excel_records, normalize_records, group_by_epic, build_labels,
+make_story_summary and generate_validation_data on synthetic sheets and
+records their peak Python memory (tracemalloc). Results are compared with a
+stored baseline; the script exits non-zero when a case is slower or uses more
+memory than the baseline allows, so it can gate changes to the parsing code.
+
+Timings are machine-specific: refresh the baseline on the machine that runs
+the comparison with --update-baseline.
+
+Usage:
+    python benchmarks/bench_parsing.py                     # compare with baseline_parsing.json
+    python benchmarks/bench_parsing.py --update-baseline   # store the current numbers
+    python benchmarks/bench_parsing.py --rows 50000 --formats csv --baseline /tmp/base_50k.json --update-baseline
+"""
+
+import argparse
+import json
+import logging
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Tuple
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT / "src"))
+sys.path.insert(0, str(ROOT))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+# The cases call the parsers directly; the app's parse worker processes are not needed
+os.environ.setdefault("PARSE_WORKERS", "0")
+
+from convert import group_by_epic  # noqa: E402
+from excel_parser import normalize_records, read_excel_records  # noqa: E402
+from mappings import build_labels, make_story_summary  # noqa: E402
+from synthetic_sheet import generate_sheet, write_sheet  # noqa: E402
+
+
+DEFAULT_BASELINE = Path(__file__).resolve().parent / "baseline_parsing.json"
+SHEET_NAME = "1. Requirements - Internal"
+COLUMNS_CFG = {
+    "requirement_id": "Requirement ID",
+    "requirement": "Requirement",
+    "description": "Description",
+    "priority": "Priority",
+    "domain": "Domain",
+    "subdomain": "Sub-domain",
+    "requirement_type": "Requirement type",
+}
+LABELS_FROM = ["domain", "subdomain", "requirement_type"]
+STORY_TITLE_WORDS = 10
+
+
+def measure(func: Callable[[], Any], repeat: int) -> Tuple[float, float]:
+    """Median wall time over `repeat` runs and peak traced memory (MiB) of one extra run."""
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - started)
+    # tracemalloc slows allocation-heavy code down, so memory gets its own run
+    tracemalloc.start()
+    try:
+        func()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return statistics.median(timings), peak / (1024 * 1024)
+
+
+def build_cases(path: str, fmt: str) -> List[Tuple[str, Callable[[], Any]]]:
+    # Importing the app creates its upload/job folders in the working directory (a temp dir here)
+    from api_standalone import build_request_config, generate_validation_data
+
+    records_raw = read_excel_records(path, SHEET_NAME)
+    records = normalize_records(records_raw, COLUMNS_CFG)
+    config = build_request_config()
+    return [
+        (f"{fmt}:read_excel_records", lambda: read_excel_records(path, SHEET_NAME)),
+        (f"{fmt}:normalize_records", lambda: normalize_records(records_raw, COLUMNS_CFG)),
+        (f"{fmt}:group_by_epic", lambda: group_by_epic(records)),
+        (f"{fmt}:build_labels", lambda: [build_labels(r, LABELS_FROM) for r in records]),
+        (
+            f"{fmt}:make_story_summary",
+            lambda: [make_story_summary(r["requirement_id"], r["description"], STORY_TITLE_WORDS) for r in records],
+        ),
+        (f"{fmt}:generate_validation_data", lambda: generate_validation_data(path, config)),
+    ]
+
+
+def compare(results: Dict[str, Dict[str, float]], baseline: Dict[str, Any], args: argparse.Namespace) -> List[str]:
+    """Regressions as human-readable lines; small absolute differences are ignored as noise."""
+    regressions = []
+    for name, current in results.items():
+        base = baseline["results"].get(name)
+        if not base:
+            continue
+        slower = current["seconds"] - base["seconds"]
+        if slower > base["seconds"] * args.time_tolerance and slower * 1000 > args.min_ms:
+            regressions.append(f"{name}: {current['seconds'] * 1000:.1f} ms vs baseline {base['seconds'] * 1000:.1f} ms")
+        larger = current["peakMiB"] - base["peakMiB"]
+        if larger > base["peakMiB"] * args.memory_tolerance and larger > args.min_mib:
+            regressions.append(f"{name}: peak {current['peakMiB']:.1f} MiB vs baseline {base['peakMiB']:.1f} MiB")
+    return regressions
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Micro-benchmarks for sheet parsing with regression check")
+    parser.add_argument("--rows", type=int, default=10000)
+    parser.add_argument("--epics", type=int, default=None, help="Distinct epics (default: about one per 20 rows)")
+    parser.add_argument("--description-words", type=int, default=20, help="Extra words per description")
+    parser.add_argument("--formats", default="csv,xlsx", help="Comma-separated sheet formats to benchmark")
+    parser.add_argument("--repeat", type=int, default=5, help="Timed runs per case (median is reported)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--baseline", default=str(DEFAULT_BASELINE), help="Baseline JSON file")
+    parser.add_argument("--update-baseline", action="store_true", help="Write the results as the new baseline")
+    parser.add_argument("--time-tolerance", type=float, default=0.25, help="Allowed relative slowdown")
+    parser.add_argument("--memory-tolerance", type=float, default=0.20, help="Allowed relative peak memory growth")
+    parser.add_argument("--min-ms", type=float, default=5.0, help="Ignore slowdowns smaller than this")
+    parser.add_argument("--min-mib", type=float, default=1.0, help="Ignore memory growth smaller than this")
+    args = parser.parse_args()
+
+    # generate_validation_data logs per call; keep the table readable
+    logging.disable(logging.INFO)
+    baseline_path = os.path.abspath(args.baseline)
+    params = {"rows": args.rows, "epics": args.epics, "descriptionWords": args.description_words, "seed": args.seed}
+    df = generate_sheet(args.rows, args.epics, args.seed, args.description_words)
+
+    results: Dict[str, Dict[str, float]] = {}
+    print(f"{'case':<32} {'median ms':>10} {'peak MiB':>9}")
+    with tempfile.TemporaryDirectory() as workdir:
+        os.chdir(workdir)
+        for fmt in (f.strip() for f in args.formats.split(",") if f.strip()):
+            path = write_sheet(df, os.path.join(workdir, f"sheet.{fmt}"))
+            for name, func in build_cases(path, fmt):
+                seconds, peak = measure(func, args.repeat)
+                results[name] = {"seconds": round(seconds, 5), "peakMiB": round(peak, 2)}
+                print(f"{name:<32} {seconds * 1000:>10.1f} {peak:>9.1f}")
+        os.chdir(ROOT)
+
+    if args.update_baseline:
+        with open(baseline_path, "w", encoding="utf-8") as f:
+            json.dump({"params": params, "python": platform.python_version(), "machine": platform.machine(), "results": results}, f, indent=2)
+            f.write("\n")
+        print(f"Baseline written to {baseline_path}")
+        return
+
+    if not os.path.exists(baseline_path):
+        print(f"No baseline at {baseline_path}; run with --update-baseline first")
+        return
+    with open(baseline_path, "r", encoding="utf-8") as f:
+        baseline = json.load(f)
+    if baseline.get("params") != params:
+        print(f"Baseline was recorded with {baseline.get('params')}; rerun with the same options to compare")
+        sys.exit(2)
+
+    regressions = compare(results, baseline, args)
+    if regressions:
+        print("\nRegressions against baseline:")
+        for line in regressions:
+            print(f"  {line}")
+        sys.exit(1)
+    print("\nNo regressions against baseline")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,121 @@
+"""
+Offline throughput benchmark for DataQualityChecker.data_quality_check.
+
+OpenAI calls go through ReplayTransport, so no API key or network is needed.
+Reports rows/second, per-row latency percentiles (p50/p95/p99) and how busy
+the worker pool was (time spent in LLM calls / (wall time x max_workers)).
+
+Usage:
+    python benchmarks/bench_quality.py --rows 200,1000 --median-ms 300 --p95-ms 1200
+    python benchmarks/bench_quality.py --rows 50 --record /tmp/cassette.jsonl   # real API, needs OPENAI_API_KEY
+    python benchmarks/bench_quality.py --rows 50 --replay /tmp/cassette.jsonl
+"""
+
+import argparse
+import json
+import os
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, List
+
+import httpx
+import numpy as np
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT / "src"))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from data_quality_checker import DataQualityChecker  # noqa: E402
+from openai_replay import LatencyModel, RecordingTransport, ReplayTransport  # noqa: E402
+from synthetic_sheet import generate_sheet  # noqa: E402
+
+
+def bench_size(args: argparse.Namespace, rows: int) -> Dict[str, Any]:
+    if args.record:
+        transport: httpx.BaseTransport = RecordingTransport(args.record)
+        api_key = os.getenv("OPENAI_API_KEY")
+    else:
+        transport = ReplayTransport(
+            args.replay,
+            latency=LatencyModel(args.median_ms / 1000.0, args.p95_ms / 1000.0, seed=args.seed),
+            error_rate=args.error_rate,
+            seed=args.seed,
+        )
+        api_key = "replay"
+    checker = DataQualityChecker(api_key=api_key, http_client=httpx.Client(transport=transport))
+    df = generate_sheet(rows, seed=args.seed)
+
+    # Time each LLM-backed row from the worker's point of view
+    latencies: List[float] = []
+    lock = threading.Lock()
+    process = checker._process_single_record
+
+    def timed(row: Any, idx: Any) -> Dict[str, Any]:
+        started = time.perf_counter()
+        try:
+            return process(row, idx)
+        finally:
+            with lock:
+                latencies.append(time.perf_counter() - started)
+
+    checker._process_single_record = timed
+
+    started = time.perf_counter()
+    results = checker.data_quality_check(
+        df,
+        batch_size=args.batch_size,
+        max_workers=args.max_workers,
+        clusters=None if args.dedupe else [],
+    )
+    wall = time.perf_counter() - started
+
+    samples = np.array(latencies) if latencies else np.zeros(1)
+    result = {
+        "rows": rows,
+        "llmRows": len(latencies),
+        "wallSeconds": round(wall, 3),
+        "rowsPerSecond": round(len(results) / wall, 1) if wall else 0.0,
+        "p50": round(float(np.percentile(samples, 50)), 3),
+        "p95": round(float(np.percentile(samples, 95)), 3),
+        "p99": round(float(np.percentile(samples, 99)), 3),
+        "utilization": round(float(samples.sum()) / (wall * args.max_workers), 3) if wall else 0.0,
+    }
+    if isinstance(transport, ReplayTransport):
+        result["transport"] = transport.stats()
+    return result
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark data_quality_check with replayed OpenAI calls")
+    parser.add_argument("--rows", default="200,1000", help="Comma-separated sheet sizes")
+    parser.add_argument("--batch-size", type=int, default=5)
+    parser.add_argument("--max-workers", type=int, default=3)
+    parser.add_argument("--median-ms", type=float, default=300.0, help="Median simulated LLM latency")
+    parser.add_argument("--p95-ms", type=float, default=1200.0, help="p95 simulated LLM latency")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fraction of calls answered with 429")
+    parser.add_argument("--dedupe", action="store_true", help="Keep near-duplicate clustering on (synthetic rows are highly similar)")
+    parser.add_argument("--replay", help="Replay responses from this cassette (misses are synthesized)")
+    parser.add_argument("--record", help="Call the real API and append responses to this cassette")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json", dest="json_path", help="Also write results to this JSON file")
+    args = parser.parse_args()
+
+    results = []
+    print(f"{'rows':>7} {'llm rows':>9} {'wall s':>8} {'rows/s':>8} {'p50 s':>7} {'p95 s':>7} {'p99 s':>7} {'util':>6}")
+    for rows in (int(r) for r in args.rows.split(",") if r.strip()):
+        result = bench_size(args, rows)
+        results.append(result)
+        print(
+            f"{result['rows']:>7} {result['llmRows']:>9} {result['wallSeconds']:>8.2f} {result['rowsPerSecond']:>8.1f} "
+            f"{result['p50']:>7.3f} {result['p95']:>7.3f} {result['p99']:>7.3f} {result['utilization']:>6.2f}"
+        )
+
+    if args.json_path:
+        with open(args.json_path, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+"""
+Cold-start benchmark for the CLI and the API.
+
+Each scenario runs in a fresh interpreter, so it measures what a CLI
+invocation or a new API worker pays before doing useful work:
+
+- import convert            the library import used by scripts and jobs
+- import api_standalone     an API worker boot (Flask app, stores, metrics)
+- convert.py -DryRun        a full CLI dry run of a small synthetic sheet
+
+Alongside the median and best wall time it lists which heavy dependencies
+(pandas, numpy, openpyxl, openai) each scenario ended up loading; a dry run
+without quality checks should never load the OpenAI SDK.
+
+Usage:
+    python benchmarks/bench_startup.py
+    python benchmarks/bench_startup.py --repeat 20 --rows 500 --json startup.json
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Dict, List
+
+import yaml
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from synthetic_sheet import generate_sheet, write_sheet  # noqa: E402
+
+
+HEAVY_MODULES = ("pandas", "numpy", "openpyxl", "openai")
+MARKER = "__STARTUP_MODULES__"
+
+# Runs the scenario, then reports the heavy modules it loaded on the last stdout line
+WRAPPER = """
+import runpy, sys
+sys.path[:0] = [{src!r}, {root!r}]
+{body}
+print({marker!r}, [m for m in {heavy!r} if m in sys.modules])
+"""
+
+
+def scenarios(sheet_path: str, config_path: str) -> Dict[str, str]:
+    cli_argv = ["convert.py", "-ExcelPath", sheet_path, "-ConfigPath", config_path, "-DryRun", "-SkipQualityCheck", "-Quiet"]
+    return {
+        "import convert": "import convert",
+        "import api_standalone": "import api_standalone",
+        "convert.py -DryRun": f"sys.argv = {cli_argv!r}\nrunpy.run_path({str(ROOT / 'src' / 'convert.py')!r}, run_name='__main__')",
+    }
+
+
+def run_once(body: str, workdir: str) -> Dict[str, Any]:
+    code = WRAPPER.format(src=str(ROOT / "src"), root=str(ROOT), body=body, marker=MARKER, heavy=HEAVY_MODULES)
+    started = time.perf_counter()
+    proc = subprocess.run([sys.executable, "-c", code], cwd=workdir, capture_output=True, text=True)
+    seconds = time.perf_counter() - started
+    if proc.returncode != 0:
+        raise RuntimeError(f"Scenario failed:\n{proc.stderr[-2000:]}")
+    loaded: List[str] = []
+    for line in proc.stdout.splitlines():
+        if line.startswith(MARKER):
+            loaded = json.loads(line[len(MARKER):].strip().replace("'", '"'))
+    return {"seconds": seconds, "loaded": loaded}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Cold-start time of the CLI and API worker")
+    parser.add_argument("--repeat", type=int, default=10, help="Fresh interpreters per scenario")
+    parser.add_argument("--rows", type=int, default=200, help="Rows in the dry-run sheet")
+    parser.add_argument("--json", dest="json_path", help="Also write results to this JSON file")
+    args = parser.parse_args()
+
+    results = []
+    with tempfile.TemporaryDirectory() as workdir:
+        sheet_path = write_sheet(generate_sheet(args.rows), os.path.join(workdir, "sheet.csv"))
+        with open(ROOT / "config.example.yml", "r", encoding="utf-8") as f:
+            cfg = yaml.safe_load(f)
+        cfg["jira"]["project_key"] = "BENCH"
+        cfg["data_quality"]["enabled"] = False
+        config_path = os.path.join(workdir, "config.yml")
+        with open(config_path, "w", encoding="utf-8") as f:
+            yaml.safe_dump(cfg, f)
+
+        # The interpreter itself, so scenario numbers can be read as overhead on top of it
+        baseline = [run_once("pass", workdir)["seconds"] for _ in range(args.repeat)]
+        print(f"{'scenario':<24} {'median ms':>10} {'best ms':>9}  heavy modules loaded")
+        print(f"{'python -c pass':<24} {statistics.median(baseline) * 1000:>10.0f} {min(baseline) * 1000:>9.0f}")
+        for name, body in scenarios(sheet_path, config_path).items():
+            runs = [run_once(body, workdir) for _ in range(args.repeat)]
+            timings = [r["seconds"] for r in runs]
+            loaded = runs[-1]["loaded"]
+            results.append({
+                "scenario": name,
+                "medianMs": round(statistics.median(timings) * 1000, 1),
+                "bestMs": round(min(timings) * 1000, 1),
+                "loaded": loaded,
+            })
+            print(f"{name:<24} {statistics.median(timings) * 1000:>10.0f} {min(timings) * 1000:>9.0f}  {', '.join(loaded) or '-'}")
+
+    if args.json_path:
+        with open(args.json_path, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
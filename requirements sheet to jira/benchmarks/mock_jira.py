@@ -0,0 +1,249 @@
+"""
+Local stand-in for the Jira Cloud REST endpoints used by JiraClient.
+
+Implements POST /rest/api/3/issue, POST /rest/api/3/issue/bulk,
+GET /rest/api/3/search and GET /rest/api/3/search/jql with configurable
+latency, random 429 injection and a server-side rate limit, so convert.run
+can be benchmarked without network access.
+
+Searches match the `summary ~ "..."` phrase against whole summaries (epic
+names) and bracketed requirement IDs ("[REQ-1] ..."), which is what the
+client's lookups rely on; they are index lookups, not full-text search.
+
+Control endpoints: GET /_mock/stats returns call counts, POST /_mock/reset
+clears issues and counters.
+
+Usage:
+    python benchmarks/mock_jira.py --port 8089 --latency-ms 50 --rate-limit 20
+"""
+
+import argparse
+import json
+import random
+import re
+import threading
+import time
+from collections import defaultdict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, urlparse
+
+
+_PROJECT_RE = re.compile(r'project\s*=\s*"((?:[^"\\]|\\.)*)"')
+_SUMMARY_RE = re.compile(r'summary\s*~\s*"((?:[^"\\]|\\.)*)"')
+_ISSUETYPE_RE = re.compile(r'issuetype\s*=\s*"((?:[^"\\]|\\.)*)"')
+_REQUIREMENT_TAG_RE = re.compile(r"^\[([^\]]+)\]")
+
+
+def _unescape(value: str) -> str:
+    return value.replace('\\"', '"').replace("\\\\", "\\")
+
+
+class MockJiraState:
+    """Issues, search index, rate limiter and call counters shared by all handler threads."""
+
+    def __init__(self, latency: float = 0.0, jitter: float = 0.0, error_rate: float = 0.0, rate_limit: float = 0.0, retry_after: float = 1.0, seed: int = 0) -> None:
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.rate_limit = rate_limit
+        self.retry_after = retry_after
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self) -> None:
+        with self._lock:
+            self._issues: Dict[str, Dict[str, Any]] = {}
+            self._index: Dict[Tuple[str, str], List[str]] = defaultdict(list)
+            self._next_id = 10000
+            self._tokens = max(self.rate_limit, 1.0)
+            self._updated = time.monotonic()
+            self.calls: Dict[str, int] = defaultdict(int)
+            self.rejected = 0
+
+    def delay(self) -> float:
+        with self._lock:
+            jitter = self._random.uniform(-self.jitter, self.jitter) if self.jitter else 0.0
+        return max(self.latency + jitter, 0.0)
+
+    def admit(self, endpoint: str) -> bool:
+        """Count the call and decide whether it gets a 429 (injected or over the rate limit)."""
+        with self._lock:
+            self.calls[endpoint] += 1
+            if self.error_rate and self._random.random() < self.error_rate:
+                self.rejected += 1
+                return False
+            if self.rate_limit > 0:
+                now = time.monotonic()
+                self._tokens = min(self.rate_limit, self._tokens + (now - self._updated) * self.rate_limit)
+                self._updated = now
+                if self._tokens < 1:
+                    self.rejected += 1
+                    return False
+                self._tokens -= 1
+            return True
+
+    def create_issue(self, fields: Dict[str, Any]) -> Dict[str, Any]:
+        project = (fields.get("project") or {}).get("key", "MOCK")
+        summary = fields.get("summary", "")
+        with self._lock:
+            self._next_id += 1
+            issue_id = str(self._next_id)
+            key = f"{project}-{self._next_id - 10000}"
+            issue = {"id": issue_id, "key": key, "fields": fields}
+            self._issues[issue_id] = issue
+            self._index[(project, summary.lower())].append(issue_id)
+            tag = _REQUIREMENT_TAG_RE.match(summary)
+            if tag:
+                self._index[(project, tag.group(1).lower())].append(issue_id)
+        return {"id": issue_id, "key": key, "self": f"/rest/api/3/issue/{issue_id}"}
+
+    def search(self, jql: str, max_results: int) -> List[Dict[str, Any]]:
+        project = _PROJECT_RE.search(jql)
+        phrase = _SUMMARY_RE.search(jql)
+        issuetype = _ISSUETYPE_RE.search(jql)
+        if not project or not phrase:
+            return []
+        key = (_unescape(project.group(1)), _unescape(phrase.group(1)).lower())
+        with self._lock:
+            issues = [self._issues[issue_id] for issue_id in self._index.get(key, [])]
+        if issuetype:
+            wanted = _unescape(issuetype.group(1)).lower()
+            issues = [i for i in issues if (i["fields"].get("issuetype") or {}).get("name", "").lower() == wanted]
+        return [
+            {"id": i["id"], "key": i["key"], "fields": {"summary": i["fields"].get("summary", ""), "issuetype": i["fields"].get("issuetype")}}
+            for i in issues[:max_results]
+        ]
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {"calls": dict(self.calls), "totalCalls": sum(self.calls.values()), "rejected": self.rejected, "issues": len(self._issues)}
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    # Headers and body are separate writes; without this keep-alive calls stall on delayed ACKs
+    disable_nagle_algorithm = True
+    state: MockJiraState
+
+    def log_message(self, format: str, *args: Any) -> None:
+        pass
+
+    def _send(self, status: int, body: Optional[Dict[str, Any]] = None, headers: Optional[Dict[str, str]] = None) -> None:
+        payload = json.dumps(body).encode("utf-8") if body is not None else b""
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def _read_json(self) -> Dict[str, Any]:
+        length = int(self.headers.get("Content-Length") or 0)
+        return json.loads(self.rfile.read(length) or b"{}")
+
+    def _gate(self, endpoint: str) -> bool:
+        time.sleep(self.state.delay())
+        if self.state.admit(endpoint):
+            return True
+        self._send(429, {"errorMessages": ["Rate limit exceeded"]}, {"Retry-After": f"{self.state.retry_after:g}"})
+        return False
+
+    def do_GET(self) -> None:
+        url = urlparse(self.path)
+        if url.path == "/_mock/stats":
+            self._send(200, self.state.stats())
+            return
+        if url.path not in ("/rest/api/3/search", "/rest/api/3/search/jql"):
+            self._send(404, {"errorMessages": [f"No mock for GET {url.path}"]})
+            return
+        if not self._gate(url.path):
+            return
+        query = parse_qs(url.query)
+        jql = query.get("jql", [""])[0]
+        max_results = int(query.get("maxResults", ["50"])[0])
+        issues = self.state.search(jql, max_results)
+        self._send(200, {"issues": issues, "total": len(issues), "maxResults": max_results})
+
+    def do_POST(self) -> None:
+        url = urlparse(self.path)
+        if url.path == "/_mock/reset":
+            self.state.reset()
+            self._send(204)
+            return
+        if url.path not in ("/rest/api/3/issue", "/rest/api/3/issue/bulk"):
+            self._send(404, {"errorMessages": [f"No mock for POST {url.path}"]})
+            return
+        body = self._read_json()
+        if not self._gate(url.path):
+            return
+        if url.path == "/rest/api/3/issue":
+            self._send(201, self.state.create_issue(body.get("fields", {})))
+        else:
+            created = [self.state.create_issue(update.get("fields", {})) for update in body.get("issueUpdates", [])]
+            self._send(201, {"issues": created, "errors": []})
+
+
+class MockJiraServer:
+    """Run the mock Jira on a background thread; use as a context manager."""
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0, **state_options: Any) -> None:
+        self.state = MockJiraState(**state_options)
+        handler = type("MockJiraHandler", (_Handler,), {"state": self.state})
+        self._server = ThreadingHTTPServer((host, port), handler)
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(target=self._server.serve_forever, name="mock-jira", daemon=True)
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> "MockJiraServer":
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self) -> "MockJiraServer":
+        return self.start()
+
+    def __exit__(self, *exc: Any) -> None:
+        self.stop()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Run a local mock Jira server")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8089)
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="Mean added latency per call")
+    parser.add_argument("--jitter-ms", type=float, default=0.0, help="Uniform +/- jitter around the latency")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fraction of calls answered with 429")
+    parser.add_argument("--rate-limit", type=float, default=0.0, help="Requests per second before 429s (0 = unlimited)")
+    parser.add_argument("--retry-after", type=float, default=1.0, help="Retry-After seconds sent with 429s")
+    args = parser.parse_args()
+
+    server = MockJiraServer(
+        args.host,
+        args.port,
+        latency=args.latency_ms / 1000.0,
+        jitter=args.jitter_ms / 1000.0,
+        error_rate=args.error_rate,
+        rate_limit=args.rate_limit,
+        retry_after=args.retry_after,
+    )
+    print(f"Mock Jira listening on {server.url} (Ctrl+C to stop)")
+    try:
+        server._server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server._server.server_close()
+
+
+if __name__ == "__main__":
+    main()
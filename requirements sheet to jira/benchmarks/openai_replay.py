@@ -0,0 +1,179 @@
+"""
+Record/replay transports for the OpenAI client.
+
+Both are httpx transports, plugged in through
+DataQualityChecker(http_client=httpx.Client(transport=...)):
+
+- RecordingTransport forwards calls to the real API and appends each
+  request/response pair to a JSONL cassette.
+- ReplayTransport answers from a cassette without network access, with a
+  configurable latency distribution and 429 rate. Requests missing from the
+  cassette get a synthetic, schema-valid completion so synthetic sheets can
+  be benchmarked without any recording.
+"""
+
+import hashlib
+import json
+import math
+import random
+import threading
+import time
+from typing import Any, Dict, Optional
+
+import httpx
+
+
+# Headers that describe the wire body, dropped when a response is rebuilt from decoded content
+DECODED_HEADERS = ("content-encoding", "content-length", "transfer-encoding")
+
+
+def request_key(body: Dict[str, Any]) -> str:
+    """Stable key for a chat completion request (model, messages, format and limits)."""
+    relevant = {k: body.get(k) for k in ("model", "messages", "response_format", "max_tokens", "temperature")}
+    return hashlib.sha256(json.dumps(relevant, sort_keys=True).encode("utf-8")).hexdigest()
+
+
+class LatencyModel:
+    """Log-normal latency described by its median and p95 (seconds)."""
+
+    def __init__(self, median: float = 0.8, p95: float = 2.5, seed: int = 0) -> None:
+        self.median = median
+        self.p95 = max(p95, median)
+        self._mu = math.log(median) if median > 0 else None
+        self._sigma = math.log(self.p95 / median) / 1.645 if median > 0 else 0.0
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def sample(self) -> float:
+        if self._mu is None:
+            return 0.0
+        with self._lock:
+            return self._random.lognormvariate(self._mu, self._sigma)
+
+
+class RecordingTransport(httpx.BaseTransport):
+    """Forward requests to the real API and append each exchange to a JSONL cassette."""
+
+    def __init__(self, cassette_path: str, inner: Optional[httpx.BaseTransport] = None) -> None:
+        self.cassette_path = cassette_path
+        self._inner = inner or httpx.HTTPTransport()
+        self._lock = threading.Lock()
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        started = time.perf_counter()
+        response = self._inner.handle_request(request)
+        content = response.read()
+        elapsed = time.perf_counter() - started
+        if request.url.path.endswith("/chat/completions") and response.status_code == 200:
+            body = json.loads(request.content or b"{}")
+            entry = {"key": request_key(body), "elapsed": round(elapsed, 4), "response": json.loads(content)}
+            with self._lock, open(self.cassette_path, "a", encoding="utf-8") as f:
+                f.write(json.dumps(entry) + "\n")
+        # content is already decoded, so the original encoding and length no longer describe it
+        headers = [(k, v) for k, v in response.headers.multi_items() if k.lower() not in DECODED_HEADERS]
+        return httpx.Response(response.status_code, headers=headers, content=content, request=request)
+
+    def close(self) -> None:
+        self._inner.close()
+
+
+class ReplayTransport(httpx.BaseTransport):
+    """Serve chat completions from a cassette (or synthesize them) with simulated latency and 429s."""
+
+    def __init__(
+        self,
+        cassette_path: Optional[str] = None,
+        latency: Optional[LatencyModel] = None,
+        error_rate: float = 0.0,
+        retry_after_ms: int = 50,
+        seed: int = 0,
+    ) -> None:
+        self.latency = latency or LatencyModel()
+        self.error_rate = error_rate
+        self.retry_after_ms = retry_after_ms
+        self._random = random.Random(seed)
+        self._responses: Dict[str, Dict[str, Any]] = {}
+        if cassette_path:
+            with open(cassette_path, "r", encoding="utf-8") as f:
+                for line in f:
+                    if line.strip():
+                        entry = json.loads(line)
+                        self._responses[entry["key"]] = entry["response"]
+        self._lock = threading.Lock()
+        self.requests = 0
+        self.hits = 0
+        self.synthesized = 0
+        self.errors = 0
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.busy_seconds = 0.0
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        delay = self.latency.sample()
+        with self._lock:
+            self.requests += 1
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+            fail = self.error_rate > 0 and self._random.random() < self.error_rate
+        try:
+            time.sleep(delay)
+        finally:
+            with self._lock:
+                self.in_flight -= 1
+                self.busy_seconds += delay
+
+        if fail:
+            with self._lock:
+                self.errors += 1
+            return httpx.Response(
+                429,
+                headers={"retry-after-ms": str(self.retry_after_ms)},
+                json={"error": {"message": "Rate limit reached (replay)", "type": "rate_limit_error"}},
+                request=request,
+            )
+
+        body = json.loads(request.content or b"{}")
+        recorded = self._responses.get(request_key(body))
+        with self._lock:
+            if recorded is not None:
+                self.hits += 1
+            else:
+                self.synthesized += 1
+        return httpx.Response(200, json=recorded or synthetic_completion(body), request=request)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "requests": self.requests,
+                "cassetteHits": self.hits,
+                "synthesized": self.synthesized,
+                "errors429": self.errors,
+                "maxInFlight": self.max_in_flight,
+                "busySeconds": round(self.busy_seconds, 3),
+            }
+
+
+def synthetic_completion(body: Dict[str, Any]) -> Dict[str, Any]:
+    """A plausible chat completion for a quality-check prompt, valid for the structured schema."""
+    prompt = body.get("messages", [{}])[-1].get("content", "")
+    fields = {}
+    for line in prompt.splitlines():
+        name, sep, value = line.strip().partition(": ")
+        if sep and name in ("Requirement ID", "Requirement", "Description"):
+            fields[name] = value.strip()
+    requirement_id = fields.get("Requirement ID", "REQ")
+    title = " ".join(fields.get("Description", fields.get("Requirement", "requirement")).split()[:10])
+    summary = f"[{requirement_id}] {title}"
+    description = f"As a user, I want {title.lower()}, so that the journey works end to end"
+    if body.get("response_format"):
+        content = json.dumps({"quality": "VALID", "reason": "All mandatory fields present", "summary": summary, "description": description})
+    else:
+        content = f"Quality: VALID - All mandatory fields present\nSummary: {summary}\nDescription: {description}"
+    return {
+        "id": "chatcmpl-replay",
+        "object": "chat.completion",
+        "created": int(time.time()),
+        "model": body.get("model", "gpt-4o-mini"),
+        "choices": [{"index": 0, "message": {"role": "assistant", "content": content}, "finish_reason": "stop"}],
+        "usage": {"prompt_tokens": len(prompt) // 4, "completion_tokens": len(content) // 4, "total_tokens": (len(prompt) + len(content)) // 4},
+    }
@@ -0,0 +1,102 @@
+"""
+Synthetic requirement sheets for benchmarks.
+
+Produces sheets with the same columns as data/sample_requirements.csv at any
+size, deterministic for a given seed, so benchmark runs are comparable.
+
+Usage:
+    python benchmarks/synthetic_sheet.py --rows 10000 --out /tmp/sheet_10k.csv
+"""
+
+import argparse
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+
+
+COLUMNS = [
+    "Requirement ID", "Requirement type", "Sales product", "Tenant/Partner", "Domain",
+    "Sub-domain", "Requirement", "Description", "Priority",
+]
+
+DOMAINS = ["1 - Product Setup", "2 - Policy Issuance", "3 - Claims", "4 - Billing", "5 - Reporting"]
+SUB_DOMAINS = ["1 - Configuration", "2 - Underwriting", "3 - Sales", "4 - Servicing", "5 - Analytics"]
+PRODUCTS = ["Travel", "Motor", "Home", "Health"]
+PARTNERS = ["CMU", "ACME", "Globex", "Initech"]
+PRIORITIES = ["P0", "P1", "P2", "P3", "P4"]
+VERBS = ["enable", "allow", "display", "validate", "calculate", "notify", "record", "export"]
+OBJECTS = ["quotes", "policy documents", "premium breakdowns", "claim status", "payment schedules", "customer profiles"]
+QUALIFIERS = ["in real time", "with an audit trail", "for every channel", "within two seconds", "in the partner portal"]
+
+
+FILLER = [
+    "customers", "agents", "underwriters", "must", "be", "able", "to", "review", "the", "latest",
+    "details", "before", "confirming", "and", "receive", "a", "clear", "message", "when", "data",
+    "is", "missing", "or", "invalid", "across", "web", "mobile", "channels",
+]
+
+
+def generate_sheet(rows: int, epics: Optional[int] = None, seed: int = 0, description_words: int = 0) -> pd.DataFrame:
+    """Build a requirements DataFrame with `rows` stories spread over `epics` epics.
+
+    Args:
+        rows: Number of requirement rows
+        epics: Number of distinct Requirement (epic) values; defaults to about one per 20 rows
+        seed: Random seed; the same seed always yields the same sheet
+        description_words: Extra filler words appended to each description (0 = short, one sentence)
+    """
+    rng = np.random.RandomState(seed)
+    epics = epics or max(rows // 20, 1)
+    epic_ids = rng.randint(0, epics, size=rows)
+    product = rng.choice(PRODUCTS, size=rows)
+    partner = rng.choice(PARTNERS, size=rows)
+    descriptions = [
+        f"The {p} journey for {t} must {v} {o} {q}."
+        for p, t, v, o, q in zip(
+            product,
+            partner,
+            rng.choice(VERBS, size=rows),
+            rng.choice(OBJECTS, size=rows),
+            rng.choice(QUALIFIERS, size=rows),
+        )
+    ]
+    if description_words > 0:
+        filler = rng.choice(FILLER, size=(rows, description_words))
+        descriptions = [f"{d} {' '.join(words).capitalize()}." for d, words in zip(descriptions, filler)]
+    return pd.DataFrame({
+        "Requirement ID": [f"SYN-{i:06d}" for i in range(rows)],
+        "Requirement type": rng.choice(["Functional", "Non-functional"], size=rows, p=[0.8, 0.2]),
+        "Sales product": product,
+        "Tenant/Partner": partner,
+        "Domain": rng.choice(DOMAINS, size=rows),
+        "Sub-domain": rng.choice(SUB_DOMAINS, size=rows),
+        "Requirement": [f"{e + 1} - Synthetic epic {e + 1}" for e in epic_ids],
+        "Description": descriptions,
+        "Priority": rng.choice(PRIORITIES, size=rows),
+    }, columns=COLUMNS)
+
+
+def write_sheet(df: pd.DataFrame, path: str) -> str:
+    """Write the sheet as CSV or Excel depending on the file extension."""
+    if path.endswith(".csv"):
+        df.to_csv(path, index=False, encoding="utf-8-sig")
+    else:
+        df.to_excel(path, sheet_name="1. Requirements - Internal", index=False)
+    return path
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Generate a synthetic requirements sheet")
+    parser.add_argument("--rows", type=int, default=1000)
+    parser.add_argument("--epics", type=int, default=None)
+    parser.add_argument("--description-words", type=int, default=0, help="Extra words per description")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--out", required=True, help="Output .csv or .xlsx path")
+    args = parser.parse_args()
+    write_sheet(generate_sheet(args.rows, args.epics, args.seed, args.description_words), args.out)
+    print(f"Wrote {args.rows} rows to {args.out}")
+
+
+if __name__ == "__main__":
+    main()
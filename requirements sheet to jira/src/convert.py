@@ -1,13 +1,21 @@
 import os
 import argparse
+import json
+import logging
 from collections import defaultdict
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
 
 from excel_parser import normalize_records, read_excel_records
-from jira_client import JiraClient
+from jira_client import JiraClient, JiraConfig
 from mappings import build_components, build_labels, make_story_summary, map_priority
-from utils import coalesce_str, load_env, load_yaml_config
-from data_quality_checker import DataQualityChecker
+from utils import coalesce_str, load_env, load_yaml_config, validate_config
+from openai_pool import get_quality_checker
+from run_metrics import RunMetrics
+from service_metrics import TICKETS
+import tracing
+
+
+logger = logging.getLogger(__name__)
 
 
 def group_by_epic(records: List[Dict[str, Any]]) -> Dict[str, List[Dict[str, Any]]]:
@@ -24,7 +32,7 @@ def aggregate_epic_description(items: List[Dict[str, Any]]) -> str:
     return "\n\n".join(descriptions)
 
 
-def perform_data_quality_check(excel_path: str, enable_quality_check: bool = True, sheet_name: str = "1. Requirements - Internal") -> Optional[Dict]:
+def perform_data_quality_check(excel_path: str, enable_quality_check: bool = True, sheet_name: str = "1. Requirements - Internal", quality_cfg: Optional[Dict[str, Any]] = None, progress: Optional[Callable[[str, Dict[str, Any]], None]] = None, raise_errors: bool = False) -> Optional[Dict]:
     """
     Perform data quality check on the Excel file before processing.
     
@@ -32,6 +40,9 @@ def perform_data_quality_check(excel_path: str, enable_quality_check: bool = Tru
         excel_path (str): Path to the Excel file
         enable_quality_check (bool): Whether to enable data quality checking
         sheet_name (str): Name of the Excel sheet to check
+        quality_cfg (Dict[str, Any]): The data_quality section of the config
+        progress: Optional callback receiving a 'row_enriched' event per finished row
+        raise_errors (bool): Re-raise failures instead of warning and returning None
         
     Returns:
         Optional[Dict]: Dictionary containing quality results and summaries, or None if disabled
@@ -46,7 +57,8 @@ def perform_data_quality_check(excel_path: str, enable_quality_check: bool = Tru
             print("WARNING: OPENAI_API_KEY not found. Skipping data quality check.")
             return None
             
-        quality_checker = DataQualityChecker(api_key)
+        # Shared across runs: warm connections, and latency windows for routing and hedging
+        quality_checker = get_quality_checker(api_key, quality_cfg)
         
         # Load the Excel file for quality checking
         if excel_path.endswith(".csv"):
@@ -57,8 +69,15 @@ def perform_data_quality_check(excel_path: str, enable_quality_check: bool = Tru
         
         print(f"Performing data quality check on {len(df)} records...")
         
+        # Local profiling first: its pre-screen keeps incomplete rows away from the LLM
+        profile = quality_checker.profile(df)
+        
+        # Near-duplicate rows share one LLM call; report the clusters as a finding too
+        clusters = quality_checker.find_duplicate_clusters(df)
+        duplicate_clusters = quality_checker.describe_duplicate_clusters(df, clusters)
+        
         # Perform quality check
-        quality_results = quality_checker.data_quality_check(df)
+        quality_results = quality_checker.data_quality_check(df, clusters=clusters, prescreen=profile['prescreen'], progress=progress)
         
         print("Data quality check completed!")
         
@@ -75,20 +94,71 @@ def perform_data_quality_check(excel_path: str, enable_quality_check: bool = Tru
             'results': quality_results,
             'summary_map': summary_map,
             'description_map': description_map,
+            'duplicate_clusters': duplicate_clusters,
+            'missing_analysis': profile['missing_analysis'],
+            'pattern_analysis': profile['pattern_analysis'],
             'dataframe': df
         }
         
     except Exception as e:
+        if raise_errors:
+            raise
         print(f"WARNING: Data quality check failed: {str(e)}")
         print("   Continuing with workflow...")
         return None
 
 
-def run(excel_path: str, config_path: str, dry_run: bool, enable_quality_check: bool = True, jira_config: Optional[Dict[str, str]] = None) -> List[Dict[str, Any]]:
+ProgressCallback = Callable[[str, Dict[str, Any]], None]
+
+
+def _notify(progress: Optional[ProgressCallback], event: str, **data: Any) -> None:
+    if progress is not None:
+        progress(event, data)
+
+
+def _silent(*args: Any, **kwargs: Any) -> None:
+    pass
+
+
+def run(excel_path: str, config_path: Optional[str], dry_run: bool, enable_quality_check: bool = True, jira_config: Optional[Union[JiraConfig, Dict[str, str]]] = None, quality_data: Optional[Dict[str, Any]] = None, progress: Optional[ProgressCallback] = None, config: Optional[Dict[str, Any]] = None, metrics: Optional[RunMetrics] = None, quiet: bool = False, records: Optional[List[Dict[str, Any]]] = None) -> List[Dict[str, Any]]:
+    """Convert a requirements sheet into Jira epics and stories.
+
+    config, if given, is an in-memory config dict used instead of reading
+    config_path, so callers such as the API need no temporary YAML files.
+
+    jira_config scopes the Jira connection to this call (a JiraConfig, or the
+    frontend's camelCase dict); without it the config file and JIRA_*
+    environment variables are used. Process globals are never modified.
+
+    quality_data may carry enrichment already computed for this file (e.g. started
+    speculatively at validate time); the data quality check is then not re-run.
+    progress, if given, is called as progress(event, data) for rows_parsed,
+    row_enriched, epic_resolved and story_created/story_skipped/story_failed.
+
+    metrics, if given, is filled with stage timings, counters and Jira API call
+    statistics (see RunMetrics) and its summary is logged when the run ends.
+    quiet suppresses the per-row console output.
+
+    records, if given, are the sheet's raw rows as returned by read_excel_records
+    (e.g. parsed in a worker process by the API); the file is then not read again.
+    """
+    if metrics is None:
+        # Always time stages; tracemalloc only when the caller asks for it
+        metrics = RunMetrics(track_memory=False)
+    metrics.start()
+    try:
+        with tracing.start_span("convert.run", file=os.path.basename(excel_path), dry_run=dry_run):
+            return _run(excel_path, config_path, dry_run, enable_quality_check, jira_config, quality_data, progress, config, metrics, _silent if quiet else print, records)
+    finally:
+        metrics.finish()
+        metrics.log_summary()
+
+
+def _run(excel_path: str, config_path: Optional[str], dry_run: bool, enable_quality_check: bool, jira_config: Optional[Union[JiraConfig, Dict[str, str]]], quality_data: Optional[Dict[str, Any]], progress: Optional[ProgressCallback], config: Optional[Dict[str, Any]], metrics: RunMetrics, echo: Callable[..., None], records_raw: Optional[List[Dict[str, Any]]] = None) -> List[Dict[str, Any]]:
     # Only load env if jira_config is not provided
     if jira_config is None:
         load_env()
-    cfg = load_yaml_config(config_path)
+    cfg = validate_config(config) if config is not None else load_yaml_config(config_path)
 
     # Read current config.yml structure
     excel_cfg: Dict[str, Any] = cfg.get("excel", {})
@@ -99,106 +169,124 @@ def run(excel_path: str, config_path: str, dry_run: bool, enable_quality_check:
     story_title_words: int = int(cfg.get("texting", {}).get("story_title_words", 10))
     
     # Check if data quality checking is enabled in config
-    quality_check_enabled = cfg.get("data_quality", {}).get("enabled", enable_quality_check)
+    quality_cfg: Dict[str, Any] = cfg.get("data_quality", {})
+    quality_check_enabled = quality_cfg.get("enabled", enable_quality_check)
 
     # Use jira_config if provided, otherwise fall back to config file and environment variables
-    if jira_config:
-        base_url = jira_config.get("baseUrl")
-        email = jira_config.get("email")
-        token = jira_config.get("apiToken")
-        project_key = jira_config.get("projectKey")
-    else:
-        base_url = jira_cfg.get("base_url") or coalesce_str(jira_cfg.get("baseUrl")) or coalesce_str(jira_cfg.get("url"))
-        if not base_url:
-            base_url = coalesce_str(os.getenv("JIRA_BASE_URL"))
-        email = coalesce_str(os.getenv("JIRA_EMAIL"))
-        token = coalesce_str(os.getenv("JIRA_API_TOKEN"))
-        project_key = coalesce_str(jira_cfg.get("project_key")) or coalesce_str(os.getenv("JIRA_PROJECT_KEY"))
-    epic_link_field_key = coalesce_str(jira_cfg.get("epic_link_field_key")) or None
+    if isinstance(jira_config, dict):
+        jira_config = JiraConfig.from_request(jira_config) if jira_config else None
+    if jira_config is None:
+        jira_config = JiraConfig.from_env(jira_cfg)
+    epic_link_field_key = jira_config.epic_link_field_key or coalesce_str(jira_cfg.get("epic_link_field_key")) or None
 
     # Skip credential validation in DryRun mode
-    if not (base_url and email and token and project_key):
+    if not jira_config.is_complete():
         if not dry_run:
             raise RuntimeError("Missing Jira credentials or project key. Please set env and config correctly.")
 
     component_from = jira_cfg.get("component_from")
     labels_from = cfg.get("jira", {}).get("labels_from", [])
 
-    records_raw = read_excel_records(excel_path, sheet_name)
-    records = normalize_records(records_raw, columns_cfg)
-    # Guard: filter out empty rows to avoid creating blank tickets
-    records = [
-        r for r in records
-        if coalesce_str(r.get("requirement_id")) and coalesce_str(r.get("requirement"))
-    ]
+    with metrics.stage("parse") as span:
+        if records_raw is None:
+            records_raw = read_excel_records(excel_path, sheet_name)
+        records = normalize_records(records_raw, columns_cfg)
+        # Remember each record's sheet row so LLM results (keyed by row) can be matched after grouping
+        for row_index, r in enumerate(records):
+            r["row_index"] = row_index
+        # Guard: filter out empty rows to avoid creating blank tickets
+        records = [
+            r for r in records
+            if coalesce_str(r.get("requirement_id")) and coalesce_str(r.get("requirement"))
+        ]
+        span.set_attribute("rows", len(records))
+    metrics.count("rows_parsed", len(records))
+    _notify(progress, "rows_parsed", count=len(records))
 
     # Perform data quality check before processing
-    quality_data = perform_data_quality_check(excel_path, quality_check_enabled, sheet_name)
+    if quality_data is None:
+        with metrics.stage("quality_check"):
+            quality_data = perform_data_quality_check(excel_path, quality_check_enabled, sheet_name, quality_cfg, progress)
     summary_map = {}
     description_map = {}
     if quality_data:
-        print("\n" + "="*80)
-        print("DATA QUALITY ANALYSIS RESULTS")
-        print("="*80)
+        metrics.count("rows_enriched", len(quality_data['results']))
+        echo("\n" + "="*80)
+        echo("DATA QUALITY ANALYSIS RESULTS")
+        echo("="*80)
         for i, result in enumerate(quality_data['results'], 1):
-            print(f"\n--- Requirement {i} Analysis ---")
-            print(result['analysis'])
+            echo(f"\n--- Requirement {i} Analysis ---")
+            echo(result['analysis'])
             if result['summary']:
-                print(f"Generated Summary: {result['summary']}")
+                echo(f"Generated Summary: {result['summary']}")
             if result['description']:
-                print(f"Generated Description: {result['description']}")
-        print("="*80 + "\n")
+                echo(f"Generated Description: {result['description']}")
+        patterns = quality_data.get('pattern_analysis')
+        if patterns:
+            echo("\n--- Sheet Profile ---")
+            echo(f"Duplicate requirement IDs: {len(patterns['duplicate_requirement_ids'])}")
+            echo(f"Invalid priorities: {patterns['invalid_priority_count']} {patterns['invalid_priority_values']}")
+            echo(f"Orphan epics (no story-ready rows): {patterns['orphan_epics']}")
+        if quality_data.get('duplicate_clusters'):
+            echo("\n--- Near-Duplicate Requirements ---")
+            for cluster in quality_data['duplicate_clusters']:
+                echo(f"{cluster['size']} similar rows (enriched once via {cluster['representative']}): {', '.join(cluster['requirement_ids'])}")
+        echo("="*80 + "\n")
         summary_map = quality_data['summary_map']
         description_map = quality_data['description_map']
 
-    groups = group_by_epic(records)
+    with metrics.stage("group"):
+        groups = group_by_epic(records)
 
     # DryRun: Only print Epics and Stories to be created, no API calls
     if dry_run:
+        metrics.count("epics", sum(1 for epic_name in groups if epic_name))
         for epic_name, items in groups.items():
             if not epic_name:
                 continue
             epic_desc = aggregate_epic_description(items)
-            print(f"[DRY RUN] Would create Epic: {epic_name}")
-            print(f"[DRY RUN]   Epic Description Preview: {epic_desc[:120]}...")
-            for idx, row in enumerate(items):
+            echo(f"[DRY RUN] Would create Epic: {epic_name}")
+            echo(f"[DRY RUN]   Epic Description Preview: {epic_desc[:120]}...")
+            for row in items:
                 req_id = coalesce_str(row.get("requirement_id"))
                 if not req_id:
                     continue
                 description = coalesce_str(row.get("description"))
                 
                 # Use LLM-generated summary if available, otherwise fallback to simple summary
-                if idx in summary_map and summary_map[idx]:
-                    summary = summary_map[idx]
-                    print(f"[DRY RUN]   Using LLM-generated summary: {summary}")
+                row_index = row.get("row_index")
+                if summary_map.get(row_index):
+                    summary = summary_map[row_index]
+                    echo(f"[DRY RUN]   Using LLM-generated summary: {summary}")
                 else:
                     summary = make_story_summary(req_id, description, story_title_words)
-                    print(f"[DRY RUN]   Using fallback summary: {summary}")
+                    echo(f"[DRY RUN]   Using fallback summary: {summary}")
                 
                 # Use LLM-generated description if available, otherwise use original description
-                if idx in description_map and description_map[idx]:
-                    enhanced_description = description_map[idx]
-                    print(f"[DRY RUN]   Using LLM-generated description: {enhanced_description[:100]}...")
+                if description_map.get(row_index):
+                    enhanced_description = description_map[row_index]
+                    echo(f"[DRY RUN]   Using LLM-generated description: {enhanced_description[:100]}...")
                 else:
                     enhanced_description = description
-                    print(f"[DRY RUN]   Using original description: {enhanced_description[:100]}...")
+                    echo(f"[DRY RUN]   Using original description: {enhanced_description[:100]}...")
                 if summary == "Untitled Story":
                     continue
                 priority_name = map_priority(coalesce_str(row.get("priority")), priority_map)
                 labels = build_labels(row, labels_from)
                 components = build_components(row, component_from)
-                print(f"[DRY RUN]   Would create Story: {summary}")
-                print(f"[DRY RUN]     Priority: {priority_name}, Labels: {labels}, Components: {components}")
+                echo(f"[DRY RUN]   Would create Story: {summary}")
+                echo(f"[DRY RUN]     Priority: {priority_name}, Labels: {labels}, Components: {components}")
         return
 
     # Non-DryRun, execute real API calls
     client = JiraClient(
-        base_url=base_url,
-        email=email,
-        api_token=token,
-        project_key=project_key,
+        base_url=jira_config.base_url,
+        email=jira_config.email,
+        api_token=jira_config.api_token,
+        project_key=jira_config.project_key,
         epic_link_field_key=epic_link_field_key,
         dry_run=dry_run,
+        metrics=metrics,
     )
 
     # Collect actually created tickets
@@ -208,43 +296,55 @@ def run(excel_path: str, config_path: str, dry_run: bool, enable_quality_check:
         if not epic_name:
             continue
         # Idempotent epic create or fetch
-        epic_issue = client.get_epic_by_name(epic_name)
-        if not epic_issue:
+        with metrics.stage("epic_lookup", epic=epic_name) as span:
+            epic_issue = client.get_epic_by_name(epic_name)
+            span.set_attribute("found", bool(epic_issue))
+        if epic_issue:
+            metrics.count("epics_existing")
+        else:
             epic_desc = aggregate_epic_description(items)
-            epic_issue = client.create_epic(epic_name=epic_name, epic_description=epic_desc)
+            with metrics.stage("epic_create", epic=epic_name):
+                epic_issue = client.create_epic(epic_name=epic_name, epic_description=epic_desc)
+            metrics.count("epics_created")
         epic_id: Optional[str] = None
         if epic_issue and not epic_issue.get("dryRun"):
             epic_id = epic_issue.get("id")
+        _notify(progress, "epic_resolved", epic=epic_name, key=(epic_issue or {}).get("key", ""))
 
         # Create stories
-        for idx, row in enumerate(items):
+        for row in items:
             req_id = coalesce_str(row.get("requirement_id"))
             if not req_id:
                 continue
             description = coalesce_str(row.get("description"))
             
             # Use LLM-generated summary if available, otherwise fallback to simple summary
-            if idx in summary_map and summary_map[idx]:
-                summary = summary_map[idx]
-                print(f"Using LLM-generated summary: {summary}")
+            row_index = row.get("row_index")
+            if summary_map.get(row_index):
+                summary = summary_map[row_index]
+                echo(f"Using LLM-generated summary: {summary}")
             else:
                 summary = make_story_summary(req_id, description, story_title_words)
-                print(f"Using fallback summary: {summary}")
+                echo(f"Using fallback summary: {summary}")
             
             # Use LLM-generated description if available, otherwise use original description
-            if idx in description_map and description_map[idx]:
-                enhanced_description = description_map[idx]
-                print(f"Using LLM-generated description: {enhanced_description[:100]}...")
+            if description_map.get(row_index):
+                enhanced_description = description_map[row_index]
+                echo(f"Using LLM-generated description: {enhanced_description[:100]}...")
             else:
                 enhanced_description = description
-                print(f"Using original description: {enhanced_description[:100]}...")
+                echo(f"Using original description: {enhanced_description[:100]}...")
             if summary == "Untitled Story":
                 continue
 
             # Idempotent story by requirement ID
-            existing = client.search_issue_by_requirement_id(req_id, issue_type="Story")
+            with metrics.stage("story_search", requirement_id=req_id) as span:
+                existing = client.search_issue_by_requirement_id(req_id, issue_type="Story")
+                span.set_attribute("found", bool(existing))
             if existing:
-                print(f"[SKIP] Story already exists for Requirement ID: {req_id}")
+                metrics.count("stories_existing")
+                TICKETS.inc(outcome="skipped")
+                echo(f"[SKIP] Story already exists for Requirement ID: {req_id}")
                 # Add existing ticket to results so user can see it
                 existing_key = existing.get('key', '')
                 created_tickets.append({
@@ -260,28 +360,39 @@ def run(excel_path: str, config_path: str, dry_run: bool, enable_quality_check:
                     'assignee': '',
                     'created': '',
                     'key': existing_key,
-                    'jira_link': f'{base_url}/browse/{existing_key}'
+                    'jira_link': f'{client.base_url}/browse/{existing_key}'
                 })
+                _notify(progress, "story_skipped", requirement_id=req_id, key=existing_key, summary=summary, link=f'{client.base_url}/browse/{existing_key}')
                 continue
 
             priority_name = map_priority(coalesce_str(row.get("priority")), priority_map)
             labels = build_labels(row, labels_from)
             components = build_components(row, component_from)
 
-            print(f"[DEBUG] Creating Jira story for {req_id}: {summary}")
-            result = client.create_story(
-                summary=summary,
-                description=enhanced_description,
-                priority_name=priority_name,
-                epic_issue_id=epic_id,
-                epic_link_field_key=epic_link_field_key,
-                labels=labels,
-                components=components,
-            )
-            print(f"[DEBUG] Created Jira story: {result}")
+            echo(f"[DEBUG] Creating Jira story for {req_id}: {summary}")
+            try:
+                with metrics.stage("story_create", requirement_id=req_id, epic=epic_name) as span:
+                    result = client.create_story(
+                        summary=summary,
+                        description=enhanced_description,
+                        priority_name=priority_name,
+                        epic_issue_id=epic_id,
+                        epic_link_field_key=epic_link_field_key,
+                        labels=labels,
+                        components=components,
+                    )
+                    span.set_attribute("jira.key", (result or {}).get("key", ""))
+            except Exception as e:
+                metrics.count("stories_failed")
+                TICKETS.inc(outcome="failed")
+                _notify(progress, "story_failed", requirement_id=req_id, summary=summary, error=str(e))
+                raise
+            echo(f"[DEBUG] Created Jira story: {result}")
             
             # Collect the actually created ticket info
             if result and not result.get("dryRun"):
+                metrics.count("stories_created")
+                TICKETS.inc(outcome="created")
                 jira_key = result.get('key', '')
                 created_tickets.append({
                     'requirement_id': req_id,
@@ -296,8 +407,9 @@ def run(excel_path: str, config_path: str, dry_run: bool, enable_quality_check:
                     'assignee': '',
                     'created': '',
                     'key': jira_key,
-                    'jira_link': f'{base_url}/browse/{jira_key}'
+                    'jira_link': f'{client.base_url}/browse/{jira_key}'
                 })
+                _notify(progress, "story_created", requirement_id=req_id, key=jira_key, summary=summary, link=f'{client.base_url}/browse/{jira_key}')
     
     return created_tickets
 
@@ -308,9 +420,37 @@ def main() -> None:
     parser.add_argument("-ConfigPath", required=True, help="Path to YAML config")
     parser.add_argument("-DryRun", action="store_true", help="Dry run (no API calls)")
     parser.add_argument("-SkipQualityCheck", action="store_true", help="Skip data quality check")
+    parser.add_argument("-Profile", nargs="?", const="profiles", default=None, metavar="DIR", help="Profile each stage with cProfile and write <stage>.pstats files to DIR (default: profiles)")
+    parser.add_argument("-Quiet", action="store_true", help="Suppress per-row output")
+    parser.add_argument("-Trace", metavar="FILE", help="Write trace spans to this JSON-lines file (see tracing.py for OTLP export)")
+    parser.add_argument("-Plan", action="store_true", help="Only estimate Jira calls, LLM tokens and wall time for this sheet")
     args = parser.parse_args()
 
-    run(excel_path=args.ExcelPath, config_path=args.ConfigPath, dry_run=args.DryRun, enable_quality_check=not args.SkipQualityCheck)
+    if args.Plan:
+        from run_planner import plan_run
+        load_env()
+        cfg = load_yaml_config(args.ConfigPath)
+        base_url = JiraConfig.from_env(cfg.get("jira", {})).base_url or None
+        print(json.dumps(plan_run(args.ExcelPath, cfg, enable_quality_check=not args.SkipQualityCheck, jira_base_url=base_url), indent=2))
+        return
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+    if args.Trace:
+        tracing.configure(tracing.JsonlExporter(args.Trace))
+    else:
+        tracing.configure_from_env()
+    # Parsing imports pandas lazily; doing it before tracemalloc starts keeps the
+    # import out of the traced peak and avoids paying tracemalloc's overhead on it
+    import pandas  # noqa: F401
+    metrics = RunMetrics(profile=args.Profile is not None)
+    run(excel_path=args.ExcelPath, config_path=args.ConfigPath, dry_run=args.DryRun, enable_quality_check=not args.SkipQualityCheck, metrics=metrics, quiet=args.Quiet)
+
+    print(json.dumps(metrics.summary(), indent=2))
+    if args.Profile is not None:
+        print(metrics.profile_report())
+        for path in metrics.dump_profiles(args.Profile):
+            print(f"Profile written: {path}")
+    tracing.configure(None)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,138 @@
+"""
+Local, vectorized data profiling for requirement sheets.
+
+Computes the sheet-level statistics used by the data quality report
+(completeness, duplicate IDs, priority distribution, text length stats,
+orphan epics) in column-wise pandas/NumPy passes, plus a per-row pre-screen
+that lets the LLM skip rows that are missing mandatory fields.
+"""
+
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+
+VALID_PRIORITIES = ["P0", "P1", "P2", "P3", "P4"]
+
+DEFAULT_COLUMNS = {
+    "requirement_id": "Requirement ID",
+    "requirement": "Requirement",
+    "description": "Description",
+    "priority": "Priority",
+    "domain": "Domain",
+    "subdomain": "Sub-domain",
+    "requirement_type": "Requirement type",
+}
+
+# Rows missing any of these cannot become a Jira story
+MANDATORY_FIELDS = ["requirement_id", "requirement", "description"]
+
+
+def blank_mask(series: pd.Series) -> np.ndarray:
+    """Boolean mask of NaN or whitespace-only cells."""
+    missing = series.isna().to_numpy()
+    if series.dtype == object or pd.api.types.is_string_dtype(series.dtype):
+        stripped = series.astype(str).str.strip()
+        missing = missing | (stripped == "").to_numpy()
+    return missing
+
+
+def _text(series: Optional[pd.Series], length: int) -> pd.Series:
+    if series is None:
+        return pd.Series([""] * length, dtype=object)
+    return series.where(series.notna(), "").astype(str).str.strip()
+
+
+def _length_stats(lengths: np.ndarray) -> Dict[str, float]:
+    if lengths.size == 0:
+        return {"count": 0, "min": 0, "max": 0, "mean": 0.0, "median": 0.0, "p95": 0.0}
+    return {
+        "count": int(lengths.size),
+        "min": int(lengths.min()),
+        "max": int(lengths.max()),
+        "mean": round(float(lengths.mean()), 2),
+        "median": float(np.median(lengths)),
+        "p95": float(np.percentile(lengths, 95)),
+    }
+
+
+def profile_dataframe(df: pd.DataFrame, columns_cfg: Optional[Dict[str, str]] = None) -> Dict[str, Any]:
+    """Profile a raw requirements DataFrame.
+
+    Args:
+        df: Sheet as loaded from Excel/CSV (original column names)
+        columns_cfg: Mapping of normalized keys to sheet column names (config excel.columns)
+
+    Returns:
+        Dict with 'missing_analysis', 'pattern_analysis' and 'prescreen' (row index ->
+        missing mandatory fields, for rows that cannot become a story)
+    """
+    columns = dict(DEFAULT_COLUMNS)
+    columns.update(columns_cfg or {})
+    total = len(df)
+
+    blanks = {col: blank_mask(df[col]) for col in df.columns}
+    missing_analysis = {
+        "total_rows": total,
+        "columns": {
+            str(col): {
+                "missing": int(mask.sum()),
+                "completeness": round(100.0 * (1 - mask.sum() / total), 2) if total else 100.0,
+            }
+            for col, mask in blanks.items()
+        },
+    }
+
+    def column(key: str) -> Optional[pd.Series]:
+        name = columns.get(key)
+        return df[name] if name in df.columns else None
+
+    def missing(key: str) -> np.ndarray:
+        name = columns.get(key)
+        return blanks[name] if name in blanks else np.ones(total, dtype=bool)
+
+    ids = _text(column("requirement_id"), total)
+    present_ids = ids[~missing("requirement_id")]
+    id_counts = present_ids.value_counts()
+    duplicates = id_counts[id_counts > 1]
+
+    priorities = _text(column("priority"), total).str.upper()
+    priority_present = priorities[~missing("priority")]
+    priority_counts = priority_present.value_counts()
+    invalid_priorities = priority_counts[~priority_counts.index.isin(VALID_PRIORITIES)]
+
+    description_lengths = _text(column("description"), total).str.len().to_numpy()[~missing("description")]
+    requirement_lengths = _text(column("requirement"), total).str.len().to_numpy()[~missing("requirement")]
+
+    # Orphan epics: epic names none of whose rows can become a story
+    epics = _text(column("requirement"), total)
+    story_ready = ~(missing("requirement_id") | missing("description"))
+    epic_frame = pd.DataFrame({"epic": epics.to_numpy(), "ready": story_ready})[~missing("requirement")]
+    ready_per_epic = epic_frame.groupby("epic", sort=False)["ready"].any()
+    orphan_epics = [str(name) for name in ready_per_epic.index[~ready_per_epic.to_numpy()]]
+
+    pattern_analysis = {
+        "duplicate_requirement_ids": {str(k): int(v) for k, v in duplicates.items()},
+        "duplicate_requirement_id_rows": int(duplicates.sum()),
+        "priority_distribution": {str(k): int(v) for k, v in priority_counts.items()},
+        "invalid_priority_count": int(invalid_priorities.sum()),
+        "invalid_priority_values": {str(k): int(v) for k, v in invalid_priorities.items()},
+        "description_length": _length_stats(description_lengths),
+        "requirement_length": _length_stats(requirement_lengths),
+        "epic_count": int(len(ready_per_epic)),
+        "orphan_epics": orphan_epics,
+        "stories_without_epic": int((missing("requirement") & ~missing("requirement_id")).sum()),
+    }
+
+    # Per-row pre-screen: which mandatory fields are missing (failing rows only)
+    mandatory = np.column_stack([missing(key) for key in MANDATORY_FIELDS]).reshape(total, len(MANDATORY_FIELDS))
+    prescreen: Dict[Any, List[str]] = {}
+    for pos in np.flatnonzero(mandatory.any(axis=1)):
+        prescreen[df.index[pos]] = [MANDATORY_FIELDS[j] for j in np.flatnonzero(mandatory[pos])]
+
+    return {
+        "missing_analysis": missing_analysis,
+        "pattern_analysis": pattern_analysis,
+        "prescreen": prescreen,
+    }
@@ -10,40 +10,153 @@ import pandas as pd
 import numpy as np
 from typing import Dict, List, Tuple, Any
 import json
-from openai import OpenAI
-from dotenv import load_dotenv
+import re
 import logging
 import sys
+import threading
 from concurrent.futures import ThreadPoolExecutor, as_completed
 import time
 
+from data_profiler import profile_dataframe
+from hedging import RequestHedger
+from model_router import ModelRouter, ModelTier
+from service_metrics import OPENAI_REQUEST_SECONDS
+from tracing import bind, start_span
+from similarity import find_near_duplicates
+
 
-logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
 logger = logging.getLogger(__name__)
 
+
+SYSTEM_PROMPT = "You are a data quality expert with extensive experience in data analysis and quality assessment."
+
+# Row batching used by data_quality_check; the run planner projects LLM time from the same values
+DEFAULT_BATCH_SIZE = 5
+DEFAULT_MAX_WORKERS = 3
+BATCH_PAUSE_SECONDS = 0.2
+
+# JSON schema for structured (function-calling style) quality responses; sent as a
+# strict json_schema response_format, so only keywords strict mode accepts (no minLength)
+QUALITY_RESPONSE_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "quality": {"type": "string", "enum": ["VALID", "INVALID"]},
+        "reason": {"type": "string"},
+        "summary": {"type": "string"},
+        "description": {"type": "string"},
+    },
+    "required": ["quality", "reason", "summary", "description"],
+    "additionalProperties": False,
+}
+
+# Fields the local validator additionally requires to be non-blank
+LOCAL_MIN_LENGTH = {"summary": 1, "description": 1}
+
+_JSON_TYPES = {"string": str, "object": dict, "boolean": bool, "array": list}
+
+
+def _compile_validator(schema: Dict[str, Any], min_length: Dict[str, int] = None):
+    """
+    Compile a flat object schema into a single validation function.
     
-# Load environment variables
-load_dotenv()
+    Supports the subset used by QUALITY_RESPONSE_SCHEMA: required keys,
+    property types, enums, minLength and additionalProperties=False.
+    min_length adds minimum (stripped) lengths per field on top of the schema.
+    """
+    min_length = min_length or {}
+    properties = schema.get("properties", {})
+    required = tuple(schema.get("required", []))
+    allowed = frozenset(properties)
+    closed = schema.get("additionalProperties", True) is False
+    checks = [
+        (name, _JSON_TYPES[spec["type"]], frozenset(spec.get("enum", ())), min_length.get(name, spec.get("minLength", 0)))
+        for name, spec in properties.items()
+    ]
+    
+    def validate(payload: Any) -> Dict[str, Any]:
+        if not isinstance(payload, dict):
+            raise ValueError("response is not a JSON object")
+        missing = [name for name in required if name not in payload]
+        if missing:
+            raise ValueError(f"missing fields: {', '.join(missing)}")
+        if closed:
+            extra = set(payload) - allowed
+            if extra:
+                raise ValueError(f"unexpected fields: {', '.join(sorted(extra))}")
+        for name, expected_type, enum, min_length in checks:
+            if name not in payload:
+                continue
+            value = payload[name]
+            if not isinstance(value, expected_type):
+                raise ValueError(f"field '{name}' must be of type {expected_type.__name__}")
+            if enum and value not in enum:
+                raise ValueError(f"field '{name}' must be one of {sorted(enum)}")
+            if min_length and len(value.strip()) < min_length:
+                raise ValueError(f"field '{name}' is empty")
+        return payload
+    
+    return validate
+
+
+validate_quality_response = _compile_validator(QUALITY_RESPONSE_SCHEMA, LOCAL_MIN_LENGTH)
+
+# Free-text fallback patterns, compiled once
+_SUMMARY_PATTERNS = [
+    re.compile(r'Summary\s*=\s*\[([^\]]+)\]\s*([^\n]+)', re.IGNORECASE),
+    re.compile(r'Jira\s+summary[:\s]*\[([^\]]+)\]\s*([^\n]+)', re.IGNORECASE),
+    re.compile(r'\[([^\]]+)\]\s*([^\n]+)', re.IGNORECASE),
+]
+_DESCRIPTION_PATTERNS = [
+    re.compile(r'As a \[([^\]]+)\], I want \[([^\]]+)\], so that \[([^\]]+)\](.*?)(?=\n\n|\n\*|$)', re.IGNORECASE | re.DOTALL),
+    re.compile(r'User Story[:\s]*As a \[([^\]]+)\], I want \[([^\]]+)\], so that \[([^\]]+)\](.*?)(?=\n\n|\n\*|$)', re.IGNORECASE | re.DOTALL),
+    re.compile(r'Description[:\s]*As a ([^,]+), I want ([^,]+), so that ([^,]+)(.*?)(?=\n\n|\n\*|$)', re.IGNORECASE | re.DOTALL),
+    re.compile(r'Description[:\s]*(.*?)(?=\n\n|\n\*|$)', re.IGNORECASE | re.DOTALL),
+]
 
 class DataQualityChecker:
     """
     A class to perform data quality checks on Excel files using OpenAI agent.
     """
     
-    def __init__(self, api_key: str):
+    def __init__(self, api_key: str, structured_output: bool = True, max_reasks: int = 2, hedger: RequestHedger = None, router: ModelRouter = None, http_client=None, client=None, duplicate_threshold: float = 0.8):
         """
         Initialize the DataQualityChecker with OpenAI client.
         
         Args:
             api_key (str): OpenAI API key. If None, will try to get from environment.
+            structured_output (bool): Request JSON-schema responses instead of free text
+            max_reasks (int): How many times a malformed structured response is re-asked
+            hedger (RequestHedger): Optional hedger that duplicates calls slower than the running p95
+            router (ModelRouter): Picks model and max_tokens per row; defaults to gpt-4o-mini for every row
+            http_client (httpx.Client): Optional HTTP client for the OpenAI SDK, e.g. with a custom
+                transport for recording or replaying calls offline
+            client (OpenAI): Optional ready-made client, e.g. the pooled one from openai_pool
+            duplicate_threshold (float): Description similarity at which rows share one LLM result
         """
         self.api_key = api_key or os.getenv('OPENAI_API_KEY')
         if not self.api_key:
             raise ValueError("OpenAI API key is required. Set OPENAI_API_KEY environment variable or pass api_key parameter.")
         
-        self.client = OpenAI(api_key=self.api_key)
+        self.structured_output = structured_output
+        self.max_reasks = max_reasks
+        self.hedger = hedger
+        self.router = router or ModelRouter.from_config(None)
+        self.duplicate_threshold = duplicate_threshold
+        self._http_client = http_client
+        self._client = client
+        self._client_lock = threading.Lock()
         logger.info("DataQualityChecker initialized successfully")
     
+    @property
+    def client(self):
+        """OpenAI client, created on first use so profiling and planning never load the SDK"""
+        if self._client is None:
+            with self._client_lock:
+                if self._client is None:
+                    from openai import OpenAI
+                    self._client = OpenAI(api_key=self.api_key, http_client=self._http_client)
+        return self._client
+    
     def load_excel_sheet(self, file_path, sheet_name) -> pd.DataFrame:
         """
         Load an Excel file into a pandas DataFrame.
@@ -119,26 +232,48 @@ class DataQualityChecker:
         
       
     
-    def get_openai_analysis(self, prompt: str) -> str:
+    def get_openai_analysis(self, prompt: str, response_format: Dict[str, Any] = None, tier: ModelTier = None) -> str:
         """
         Get analysis from OpenAI agent.
         
         Args:
             prompt (str): The prompt to send to OpenAI
+            response_format (Dict[str, Any]): Optional structured output format (JSON schema)
+            tier (ModelTier): Model and token budget chosen by the router; the default tier if None
             
         Returns:
             str: OpenAI's analysis response
         """
+        tier = tier or self.router.default
         try:
-            response = self.client.chat.completions.create(
-                model="gpt-4o-mini",
-                messages=[
-                    {"role": "system", "content": "You are a data quality expert with extensive experience in data analysis and quality assessment."},
+            request = {
+                "model": tier.model,
+                "messages": [
+                    {"role": "system", "content": SYSTEM_PROMPT},
                     {"role": "user", "content": prompt}
                 ],
-                max_tokens=2000,
-                temperature=0.3
-            )
+                "max_tokens": tier.max_tokens,
+                "temperature": tier.temperature
+            }
+            if response_format:
+                request["response_format"] = response_format
+            started = time.perf_counter()
+            with start_span("openai.chat", model=tier.model, max_tokens=tier.max_tokens, structured=bool(response_format)) as span:
+                try:
+                    if self.hedger:
+                        response = self.hedger.call(lambda: self.client.chat.completions.create(**request))
+                    else:
+                        response = self.client.chat.completions.create(**request)
+                except Exception as e:
+                    outcome = "rate_limited" if getattr(e, "status_code", None) == 429 else "error"
+                    OPENAI_REQUEST_SECONDS.observe(time.perf_counter() - started, model=tier.model, outcome=outcome)
+                    span.set_attributes(outcome=outcome, **{"http.status_code": getattr(e, "status_code", None)})
+                    raise
+                elapsed = time.perf_counter() - started
+                OPENAI_REQUEST_SECONDS.observe(elapsed, model=tier.model, outcome="ok")
+                usage = getattr(response, "usage", None)
+                span.set_attributes(outcome="ok", total_tokens=getattr(usage, "total_tokens", None))
+            self.router.record(tier.model, elapsed)
             
             return response.choices[0].message.content
             
@@ -146,20 +281,122 @@ class DataQualityChecker:
             logger.error(f"Error getting OpenAI analysis: {str(e)}")
             raise
     
-    def data_quality_check(self, df, batch_size=5, max_workers=3):
+    def profile(self, df, columns_cfg=None) -> Dict[str, Any]:
+        """
+        Compute local sheet-level statistics without any LLM calls.
+        
+        Args:
+            df: DataFrame to profile
+            columns_cfg: Mapping of normalized keys to sheet column names
+            
+        Returns:
+            Dict[str, Any]: 'missing_analysis', 'pattern_analysis' and the per-row 'prescreen'
+        """
+        return profile_dataframe(df, columns_cfg)
+    
+    def find_duplicate_clusters(self, df, description_column="Description", threshold=None, key_columns=("Requirement", "Priority")):
+        """
+        Find clusters of near-duplicate requirement rows by description.
+        
+        Rows only share a cluster when their key columns (epic and priority by
+        default) are equal as well, so a copied verdict never crosses rows whose
+        other mandatory fields differ.
+        
+        Args:
+            df: DataFrame to scan
+            description_column: Column holding the requirement description
+            threshold: Minimum estimated Jaccard similarity to treat rows as duplicates
+                (default: the checker's duplicate_threshold)
+            key_columns: Columns that must match exactly within a cluster
+            
+        Returns:
+            List[List]: Row index clusters; the first index of each cluster is its representative
+        """
+        if description_column not in df.columns:
+            return []
+        if threshold is None:
+            threshold = self.duplicate_threshold
+        descriptions = df[description_column]
+        mask = descriptions.notna()
+        clusters = find_near_duplicates(list(df.index[mask]), list(descriptions[mask]), threshold=threshold)
+        key_columns = [c for c in key_columns if c in df.columns]
+        if not key_columns:
+            return clusters
+        split = []
+        for cluster in clusters:
+            groups = {}
+            for idx in cluster:
+                key = tuple(str(df.at[idx, c]).strip() if pd.notna(df.at[idx, c]) else '' for c in key_columns)
+                groups.setdefault(key, []).append(idx)
+            split.extend(group for group in groups.values() if len(group) > 1)
+        return split
+    
+    def describe_duplicate_clusters(self, df, clusters, id_column="Requirement ID"):
+        """
+        Turn duplicate clusters into a data quality finding keyed by requirement ID.
+        """
+        findings = []
+        for cluster in clusters:
+            ids = [str(df.at[idx, id_column]) if id_column in df.columns else str(idx) for idx in cluster]
+            findings.append({
+                'representative': ids[0],
+                'requirement_ids': ids,
+                'row_indices': list(cluster),
+                'size': len(cluster)
+            })
+        return findings
+    
+    def data_quality_check(self, df, batch_size=DEFAULT_BATCH_SIZE, max_workers=DEFAULT_MAX_WORKERS, clusters=None, id_column="Requirement ID", prescreen=None, progress=None):
         """
         Process records with batch processing and parallel API calls for speed
         
+        Near-duplicate rows are enriched once: only the representative of each
+        cluster is sent to the LLM and its result is templated onto the others.
+        Rows that fail the local pre-screen are reported invalid without an LLM call.
+        
         Args:
             df: DataFrame to process
             batch_size: Number of records to process in each batch (default: 5)
             max_workers: Maximum number of parallel threads (default: 3)
+            clusters: Duplicate clusters from find_duplicate_clusters; computed when None,
+                pass [] to disable de-duplication
+            id_column: Column holding the requirement ID used when templating results
+            prescreen: Row index -> missing mandatory fields, from profile(); computed when None
+            progress: Optional callback progress(event, data), called with 'row_enriched' per finished row
         """
         responses = []
-        records = list(df.iterrows())
+        
+        def collect(result):
+            responses.append(result)
+            if progress is not None:
+                progress('row_enriched', {
+                    'row_index': result['row_index'],
+                    'summary': result['summary'],
+                    'is_valid': result['is_valid']
+                })
+        
+        if prescreen is None:
+            prescreen = self.profile(df)['prescreen']
+        for idx, missing_fields in prescreen.items():
+            collect({
+                'row_index': idx,
+                'analysis': f"Quality: INVALID - Missing required fields: {', '.join(missing_fields)}",
+                'summary': '',
+                'description': '',
+                'is_valid': False
+            })
+        if clusters is None:
+            clusters = self.find_duplicate_clusters(df)
+        duplicate_of = {}
+        for cluster in clusters:
+            cluster = [idx for idx in cluster if idx not in prescreen]
+            for member in cluster[1:]:
+                duplicate_of[member] = cluster[0]
+        
+        records = [(idx, row) for idx, row in df.iterrows() if idx not in duplicate_of and idx not in prescreen]
         total_records = len(records)
         
-        logger.info(f"Processing {total_records} records with batch_size={batch_size}, max_workers={max_workers}")
+        logger.info(f"Processing {total_records} records ({len(duplicate_of)} near-duplicates reuse a cluster result) with batch_size={batch_size}, max_workers={max_workers}")
         
         # Process in batches
         for batch_start in range(0, total_records, batch_size):
@@ -172,8 +409,9 @@ class DataQualityChecker:
             with ThreadPoolExecutor(max_workers=max_workers) as executor:
                 future_to_idx = {}
                 
-                for idx, (_, row) in batch_records:
-                    future = executor.submit(self._process_single_record, row, idx)
+                for idx, row in batch_records:
+                    # Row spans stay children of the caller's span on the worker threads
+                    future = executor.submit(bind(self._process_single_record), row, idx)
                     future_to_idx[future] = idx
                 
                 # Collect results as they complete
@@ -181,10 +419,10 @@ class DataQualityChecker:
                     idx = future_to_idx[future]
                     try:
                         result = future.result()
-                        responses.append(result)
+                        collect(result)
                     except Exception as e:
                         logger.warning(f"Error processing record {idx}: {str(e)}")
-                        responses.append({
+                        collect({
                             'row_index': idx,
                             'analysis': f'Error processing: {str(e)}',
                             'summary': '',
@@ -194,35 +432,106 @@ class DataQualityChecker:
             
             # Small delay between batches to avoid rate limiting
             if batch_end < total_records:
-                time.sleep(0.2)
+                time.sleep(BATCH_PAUSE_SECONDS)
+        
+        # Fan cluster results out to the near-duplicate rows
+        by_index = {r['row_index']: r for r in responses}
+        for member, representative in duplicate_of.items():
+            source = by_index.get(representative)
+            if source is not None:
+                collect(self._template_result(source, df, representative, member, id_column))
+        
+        if self.hedger:
+            logger.info(f"Request hedging stats: {self.hedger.stats()}")
+        logger.info(f"Per-model latency stats: {self.router.stats()}")
         
         # Sort by row_index to maintain order
         responses.sort(key=lambda x: x['row_index'])
         return responses
     
+    def _template_result(self, result, df, source_idx, target_idx, id_column):
+        """Copy a representative's result onto a near-duplicate row, swapping the requirement ID"""
+        templated = dict(result)
+        templated['row_index'] = target_idx
+        templated['duplicate_of'] = source_idx
+        if id_column in df.columns:
+            source_id = str(df.at[source_idx, id_column]) if pd.notna(df.at[source_idx, id_column]) else ''
+            target_id = str(df.at[target_idx, id_column]) if pd.notna(df.at[target_idx, id_column]) else ''
+            if source_id and target_id:
+                # Whole IDs only: REQ-1 must not rewrite REQ-10, nor an ID of 1 the "P1" in a priority
+                pattern = re.compile(rf'(?<![\w-]){re.escape(source_id)}(?![\w-])')
+                for key in ('analysis', 'summary', 'description'):
+                    templated[key] = pattern.sub(lambda _: target_id, templated[key])
+        return templated
+    
     def _process_single_record(self, row, idx):
         """Process a single record - used for parallel execution"""
-        try:
-            # Generate optimized single-record prompt
-            prompt = self.generate_single_record_prompt(row, idx)
+        with start_span("enrich_row", row_index=idx, requirement_id=str(row.get('Requirement ID', ''))):
+            if self.structured_output:
+                return self._process_single_record_structured(row, idx)
+            try:
+                # Generate optimized single-record prompt
+                prompt = self.generate_single_record_prompt(row, idx)
             
-            # Get response with timeout
-            response = self.get_openai_analysis(prompt)
+                # Get response with timeout
+                response = self.get_openai_analysis(prompt, tier=self.router.route(row))
             
-            # Parse response
-            result = {
+                # Parse response
+                result = {
+                    'row_index': idx,
+                    'analysis': response,
+                    'summary': self._extract_summary_from_response(response),
+                    'description': self._extract_description_from_response(response),
+                    'is_valid': self._check_if_valid_from_response(response)
+                }
+                return result
+            except Exception as e:
+                logger.warning(f"Error in _process_single_record for {idx}: {str(e)}")
+                raise
+    
+    def _process_single_record_structured(self, row, idx):
+        """
+        Process a single record using schema-validated JSON output.
+        
+        A malformed or incomplete response is re-asked for this row only,
+        up to max_reasks times, before the row is reported as an error.
+        """
+        prompt = self.generate_single_record_prompt(row, idx, structured=True)
+        response_format = {
+            "type": "json_schema",
+            "json_schema": {"name": "requirement_quality", "strict": True, "schema": QUALITY_RESPONSE_SCHEMA}
+        }
+        tier = self.router.route(row)
+        last_error = None
+        for attempt in range(self.max_reasks + 1):
+            request_prompt = prompt
+            if last_error:
+                request_prompt += f"\nYour previous answer was rejected ({last_error}). Reply again with a single JSON object matching the schema.\n"
+            response = self.get_openai_analysis(request_prompt, response_format=response_format, tier=tier)
+            try:
+                payload = self._parse_structured_response(response)
+            except ValueError as e:
+                last_error = str(e)
+                logger.warning(f"Malformed structured response for record {idx} (attempt {attempt + 1}): {last_error}")
+                continue
+            return {
                 'row_index': idx,
-                'analysis': response,
-                'summary': self._extract_summary_from_response(response),
-                'description': self._extract_description_from_response(response),
-                'is_valid': self._check_if_valid_from_response(response)
+                'analysis': f"Quality: {payload['quality']} - {payload['reason']}",
+                'summary': payload['summary'].strip(),
+                'description': payload['description'].strip(),
+                'is_valid': payload['quality'] == 'VALID'
             }
-            return result
-        except Exception as e:
-            logger.warning(f"Error in _process_single_record for {idx}: {str(e)}")
-            raise
+        raise ValueError(f"No valid structured response after {self.max_reasks + 1} attempts: {last_error}")
+    
+    def _parse_structured_response(self, response: str) -> Dict[str, Any]:
+        """Decode and validate a structured response against QUALITY_RESPONSE_SCHEMA"""
+        try:
+            payload = json.loads(response or "")
+        except json.JSONDecodeError as e:
+            raise ValueError(f"invalid JSON: {e.msg}") from e
+        return validate_quality_response(payload)
     
-    def generate_single_record_prompt(self, row, idx):
+    def generate_single_record_prompt(self, row, idx, structured=False):
         """
         Generate an optimized prompt for a single record
         """
@@ -239,6 +548,16 @@ Record {idx + 1}:
             if pd.notna(value):
                 prompt += f"  {col}: {value}\n"
         
+        if structured:
+            prompt += """
+Respond with a JSON object with these fields:
+quality: "VALID" or "INVALID"
+reason: brief reason for the quality assessment
+summary: [Requirement ID] + concise title
+description: As a [user], I want [feature], so that [goal]
+"""
+            return prompt
+        
         prompt += """
 Please provide your analysis in this exact format:
 Quality: [VALID/INVALID] - [brief reason]
@@ -333,17 +652,8 @@ Please analyze all records and provide structured output.
         """
         try:
             # Look for patterns like "Summary = [REQ-001] Title" or "Jira summary: [REQ-001] Title"
-            import re
-            
-            # Try to find summary patterns
-            patterns = [
-                r'Summary\s*=\s*\[([^\]]+)\]\s*([^\n]+)',
-                r'Jira\s+summary[:\s]*\[([^\]]+)\]\s*([^\n]+)',
-                r'\[([^\]]+)\]\s*([^\n]+)',
-            ]
-            
-            for pattern in patterns:
-                match = re.search(pattern, response, re.IGNORECASE)
+            for pattern in _SUMMARY_PATTERNS:
+                match = pattern.search(response)
                 if match:
                     req_id = match.group(1)
                     title = match.group(2).strip()
@@ -361,18 +671,9 @@ Please analyze all records and provide structured output.
         Extract the standardized description from the LLM response
         """
         try:
-            import re
-            
             # Look for standardized description patterns
-            patterns = [
-                r'As a \[([^\]]+)\], I want \[([^\]]+)\], so that \[([^\]]+)\](.*?)(?=\n\n|\n\*|$)',
-                r'User Story[:\s]*As a \[([^\]]+)\], I want \[([^\]]+)\], so that \[([^\]]+)\](.*?)(?=\n\n|\n\*|$)',
-                r'Description[:\s]*As a ([^,]+), I want ([^,]+), so that ([^,]+)(.*?)(?=\n\n|\n\*|$)',
-                r'Description[:\s]*(.*?)(?=\n\n|\n\*|$)',
-            ]
-            
-            for pattern in patterns:
-                match = re.search(pattern, response, re.IGNORECASE | re.DOTALL)
+            for pattern in _DESCRIPTION_PATTERNS:
+                match = pattern.search(response)
                 if match:
                     if len(match.groups()) >= 3:
                         # User story format
@@ -471,12 +772,22 @@ Please analyze all records and provide structured output.
             f.write("PATTERN ANALYSIS:\n")
             f.write("-" * 40 + "\n")
             f.write(json.dumps(results['pattern_analysis'], indent=2))
+            
+            if results.get('duplicate_clusters'):
+                f.write("\n\n")
+                f.write("NEAR-DUPLICATE REQUIREMENTS:\n")
+                f.write("-" * 40 + "\n")
+                f.write(json.dumps(results['duplicate_clusters'], indent=2))
         
         logger.info(f"Analysis report saved to: {output_path}")
         return output_path
 
 
 def main():
+    from dotenv import load_dotenv
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+    load_dotenv()
 
     if len(sys.argv) < 2:
         print("Usage: python3 dataquality_checker.py <file_path>")
@@ -493,7 +804,9 @@ def main():
         df = model.load_excel_sheet(file_path, "1. Requirements - Internal")
     print("Loaded rows:", len(df))
 
-    results = model.data_quality_check(df)
+    profile = model.profile(df)
+    clusters = model.find_duplicate_clusters(df)
+    results = model.data_quality_check(df, clusters=clusters, prescreen=profile['prescreen'])
 
     for result in results:
         print("======== LLM Data Evaluation Response ========")
@@ -501,6 +814,15 @@ def main():
         print("==============================================")
         print()
 
+    model.save_analysis_report({
+        'file_path': file_path,
+        'sheet_name': "1. Requirements - Internal",
+        'openai_analysis': "\n\n".join(f"Row {r['row_index']}: {r['analysis']}" for r in results),
+        'missing_analysis': profile['missing_analysis'],
+        'pattern_analysis': profile['pattern_analysis'],
+        'duplicate_clusters': model.describe_duplicate_clusters(df, clusters)
+    })
+
 
 if __name__ == "__main__":
     main()
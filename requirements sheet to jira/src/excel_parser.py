@@ -1,11 +1,16 @@
-from typing import Any, Dict, List
+from typing import TYPE_CHECKING, Any, Dict, List
 
 import os
-import pandas as pd
 
+if TYPE_CHECKING:
+    import pandas as pd
 
-def _read_any_table(path: str, sheet_name: str = None) -> pd.DataFrame:
+
+def read_table(path: str, sheet_name: str = None) -> "pd.DataFrame":
     """Read Excel or CSV file into DataFrame."""
+    # pandas is imported on first read; it dominates the import time of the CLI and the API
+    import pandas as pd
+
     if path.endswith(".csv"):
         # Handle BOM character in CSV files
         df = pd.read_csv(path, encoding='utf-8-sig')
@@ -16,9 +21,12 @@ def _read_any_table(path: str, sheet_name: str = None) -> pd.DataFrame:
     
 
 def read_excel_records(excel_path: str, sheet_name: str = None) -> List[Dict[str, Any]]:
-    df = _read_any_table(excel_path, sheet_name)
-    df = df.fillna("")
-    records: List[Dict[str, Any]] = df.to_dict(orient="records")
+    return frame_records(read_table(excel_path, sheet_name))
+
+
+def frame_records(df: "pd.DataFrame") -> List[Dict[str, Any]]:
+    """Raw row dicts of an already read sheet, as read_excel_records returns them."""
+    records: List[Dict[str, Any]] = df.fillna("").to_dict(orient="records")
     return records
 
 
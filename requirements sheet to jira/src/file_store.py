@@ -0,0 +1,160 @@
+"""
+Content-addressed store for uploaded requirement files.
+
+Uploads are stored once under their SHA-256 digest, which doubles as the file
+id the API hands back to the frontend. Validate and process calls reference
+the id instead of re-uploading, and per-hash caches (speculative enrichment)
+line up with it for free. Files expire after a TTL and the least recently
+used ones are evicted when the store grows past its size limit; files in use
+by a running request are never evicted.
+"""
+
+import json
+import logging
+import os
+import re
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+from utils import sha256_file
+
+
+logger = logging.getLogger(__name__)
+
+_FILE_ID_RE = re.compile(r"^[0-9a-f]{64}$")
+
+
+class FileStore:
+    """Thread-safe, size- and TTL-bounded store of uploaded files keyed by SHA-256."""
+
+    def __init__(self, root: str = "files", ttl_seconds: float = 86400.0, max_bytes: int = 1024 * 1024 * 1024) -> None:
+        self.root = root
+        self.ttl_seconds = ttl_seconds
+        self.max_bytes = max_bytes
+        os.makedirs(root, exist_ok=True)
+        self._files: Dict[str, Dict[str, Any]] = {}
+        self._refs: Dict[str, int] = {}
+        self._lock = threading.Lock()
+        self._load()
+
+    def _meta_path(self, file_id: str) -> str:
+        return os.path.join(self.root, f"{file_id}.json")
+
+    def _load(self) -> None:
+        """Rebuild the index from the sidecar metadata files left by a previous run."""
+        for name in os.listdir(self.root):
+            if not name.endswith(".json"):
+                continue
+            try:
+                with open(os.path.join(self.root, name), "r", encoding="utf-8") as f:
+                    entry = json.load(f)
+            except (OSError, ValueError) as e:
+                logger.warning(f"Skipping unreadable file metadata {name}: {e}")
+                continue
+            if os.path.exists(entry.get("path", "")):
+                self._files[entry["id"]] = entry
+
+    def _write_meta(self, entry: Dict[str, Any]) -> None:
+        tmp_path = self._meta_path(entry["id"]) + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(entry, f)
+        os.replace(tmp_path, self._meta_path(entry["id"]))
+
+    def put(self, temp_path: str, file_name: str, pin: bool = False) -> Dict[str, Any]:
+        """Move a freshly uploaded file into the store and return its entry.
+
+        The temporary file is consumed: it becomes the stored copy, or is
+        deleted when identical content is already stored. With pin=True the
+        file is acquired before eviction runs; release() it when done.
+        """
+        file_id = sha256_file(temp_path)
+        extension = file_name.rsplit(".", 1)[-1].lower() if "." in file_name else "bin"
+        with self._lock:
+            entry = self._files.get(file_id)
+            if entry is not None and os.path.exists(entry["path"]):
+                os.unlink(temp_path)
+                entry["lastAccess"] = time.time()
+                if pin:
+                    self._refs[file_id] = self._refs.get(file_id, 0) + 1
+                return dict(entry)
+            path = os.path.join(self.root, f"{file_id}.{extension}")
+            os.replace(temp_path, path)
+            now = time.time()
+            entry = {
+                "id": file_id,
+                "fileName": file_name,
+                "path": path,
+                "size": os.path.getsize(path),
+                "storedAt": now,
+                "lastAccess": now,
+            }
+            self._files[file_id] = entry
+            if pin:
+                self._refs[file_id] = self._refs.get(file_id, 0) + 1
+            self._write_meta(entry)
+        self.evict()
+        return dict(entry)
+
+    def get(self, file_id: str) -> Optional[Dict[str, Any]]:
+        """Return the entry for file_id (refreshing its last access) or None."""
+        if not _FILE_ID_RE.match(file_id or ""):
+            return None
+        with self._lock:
+            entry = self._files.get(file_id)
+            if entry is None:
+                return None
+            entry["lastAccess"] = time.time()
+            return dict(entry)
+
+    def acquire(self, file_id: str) -> Optional[Dict[str, Any]]:
+        """Like get(), but pins the file against eviction until release()."""
+        with self._lock:
+            entry = self._files.get(file_id) if _FILE_ID_RE.match(file_id or "") else None
+            if entry is None:
+                return None
+            entry["lastAccess"] = time.time()
+            self._refs[file_id] = self._refs.get(file_id, 0) + 1
+            return dict(entry)
+
+    def release(self, file_id: str) -> None:
+        with self._lock:
+            count = self._refs.get(file_id, 0) - 1
+            if count > 0:
+                self._refs[file_id] = count
+            else:
+                self._refs.pop(file_id, None)
+
+    def evict(self) -> List[str]:
+        """Drop expired files, then least recently used ones until under max_bytes."""
+        removed = []
+        with self._lock:
+            now = time.time()
+            unpinned = sorted(
+                (entry for file_id, entry in self._files.items() if file_id not in self._refs),
+                key=lambda entry: entry["lastAccess"],
+            )
+            total = sum(entry["size"] for entry in self._files.values())
+            for entry in unpinned:
+                if now - entry["lastAccess"] <= self.ttl_seconds and total <= self.max_bytes:
+                    continue
+                total -= entry["size"]
+                del self._files[entry["id"]]
+                removed.append(entry)
+        for entry in removed:
+            for path in (entry["path"], self._meta_path(entry["id"])):
+                try:
+                    os.unlink(path)
+                except OSError:
+                    pass
+        if removed:
+            logger.info(f"Evicted {len(removed)} stored file(s)")
+        return [entry["id"] for entry in removed]
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "files": len(self._files),
+                "bytes": sum(entry["size"] for entry in self._files.values()),
+                "pinned": len(self._refs),
+            }
@@ -0,0 +1,135 @@
+"""
+Request hedging for slow LLM calls.
+
+When a call runs longer than the running p95 latency, a duplicate request is
+issued and whichever answer arrives first wins. A hedging budget caps the
+share of extra requests so tail latency drops without doubling cost.
+"""
+
+import logging
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Any, Callable, Dict, Optional
+
+
+logger = logging.getLogger(__name__)
+
+
+class LatencyTracker:
+    """Thread-safe rolling window of call latencies (seconds)."""
+
+    def __init__(self, window: int = 200) -> None:
+        self._samples: deque = deque(maxlen=window)
+        self._lock = threading.Lock()
+
+    def record(self, seconds: float) -> None:
+        with self._lock:
+            self._samples.append(seconds)
+
+    def count(self) -> int:
+        with self._lock:
+            return len(self._samples)
+
+    def percentile(self, pct: float) -> Optional[float]:
+        # Only needed once calls are being routed or hedged, so numpy stays off the import path
+        import numpy as np
+
+        with self._lock:
+            if not self._samples:
+                return None
+            return float(np.percentile(np.fromiter(self._samples, dtype=float), pct))
+
+
+class RequestHedger:
+    """Run calls with a hedge request once they exceed the running latency percentile."""
+
+    def __init__(
+        self,
+        percentile: float = 95.0,
+        budget: float = 0.1,
+        min_samples: int = 20,
+        window: int = 200,
+        max_workers: int = 8,
+    ) -> None:
+        """
+        Args:
+            percentile: Latency percentile after which a hedge is issued
+            budget: Maximum fraction of extra (hedge) requests relative to primary requests
+            min_samples: Latency samples required before hedging starts
+            window: Number of recent latencies used for the percentile
+            max_workers: Threads available for primary and hedge requests
+        """
+        self.percentile = percentile
+        self.budget = budget
+        self.min_samples = min_samples
+        self.latencies = LatencyTracker(window)
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="hedge")
+        self._lock = threading.Lock()
+        self.requests = 0
+        self.hedges_issued = 0
+        self.hedges_won = 0
+
+    def hedge_delay(self) -> Optional[float]:
+        """Seconds to wait before hedging, or None while there is too little history."""
+        if self.latencies.count() < self.min_samples:
+            return None
+        return self.latencies.percentile(self.percentile)
+
+    def _acquire_hedge(self) -> bool:
+        with self._lock:
+            if self.hedges_issued + 1 > self.budget * self.requests:
+                return False
+            self.hedges_issued += 1
+            return True
+
+    def _timed(self, fn: Callable[[], Any]) -> Any:
+        started = time.perf_counter()
+        result = fn()
+        self.latencies.record(time.perf_counter() - started)
+        return result
+
+    def call(self, fn: Callable[[], Any]) -> Any:
+        """Call fn, hedging it with a duplicate call if it is slower than the running percentile."""
+        with self._lock:
+            self.requests += 1
+        delay = self.hedge_delay()
+        primary = self._executor.submit(self._timed, fn)
+        if delay is None:
+            return primary.result()
+
+        done, _ = wait([primary], timeout=delay)
+        if done or not self._acquire_hedge():
+            return primary.result()
+
+        hedge = self._executor.submit(self._timed, fn)
+        pending = {primary, hedge}
+        last_error: Optional[BaseException] = None
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                if future.exception() is not None:
+                    last_error = future.exception()
+                    continue
+                if future is hedge:
+                    with self._lock:
+                        self.hedges_won += 1
+                return future.result()
+        raise last_error
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            requests, issued, won = self.requests, self.hedges_issued, self.hedges_won
+        return {
+            "requests": requests,
+            "hedges_issued": issued,
+            "hedges_won": won,
+            "hedge_rate": issued / requests if requests else 0.0,
+            "hedge_win_rate": won / issued if issued else 0.0,
+            f"p{int(self.percentile)}_latency": self.latencies.percentile(self.percentile),
+        }
+
+    def shutdown(self) -> None:
+        """Stop the hedger's worker threads; call when the hedger is discarded."""
+        self._executor.shutdown(wait=False)
@@ -1,9 +1,67 @@
 from typing import Any, Dict, List, Optional
 
+import os
 import time
+import uuid
 import requests
 
-from utils import jql_escape_literal
+from run_metrics import RunMetrics
+from service_metrics import JIRA_REQUEST_SECONDS, JIRA_RETRIES
+from tracing import start_span
+from tenant_scheduler import TenantScheduler, get_tenant_scheduler
+from utils import coalesce_str, jql_escape_literal
+
+
+class JiraConfig:
+    """Connection settings for one Jira tenant.
+
+    Built per conversion and handed to JiraClient, so concurrent requests for
+    different tenants never share (or overwrite) process-wide state.
+    """
+
+    def __init__(
+        self,
+        base_url: str,
+        email: str,
+        api_token: str,
+        project_key: str,
+        epic_link_field_key: Optional[str] = None,
+    ) -> None:
+        self.base_url = coalesce_str(base_url)
+        self.email = coalesce_str(email)
+        self.api_token = coalesce_str(api_token)
+        self.project_key = coalesce_str(project_key)
+        self.epic_link_field_key = coalesce_str(epic_link_field_key) or None
+
+    @classmethod
+    def from_request(cls, jira_config: Dict[str, Any]) -> "JiraConfig":
+        """Build from the frontend's camelCase jiraConfig payload."""
+        return cls(
+            jira_config.get("baseUrl"),
+            jira_config.get("email"),
+            jira_config.get("apiToken"),
+            jira_config.get("projectKey"),
+            jira_config.get("epicLinkFieldKey"),
+        )
+
+    @classmethod
+    def from_env(cls, jira_cfg: Optional[Dict[str, Any]] = None) -> "JiraConfig":
+        """Build from the config file's jira section, falling back to JIRA_* environment variables."""
+        jira_cfg = jira_cfg or {}
+        base_url = coalesce_str(jira_cfg.get("base_url")) or coalesce_str(jira_cfg.get("baseUrl")) or coalesce_str(jira_cfg.get("url"))
+        return cls(
+            base_url or coalesce_str(os.getenv("JIRA_BASE_URL")),
+            coalesce_str(os.getenv("JIRA_EMAIL")),
+            coalesce_str(os.getenv("JIRA_API_TOKEN")),
+            coalesce_str(jira_cfg.get("project_key")) or coalesce_str(os.getenv("JIRA_PROJECT_KEY")),
+            jira_cfg.get("epic_link_field_key"),
+        )
+
+    def is_complete(self) -> bool:
+        return bool(self.base_url and self.email and self.api_token and self.project_key)
+
+    def __repr__(self) -> str:
+        return f"JiraConfig(base_url={self.base_url!r}, project_key={self.project_key!r})"
 
 
 class JiraClient:
@@ -15,12 +73,19 @@ class JiraClient:
         project_key: str,
         epic_link_field_key: Optional[str] = None,
         dry_run: bool = False,
+        scheduler: Optional[TenantScheduler] = None,
+        flow_id: Optional[str] = None,
+        metrics: Optional[RunMetrics] = None,
     ) -> None:
         self.base_url = base_url.rstrip("/")
+        # Requests are paced by the tenant's shared scheduler; each client is its own fair-queuing flow
+        self.scheduler = scheduler or (None if dry_run else get_tenant_scheduler(self.base_url))
+        self.flow_id = flow_id or uuid.uuid4().hex
         self.auth = (email, api_token)
         self.project_key = project_key
         self.epic_link_field_key = epic_link_field_key
         self.dry_run = dry_run
+        self.metrics = metrics
         self._session = requests.Session()
         self._session.auth = self.auth
         self._session.headers.update({"Accept": "application/json", "Content-Type": "application/json"})
@@ -29,52 +94,76 @@ class JiraClient:
         if self.dry_run:
             return {"dryRun": True, "method": method, "path": path, **({k: v for k, v in kwargs.items() if v is not None})}
         url = f"{self.base_url}{path}"
-        backoff = 1.0
-        for attempt in range(4):
-            resp = self._session.request(method, url, timeout=60, **kwargs)
-            if resp.status_code in (429, 500, 502, 503, 504):
-                if attempt < 3:
-                    time.sleep(backoff)
-                    backoff *= 2
-                    continue
-            # Better error logging
-            if resp.status_code >= 400:
-                error_msg = f"Jira API Error {resp.status_code}:"
-                print(error_msg)
-                print(f"URL: {url}")
-                print(f"Method: {method}")
-                print(f"Auth Email: {self.auth[0]}")
-                print(f"Auth Token: {self.auth[1][:20]}..." if len(self.auth[1]) > 20 else f"Auth Token: {self.auth[1]}")
-                if kwargs.get('json'):
-                    # Don't print full request body if it's too large
-                    req_body = kwargs.get('json')
-                    if isinstance(req_body, dict) and 'fields' in req_body:
-                        print(f"Request fields: {list(req_body.get('fields', {}).keys())}")
-                    else:
-                        print(f"Request body: {req_body}")
-                print(f"Response: {resp.text}")
-                print("="*50)
-                
-                # Provide helpful error messages for common issues
-                if resp.status_code == 401:
-                    print("\n[认证错误] 可能的原因:")
-                    print("1. API Token 已过期或无效")
-                    print("2. Email 地址不正确")
-                    print("3. API Token 格式错误（应使用完整的API Token，不是密码）")
-                    print("4. 账户可能被禁用或没有API访问权限")
-                    print("\n解决方案:")
-                    print("1. 访问 https://id.atlassian.com/manage-profile/security/api-tokens")
-                    print("2. 创建新的API Token")
-                    print("3. 确保使用正确的Email地址（与Jira账户关联的邮箱）")
-                    print("4. 确保API Token完整复制，没有多余的空格或换行")
+        endpoint = f"{method} {path}"
+        # One span per logical call; attempts and the final status are attributes
+        with start_span("jira.request", **{"http.method": method, "http.route": path}) as span:
+            backoff = 1.0
+            for attempt in range(4):
+                if self.scheduler is not None:
+                    self.scheduler.acquire(self.flow_id)
+                started = time.perf_counter()
+                resp = self._session.request(method, url, timeout=60, **kwargs)
+                elapsed = time.perf_counter() - started
+                span.set_attributes(**{"http.status_code": resp.status_code, "jira.retries": attempt})
+                JIRA_REQUEST_SECONDS.observe(elapsed, method=method, endpoint=path, status=str(resp.status_code))
+                if self.metrics is not None:
+                    self.metrics.record_call(
+                        endpoint,
+                        elapsed,
+                        resp.status_code,
+                        len(resp.request.body or b"") if resp.request is not None else 0,
+                        len(resp.content),
+                    )
+                if resp.status_code in (429, 500, 502, 503, 504):
+                    if attempt < 3:
+                        JIRA_RETRIES.inc(endpoint=path, status=str(resp.status_code))
+                        if self.metrics is not None:
+                            self.metrics.record_retry(endpoint)
+                        if resp.status_code == 429 and self.scheduler is not None:
+                            # Pause every client of this tenant instead of retrying independently
+                            self.scheduler.penalize(_retry_after(resp, backoff))
+                        else:
+                            time.sleep(backoff)
+                        backoff *= 2
+                        continue
+                # Better error logging
+                if resp.status_code >= 400:
+                    error_msg = f"Jira API Error {resp.status_code}:"
+                    print(error_msg)
+                    print(f"URL: {url}")
+                    print(f"Method: {method}")
+                    print(f"Auth Email: {self.auth[0]}")
+                    print(f"Auth Token: {self.auth[1][:20]}..." if len(self.auth[1]) > 20 else f"Auth Token: {self.auth[1]}")
+                    if kwargs.get('json'):
+                        # Don't print full request body if it's too large
+                        req_body = kwargs.get('json')
+                        if isinstance(req_body, dict) and 'fields' in req_body:
+                            print(f"Request fields: {list(req_body.get('fields', {}).keys())}")
+                        else:
+                            print(f"Request body: {req_body}")
+                    print(f"Response: {resp.text}")
                     print("="*50)
+                
+                    # Provide helpful error messages for common issues
+                    if resp.status_code == 401:
+                        print("\n[认证错误] 可能的原因:")
+                        print("1. API Token 已过期或无效")
+                        print("2. Email 地址不正确")
+                        print("3. API Token 格式错误（应使用完整的API Token，不是密码）")
+                        print("4. 账户可能被禁用或没有API访问权限")
+                        print("\n解决方案:")
+                        print("1. 访问 https://id.atlassian.com/manage-profile/security/api-tokens")
+                        print("2. 创建新的API Token")
+                        print("3. 确保使用正确的Email地址（与Jira账户关联的邮箱）")
+                        print("4. 确保API Token完整复制，没有多余的空格或换行")
+                        print("="*50)
+                resp.raise_for_status()
+                if resp.content:
+                    return resp.json()
+                return {}
+            # Fallback (should not reach)
             resp.raise_for_status()
-            if resp.content:
-                return resp.json()
             return {}
-        # Fallback (should not reach)
-        resp.raise_for_status()
-        return {}
 
     def _post(self, path: str, json_body: Dict[str, Any]) -> Dict[str, Any]:
         return self._request_with_retry("POST", path, json=json_body)
@@ -190,3 +279,11 @@ class JiraClient:
         #     fields["components"] = components
 
         return self._post("/rest/api/3/issue", {"fields": fields})
+
+
+def _retry_after(resp: requests.Response, default: float) -> float:
+    """Seconds from a Retry-After header, or default when absent or not numeric."""
+    try:
+        return max(float(resp.headers.get("Retry-After", "")), 0.0)
+    except ValueError:
+        return default
@@ -0,0 +1,272 @@
+"""
+Background conversion jobs for the Flask API.
+
+Jobs run on a bounded worker pool and report progress counters through the
+convert.run progress callback. Job state is written to one JSON file per job
+so status and results survive a server restart; the per-job event log used
+for live streaming is kept in memory only. Finished jobs are forgotten, and
+their files deleted, after retention_seconds or beyond max_finished.
+"""
+
+import json
+import logging
+import os
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+
+logger = logging.getLogger(__name__)
+
+# Progress events from convert.run that increment a counter
+COUNTER_EVENTS = {
+    "row_enriched": "rowsEnriched",
+    "epic_resolved": "epicsResolved",
+    "story_created": "storiesCreated",
+    "story_skipped": "storiesSkipped",
+    "story_failed": "storiesFailed",
+}
+
+ACTIVE_STATUSES = ("queued", "running")
+
+STORY_EVENTS = ("story_created", "story_skipped", "story_failed")
+
+# Oldest events are dropped beyond this; late subscribers still get the final event
+MAX_EVENTS_PER_JOB = 10000
+
+# A finished job's event log is dropped this long after it ends; later
+# subscribers get a single job_finished event rebuilt from the job state
+EVENT_GRACE_SECONDS = 300
+
+
+class JobManager:
+    """Run conversion jobs in the background and persist their state locally."""
+
+    def __init__(self, state_dir: str = "jobs", max_workers: int = 2, persist_interval: float = 1.0,
+                 retention_seconds: float = 7 * 24 * 3600, max_finished: int = 500,
+                 event_grace_seconds: float = EVENT_GRACE_SECONDS) -> None:
+        self.state_dir = state_dir
+        self.persist_interval = persist_interval
+        self.retention_seconds = retention_seconds
+        self.max_finished = max_finished
+        self.event_grace_seconds = event_grace_seconds
+        os.makedirs(state_dir, exist_ok=True)
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="job")
+        self._jobs: Dict[str, Dict[str, Any]] = {}
+        self._last_persist: Dict[str, float] = {}
+        self._events: Dict[str, List[Dict[str, Any]]] = {}
+        # Per-job lock held across snapshot, write and replace of the job file
+        self._write_locks: Dict[str, threading.Lock] = {}
+        self._lock = threading.Lock()
+        self._changed = threading.Condition(self._lock)
+        self._load()
+        self._evict()
+
+    def _path(self, job_id: str) -> str:
+        return os.path.join(self.state_dir, f"{job_id}.json")
+
+    def _load(self) -> None:
+        """Reload persisted jobs; jobs cut off by a restart are marked interrupted."""
+        for name in os.listdir(self.state_dir):
+            if not name.endswith(".json"):
+                continue
+            try:
+                with open(os.path.join(self.state_dir, name), "r", encoding="utf-8") as f:
+                    job = json.load(f)
+            except (OSError, ValueError) as e:
+                logger.warning(f"Skipping unreadable job file {name}: {e}")
+                continue
+            if job.get("status") in ACTIVE_STATUSES:
+                job["status"] = "interrupted"
+                job["error"] = "Server restarted before the job finished"
+                job["finishedAt"] = time.time()
+                self._write(job)
+            self._jobs[job["id"]] = job
+            self._write_locks[job["id"]] = threading.Lock()
+
+    def _write(self, job: Dict[str, Any]) -> None:
+        """Write a job file atomically (caller holds the job's write lock)."""
+        tmp_path = self._path(job["id"]) + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(job, f)
+        os.replace(tmp_path, self._path(job["id"]))
+        self._last_persist[job["id"]] = time.time()
+
+    def _persist(self, job_id: str, force: bool = True) -> None:
+        with self._lock:
+            write_lock = self._write_locks.get(job_id)
+        if write_lock is None:
+            return
+        # Snapshot under the write lock so a newer state is never overwritten by an older one
+        with write_lock:
+            with self._lock:
+                job = self._jobs.get(job_id)
+                if job is None:
+                    return
+                if not force and time.time() - self._last_persist.get(job_id, 0) < self.persist_interval:
+                    return
+                snapshot = json.loads(json.dumps(job))
+            self._write(snapshot)
+
+    def _evict(self) -> None:
+        """Forget finished jobs past retention_seconds or beyond the newest max_finished, and delete their files.
+
+        Also drops the event logs of jobs that finished over event_grace_seconds ago.
+        """
+        now = time.time()
+        with self._lock:
+            for job_id in [
+                job_id for job_id in self._events
+                if self._jobs[job_id]["status"] not in ACTIVE_STATUSES
+                and now - (self._jobs[job_id].get("finishedAt") or 0) > self.event_grace_seconds
+            ]:
+                del self._events[job_id]
+            finished = sorted(
+                (job for job in self._jobs.values() if job["status"] not in ACTIVE_STATUSES),
+                key=lambda job: job.get("finishedAt") or job.get("createdAt") or 0,
+                reverse=True,
+            )
+            expired = [
+                job["id"] for i, job in enumerate(finished)
+                if i >= self.max_finished or now - (job.get("finishedAt") or job.get("createdAt") or 0) > self.retention_seconds
+            ]
+            write_locks = []
+            for job_id in expired:
+                del self._jobs[job_id]
+                self._events.pop(job_id, None)
+                self._last_persist.pop(job_id, None)
+                write_locks.append((job_id, self._write_locks.pop(job_id, None)))
+        for job_id, write_lock in write_locks:
+            if write_lock is not None:
+                write_lock.acquire()
+            try:
+                os.remove(self._path(job_id))
+            except OSError:
+                pass
+            finally:
+                if write_lock is not None:
+                    write_lock.release()
+        if expired:
+            logger.info(f"Removed {len(expired)} finished job(s)")
+
+    def submit(self, fn: Callable[[Callable[[str, Dict[str, Any]], None]], Any], metadata: Optional[Dict[str, Any]] = None) -> str:
+        """Queue fn(progress) on the worker pool and return the new job id.
+
+        fn receives a progress callback compatible with convert.run and returns
+        the job result, which must be JSON-serialisable.
+        """
+        job_id = uuid.uuid4().hex
+        job = {
+            "id": job_id,
+            "status": "queued",
+            "createdAt": time.time(),
+            "startedAt": None,
+            "finishedAt": None,
+            "progress": {"rowsParsed": 0, "rowsEnriched": 0, "epicsResolved": 0, "storiesCreated": 0, "storiesSkipped": 0, "storiesFailed": 0, "throughput": 0.0},
+            "result": None,
+            "error": None,
+        }
+        job.update(metadata or {})
+        self._evict()
+        with self._lock:
+            self._jobs[job_id] = job
+            self._write_locks[job_id] = threading.Lock()
+            self._events[job_id] = []
+            self._emit(job_id, "job_status", {"status": "queued"})
+        self._persist(job_id)
+        self._executor.submit(self._execute, job_id, fn)
+        return job_id
+
+    def _execute(self, job_id: str, fn: Callable[[Callable[[str, Dict[str, Any]], None]], Any]) -> None:
+        self._set(job_id, "job_status", status="running", startedAt=time.time())
+        try:
+            result = fn(self.progress_callback(job_id))
+            self._set(job_id, "job_finished", status="succeeded", result=result, finishedAt=time.time())
+        except Exception as e:
+            logger.error(f"Job {job_id} failed: {e}")
+            self._set(job_id, "job_finished", status="failed", error=str(e), finishedAt=time.time())
+
+    def _set(self, job_id: str, event: str, **fields: Any) -> None:
+        with self._lock:
+            job = self._jobs[job_id]
+            job.update(fields)
+            self._emit(job_id, event, {"status": job["status"], "jiraResults": job["result"], "error": job["error"]})
+        self._persist(job_id)
+
+    def _emit(self, job_id: str, event: str, data: Dict[str, Any]) -> None:
+        """Append an event to the job's log and wake streaming subscribers (lock held)."""
+        events = self._events.setdefault(job_id, [])
+        seq = events[-1]["seq"] + 1 if events else 1
+        events.append({"seq": seq, "event": event, "data": data, "progress": dict(self._jobs[job_id]["progress"])})
+        if len(events) > MAX_EVENTS_PER_JOB:
+            del events[:len(events) - MAX_EVENTS_PER_JOB]
+        self._changed.notify_all()
+
+    def progress_callback(self, job_id: str) -> Callable[[str, Dict[str, Any]], None]:
+        """Progress callback for convert.run that updates this job's counters and event log."""
+        def on_progress(event: str, data: Dict[str, Any]) -> None:
+            with self._lock:
+                job = self._jobs[job_id]
+                counters = job["progress"]
+                if event == "rows_parsed":
+                    counters["rowsParsed"] = data.get("count", 0)
+                elif event == "rows_enriched":
+                    # Rows enriched ahead of the job (speculative enrichment) arrive as one batch
+                    counters["rowsEnriched"] += data.get("count", 0)
+                elif event in COUNTER_EVENTS:
+                    counters[COUNTER_EVENTS[event]] += 1
+                if event in STORY_EVENTS and job["startedAt"]:
+                    done = counters["storiesCreated"] + counters["storiesSkipped"] + counters["storiesFailed"]
+                    counters["throughput"] = round(done / max(time.time() - job["startedAt"], 1e-6), 2)
+                self._emit(job_id, event, data)
+            self._persist(job_id, force=False)
+        return on_progress
+
+    def events(self, job_id: str, after: int = 0, keepalive: float = 15.0) -> Iterator[Optional[Dict[str, Any]]]:
+        """Yield the job's events with seq > after, blocking for new ones until the job ends.
+
+        Yields None when nothing happened for `keepalive` seconds so callers can
+        send a heartbeat. Jobs reloaded from disk yield a single job_finished event.
+        """
+        while True:
+            with self._changed:
+                job = self._jobs.get(job_id)
+                if job is None:
+                    return
+                if job_id not in self._events:
+                    self._events[job_id] = []
+                    if job["status"] not in ACTIVE_STATUSES:
+                        self._emit(job_id, "job_finished", {"status": job["status"], "jiraResults": job["result"], "error": job["error"]})
+                pending = [e for e in self._events[job_id] if e["seq"] > after]
+                if not pending:
+                    if job["status"] not in ACTIVE_STATUSES:
+                        return
+                    self._changed.wait(timeout=keepalive)
+                    pending = [e for e in self._events[job_id] if e["seq"] > after]
+            if not pending:
+                yield None
+                continue
+            for event in pending:
+                yield event
+                after = event["seq"]
+                if event["event"] == "job_finished":
+                    return
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            job = self._jobs.get(job_id)
+            return json.loads(json.dumps(job)) if job else None
+
+    def active_count(self) -> int:
+        with self._lock:
+            return sum(1 for job in self._jobs.values() if job["status"] in ACTIVE_STATUSES)
+
+    def list(self) -> List[Dict[str, Any]]:
+        self._evict()
+        with self._lock:
+            return [
+                {k: job.get(k) for k in ("id", "status", "createdAt", "finishedAt", "fileName")}
+                for job in self._jobs.values()
+            ]
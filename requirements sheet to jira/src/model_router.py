@@ -0,0 +1,139 @@
+"""
+Complexity-aware model routing for data quality checks.
+
+Short, well-formed rows go to the cheap/fast model with a small token budget;
+long or ambiguous rows escalate to a larger model. Per-model latency is
+recorded so the routing thresholds can be tuned from real numbers.
+"""
+
+import threading
+from typing import Any, Dict, List, Optional
+
+from hedging import LatencyTracker
+from utils import coalesce_str
+
+
+VALID_PRIORITIES = ("P0", "P1", "P2", "P3", "P4")
+
+
+class ModelTier:
+    """A model together with the request parameters used for it."""
+
+    def __init__(self, name: str, model: str, max_tokens: int, temperature: float) -> None:
+        self.name = name
+        self.model = model
+        self.max_tokens = max_tokens
+        self.temperature = temperature
+
+    def __repr__(self) -> str:
+        return f"ModelTier({self.name!r}, model={self.model!r}, max_tokens={self.max_tokens})"
+
+
+class ModelRouter:
+    """Pick a model tier per requirement row and keep per-model latency stats."""
+
+    def __init__(
+        self,
+        default: ModelTier,
+        fast: Optional[ModelTier] = None,
+        escalation: Optional[ModelTier] = None,
+        long_description_chars: int = 600,
+        min_description_words: int = 6,
+        required_columns: Optional[List[str]] = None,
+        description_column: str = "Description",
+        priority_column: str = "Priority",
+    ) -> None:
+        self.default = default
+        self.fast = fast
+        self.escalation = escalation
+        self.long_description_chars = long_description_chars
+        self.min_description_words = min_description_words
+        self.required_columns = required_columns or ["Requirement ID", "Requirement", "Description", "Priority"]
+        self.description_column = description_column
+        self.priority_column = priority_column
+        self._latencies: Dict[str, LatencyTracker] = {}
+        self._calls: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_config(cls, quality_cfg: Optional[Dict[str, Any]]) -> "ModelRouter":
+        """Build a router from the data_quality config section.
+
+        Without a routing section every row uses openai_model/max_tokens/temperature.
+        """
+        quality_cfg = quality_cfg or {}
+        temperature = float(quality_cfg.get("temperature", 0.3))
+        default = ModelTier(
+            "default",
+            coalesce_str(quality_cfg.get("openai_model"), "gpt-4o-mini"),
+            int(quality_cfg.get("max_tokens", 2000)),
+            temperature,
+        )
+        routing_cfg = quality_cfg.get("routing", {}) or {}
+        if not routing_cfg.get("enabled", False):
+            return cls(default)
+        fast = ModelTier(
+            "fast",
+            coalesce_str(routing_cfg.get("fast_model"), default.model),
+            int(routing_cfg.get("fast_max_tokens", 400)),
+            temperature,
+        )
+        escalation = ModelTier(
+            "escalation",
+            coalesce_str(routing_cfg.get("escalation_model"), default.model),
+            int(routing_cfg.get("escalation_max_tokens", default.max_tokens)),
+            temperature,
+        )
+        return cls(
+            default,
+            fast=fast,
+            escalation=escalation,
+            long_description_chars=int(routing_cfg.get("long_description_chars", 600)),
+            min_description_words=int(routing_cfg.get("min_description_words", 6)),
+        )
+
+    def is_complex(self, row: Any) -> bool:
+        """True for long or ambiguous rows: missing required fields, bad priority, vague or long text."""
+        for column in self.required_columns:
+            if not coalesce_str(_get(row, column)):
+                return True
+        priority = coalesce_str(_get(row, self.priority_column)).upper()
+        if priority not in VALID_PRIORITIES:
+            return True
+        description = coalesce_str(_get(row, self.description_column))
+        if len(description) > self.long_description_chars:
+            return True
+        return len(description.split()) < self.min_description_words
+
+    def route(self, row: Any) -> ModelTier:
+        if self.fast is None or self.escalation is None:
+            return self.default
+        return self.escalation if self.is_complex(row) else self.fast
+
+    def record(self, model: str, seconds: float) -> None:
+        with self._lock:
+            tracker = self._latencies.get(model)
+            if tracker is None:
+                tracker = self._latencies[model] = LatencyTracker(window=1000)
+            self._calls[model] = self._calls.get(model, 0) + 1
+        tracker.record(seconds)
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        """Per-model call counts and latency percentiles (seconds)."""
+        with self._lock:
+            items = list(self._latencies.items())
+            calls = dict(self._calls)
+        return {
+            model: {
+                "calls": calls.get(model, 0),
+                "p50": tracker.percentile(50),
+                "p95": tracker.percentile(95),
+            }
+            for model, tracker in items
+        }
+
+
+def _get(row: Any, column: str) -> Any:
+    """Read a row value, treating NaN as missing."""
+    value = row.get(column) if hasattr(row, "get") else None
+    return None if value is None or value != value else value
@@ -0,0 +1,142 @@
+"""
+Process-wide OpenAI clients and data quality checkers.
+
+Every OpenAI client owns an httpx connection pool, so building one per run
+meant a fresh TCP/TLS handshake for every upload. Instead one client per API
+key is shared by all conversions, with bounded pool limits and keep-alive,
+and checkers are shared per API key and data_quality settings (model,
+routing, hedging), which also keeps the router's and hedger's latency
+windows warm across runs. Clients and checkers are thread-safe and are used
+concurrently by API requests, jobs and the enrichment workers.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import threading
+from typing import Any, Dict, Optional, Tuple
+
+from hedging import RequestHedger
+from model_router import ModelRouter
+from service_metrics import CACHE_REQUESTS
+
+
+logger = logging.getLogger(__name__)
+
+CONNECT_TIMEOUT_SECONDS = 5.0
+
+_clients: Dict[str, Any] = {}
+_checkers: Dict[Tuple[str, str], Any] = {}
+_lock = threading.Lock()
+
+
+def _key_id(api_key: str) -> str:
+    """Registry key for an API key; the key itself is not kept in the registries."""
+    return hashlib.sha256(api_key.encode("utf-8")).hexdigest()
+
+
+def _settings_key(quality_cfg: Dict[str, Any]) -> str:
+    # 'enabled' and 'pricing' do not change how rows are checked
+    relevant = {k: v for k, v in quality_cfg.items() if k not in ("enabled", "pricing")}
+    return json.dumps(relevant, sort_keys=True, default=str)
+
+
+def _new_client(api_key: str) -> Any:
+    import httpx
+    from openai import DefaultHttpxClient, OpenAI
+
+    # Read when the client is built, after the entry point has loaded .env
+    max_connections = int(os.getenv("OPENAI_MAX_CONNECTIONS", "20"))
+    max_keepalive = int(os.getenv("OPENAI_MAX_KEEPALIVE_CONNECTIONS", "10"))
+    http_client = DefaultHttpxClient(
+        limits=httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive,
+            keepalive_expiry=float(os.getenv("OPENAI_KEEPALIVE_SECONDS", "60")),
+        ),
+        timeout=httpx.Timeout(float(os.getenv("OPENAI_TIMEOUT_SECONDS", "120")), connect=CONNECT_TIMEOUT_SECONDS),
+    )
+    logger.info(f"OpenAI connection pool created (max {max_connections} connections, {max_keepalive} kept alive)")
+    return OpenAI(api_key=api_key, http_client=http_client)
+
+
+def get_openai_client(api_key: str) -> Any:
+    """Shared OpenAI client (and connection pool) for an API key."""
+    key = _key_id(api_key)
+    with _lock:
+        client = _clients.get(key)
+    if client is not None:
+        return client
+    # Built outside the lock (first use imports openai/httpx); first one stored wins
+    client = _new_client(api_key)
+    with _lock:
+        stored = _clients.setdefault(key, client)
+    if stored is not client:
+        client.close()
+    return stored
+
+
+def _new_checker(api_key: str, quality_cfg: Dict[str, Any]) -> Any:
+    from data_quality_checker import DataQualityChecker
+
+    hedging_cfg = quality_cfg.get("hedging", {}) or {}
+    hedger = None
+    if hedging_cfg.get("enabled", False):
+        hedger = RequestHedger(
+            percentile=float(hedging_cfg.get("percentile", 95)),
+            budget=float(hedging_cfg.get("budget", 0.1)),
+            min_samples=int(hedging_cfg.get("min_samples", 20)),
+        )
+    return DataQualityChecker(
+        api_key,
+        structured_output=bool(quality_cfg.get("structured_output", True)),
+        max_reasks=int(quality_cfg.get("max_reasks", 2)),
+        hedger=hedger,
+        router=ModelRouter.from_config(quality_cfg),
+        client=get_openai_client(api_key),
+        duplicate_threshold=float(quality_cfg.get("duplicate_threshold", 0.8)),
+    )
+
+
+def get_quality_checker(api_key: str, quality_cfg: Optional[Dict[str, Any]] = None) -> Any:
+    """Shared DataQualityChecker for an API key and data_quality config section."""
+    quality_cfg = quality_cfg or {}
+    key = (_key_id(api_key), _settings_key(quality_cfg))
+    with _lock:
+        checker = _checkers.get(key)
+    if checker is not None:
+        CACHE_REQUESTS.inc(cache="quality_checker", result="hit")
+        return checker
+    CACHE_REQUESTS.inc(cache="quality_checker", result="miss")
+    # Built outside the lock (it imports the data quality stack on first use); first one stored wins
+    checker = _new_checker(api_key, quality_cfg)
+    with _lock:
+        stored = _checkers.setdefault(key, checker)
+    if stored is not checker:
+        _discard(checker)
+    return stored
+
+
+def _discard(checker: Any) -> None:
+    """Release what an unused checker owns; its hedger has its own thread pool."""
+    if checker.hedger is not None:
+        checker.hedger.shutdown()
+
+
+def pool_stats() -> Dict[str, int]:
+    with _lock:
+        return {"clients": len(_clients), "checkers": len(_checkers)}
+
+
+def close_all() -> None:
+    """Close every pooled connection and forget all clients and checkers."""
+    with _lock:
+        clients = list(_clients.values())
+        checkers = list(_checkers.values())
+        _clients.clear()
+        _checkers.clear()
+    for checker in checkers:
+        _discard(checker)
+    for client in clients:
+        client.close()
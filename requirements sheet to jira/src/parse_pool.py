@@ -0,0 +1,148 @@
+"""
+Sheet parsing in worker processes for the API.
+
+pandas/openpyxl parsing holds the GIL for seconds on large workbooks, which
+stalls every other request of the threaded server, health checks included.
+ParsePool runs that work in a small pool of worker processes; only the
+results (plain records and validation dicts, pickled) come back.
+
+Admission is bounded: at most max_pending run()/run_all() requests are
+queued or running, however many calls each one batches. Request handlers
+ask without blocking and answer 503 when the pool is full (ParsePoolBusy);
+background jobs wait for a slot instead.
+
+Workers are forked, so they start with the server's modules already imported
+and never re-run the app module (which would reload the job store). Call
+start() once the app module has finished loading (functions sent to workers
+must exist in the forked copy) and while the process has no other threads,
+i.e. before the server starts; otherwise the pool is forked on first use.
+Where fork is unavailable, or with max_workers=0, calls run inline in the
+calling thread under the same admission limit.
+"""
+
+import functools
+import logging
+import multiprocessing
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Callable, Dict, List, Optional
+
+from service_metrics import PARSE_REJECTED
+from tracing import start_span
+
+
+logger = logging.getLogger(__name__)
+
+
+class ParsePoolBusy(Exception):
+    """Raised when a non-blocking call finds max_pending calls already queued or running."""
+
+
+def _ready() -> bool:
+    return True
+
+
+class ParsePool:
+    """Bounded process pool for CPU-bound parsing."""
+
+    def __init__(self, max_workers: int = 2, max_pending: int = 8) -> None:
+        """
+        Args:
+            max_workers: Worker processes (0 parses in the calling thread)
+            max_pending: run()/run_all() requests allowed to be queued or running at once
+        """
+        self.max_pending = max(max_pending, 1)
+        self.max_workers = max_workers
+        if max_workers > 0 and "fork" not in multiprocessing.get_all_start_methods():
+            logger.warning("Process pool parsing needs fork; parsing in request threads instead")
+            self.max_workers = 0
+        self._pending = 0
+        self._cond = threading.Condition()
+        self._executor: Optional[ProcessPoolExecutor] = None
+
+    def start(self) -> Optional[ProcessPoolExecutor]:
+        """Fork the worker processes now (otherwise they are forked on first use); None when parsing inline."""
+        with self._cond:
+            if self.max_workers <= 0 or self._executor is not None:
+                return self._executor
+        # Forked outside the lock, so admission and stats never wait for it
+        executor = self._new_executor()
+        with self._cond:
+            if self._executor is None:
+                self._executor = executor
+                return executor
+            current = self._executor
+        # Another thread started the pool first
+        executor.shutdown(wait=False)
+        return current
+
+    def _new_executor(self) -> ProcessPoolExecutor:
+        executor = ProcessPoolExecutor(max_workers=self.max_workers, mp_context=multiprocessing.get_context("fork"))
+        # With fork the executor starts every worker on its first submit
+        executor.submit(_ready).result()
+        logger.info(f"Parse pool started with {self.max_workers} worker process(es), at most {self.max_pending} pending requests")
+        return executor
+
+    def pending(self) -> int:
+        with self._cond:
+            return self._pending
+
+    def stats(self) -> Dict[str, Any]:
+        with self._cond:
+            return {"workers": self.max_workers, "pending": self._pending, "maxPending": self.max_pending}
+
+    def _acquire(self, block: bool) -> None:
+        with self._cond:
+            while self._pending >= self.max_pending:
+                if not block:
+                    PARSE_REJECTED.inc()
+                    raise ParsePoolBusy(f"Server is busy parsing other files ({self._pending} pending); retry shortly")
+                self._cond.wait()
+            self._pending += 1
+
+    def _release(self) -> None:
+        with self._cond:
+            self._pending -= 1
+            self._cond.notify_all()
+
+    def run_all(self, calls: List[Callable[[], Any]], block: bool = False) -> List[Any]:
+        """Run picklable zero-argument calls (e.g. functools.partial) in parallel; results in order.
+
+        The batch counts as one request against max_pending. Raises
+        ParsePoolBusy when block is False and the pool is full; exceptions
+        raised by a call are re-raised here.
+        """
+        self._acquire(block)
+        try:
+            with start_span("parse_pool", calls=len(calls), workers=self.max_workers):
+                executor = self.start()
+                if executor is None:
+                    return [call() for call in calls]
+                futures = [executor.submit(call) for call in calls]
+                try:
+                    return [future.result() for future in futures]
+                except BrokenProcessPool:
+                    self._replace(executor)
+                    raise
+        finally:
+            self._release()
+
+    def run(self, fn: Callable[..., Any], *args: Any, block: bool = False, **kwargs: Any) -> Any:
+        """Run fn(*args, **kwargs) in a worker process; see run_all."""
+        return self.run_all([functools.partial(fn, *args, **kwargs)], block=block)[0]
+
+    def _replace(self, broken: ProcessPoolExecutor) -> None:
+        """Drop the pool after a worker died (e.g. killed while parsing a huge workbook); the next call forks a fresh one."""
+        with self._cond:
+            if self._executor is not broken:
+                return
+            logger.warning("A parse worker died; restarting the parse pool")
+            self._executor = None
+        broken.shutdown(wait=False)
+
+    def shutdown(self) -> None:
+        with self._cond:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True)
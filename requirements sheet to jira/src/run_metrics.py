@@ -0,0 +1,170 @@
+"""
+Per-run instrumentation for convert.run.
+
+RunMetrics collects wall time per stage (parse, quality check, epic lookup,
+story search, story create, ...), counters, every Jira API call with its
+latency, status and payload sizes, retries, and the run's peak traced
+memory. With profile=True each stage is also run under cProfile, so a slow
+run can be attributed to the functions inside the dominant stage.
+"""
+
+import cProfile
+import io
+import logging
+import os
+import pstats
+import threading
+import time
+import tracemalloc
+from collections import defaultdict
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional
+
+from tracing import start_span
+
+
+logger = logging.getLogger(__name__)
+
+
+class RunMetrics:
+    """Stage timings, counters and API call statistics for one conversion run."""
+
+    def __init__(self, profile: bool = False, track_memory: bool = True) -> None:
+        """
+        Args:
+            profile: Run each stage under cProfile (adds noticeable overhead)
+            track_memory: Record peak memory with tracemalloc while the run is active
+        """
+        self.profile = profile
+        self.track_memory = track_memory
+        self.stage_seconds: Dict[str, float] = defaultdict(float)
+        self.stage_entries: Dict[str, int] = defaultdict(int)
+        self.counters: Dict[str, int] = defaultdict(int)
+        self.api_calls: Dict[str, Dict[str, Any]] = {}
+        self.retries: Dict[str, int] = defaultdict(int)
+        self.bytes_sent = 0
+        self.bytes_received = 0
+        self.peak_memory_bytes: Optional[int] = None
+        self.wall_seconds = 0.0
+        self._profiles: Dict[str, cProfile.Profile] = {}
+        self._started: Optional[float] = None
+        self._started_tracemalloc = False
+        self._lock = threading.Lock()
+
+    def start(self) -> None:
+        self._started = time.perf_counter()
+        if self.track_memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_tracemalloc = True
+        if tracemalloc.is_tracing():
+            tracemalloc.reset_peak()
+
+    def finish(self) -> None:
+        if self._started is not None:
+            self.wall_seconds = time.perf_counter() - self._started
+        if tracemalloc.is_tracing():
+            self.peak_memory_bytes = tracemalloc.get_traced_memory()[1]
+            if self._started_tracemalloc:
+                tracemalloc.stop()
+                self._started_tracemalloc = False
+
+    @contextmanager
+    def stage(self, name: str, **attributes: Any) -> Iterator[Any]:
+        """Time a block as part of `name`; a stage may be entered many times (e.g. per story).
+
+        Each entry is also a trace span carrying `attributes`; the span is yielded
+        so the block can add attributes it only learns while running.
+        """
+        profiler = None
+        if self.profile:
+            profiler = self._profiles.setdefault(name, cProfile.Profile())
+            profiler.enable()
+        started = time.perf_counter()
+        try:
+            with start_span(name, **attributes) as span:
+                yield span
+        finally:
+            elapsed = time.perf_counter() - started
+            if profiler is not None:
+                profiler.disable()
+            with self._lock:
+                self.stage_seconds[name] += elapsed
+                self.stage_entries[name] += 1
+
+    def count(self, name: str, n: int = 1) -> None:
+        with self._lock:
+            self.counters[name] += n
+
+    def record_call(self, endpoint: str, seconds: float, status: int, bytes_sent: int = 0, bytes_received: int = 0) -> None:
+        """Record one HTTP attempt against `endpoint` (e.g. "POST /rest/api/3/issue")."""
+        with self._lock:
+            stats = self.api_calls.setdefault(endpoint, {"count": 0, "errors": 0, "totalSeconds": 0.0, "maxSeconds": 0.0, "latencies": []})
+            stats["count"] += 1
+            stats["totalSeconds"] += seconds
+            stats["maxSeconds"] = max(stats["maxSeconds"], seconds)
+            stats["latencies"].append(seconds)
+            if status >= 400:
+                stats["errors"] += 1
+            self.bytes_sent += bytes_sent
+            self.bytes_received += bytes_received
+
+    def record_retry(self, endpoint: str) -> None:
+        with self._lock:
+            self.retries[endpoint] += 1
+
+    def summary(self) -> Dict[str, Any]:
+        """JSON-serializable view of everything collected so far."""
+        with self._lock:
+            api = {}
+            for endpoint, stats in self.api_calls.items():
+                latencies = sorted(stats["latencies"])
+                api[endpoint] = {
+                    "count": stats["count"],
+                    "errors": stats["errors"],
+                    "retries": self.retries.get(endpoint, 0),
+                    "meanMs": round(stats["totalSeconds"] / stats["count"] * 1000, 2),
+                    "p95Ms": round(latencies[min(int(len(latencies) * 0.95), len(latencies) - 1)] * 1000, 2),
+                    "maxMs": round(stats["maxSeconds"] * 1000, 2),
+                }
+            return {
+                "wallSeconds": round(self.wall_seconds, 3),
+                "stages": {
+                    name: {"seconds": round(seconds, 4), "entries": self.stage_entries[name]}
+                    for name, seconds in self.stage_seconds.items()
+                },
+                "counters": dict(self.counters),
+                "apiCalls": api,
+                "apiCallTotal": sum(stats["count"] for stats in self.api_calls.values()),
+                "retryTotal": sum(self.retries.values()),
+                "bytesSent": self.bytes_sent,
+                "bytesReceived": self.bytes_received,
+                "peakMemoryMiB": round(self.peak_memory_bytes / (1024 * 1024), 2) if self.peak_memory_bytes is not None else None,
+            }
+
+    def log_summary(self) -> None:
+        summary = self.summary()
+        stages = ", ".join(f"{name} {stats['seconds']:.2f}s" for name, stats in sorted(summary["stages"].items(), key=lambda item: -item[1]["seconds"]))
+        logger.info(f"Run finished in {summary['wallSeconds']:.2f}s; stages: {stages or 'none'}")
+        logger.info(
+            f"Jira API: {summary['apiCallTotal']} calls, {summary['retryTotal']} retries, "
+            f"{summary['bytesSent']} bytes sent, {summary['bytesReceived']} bytes received; "
+            f"peak memory {summary['peakMemoryMiB']} MiB; counters {summary['counters']}"
+        )
+
+    def profile_report(self, limit: int = 15) -> str:
+        """Top functions by cumulative time for each profiled stage."""
+        out = io.StringIO()
+        for name, profiler in self._profiles.items():
+            out.write(f"\n=== Stage: {name} ({self.stage_seconds[name]:.3f}s) ===\n")
+            pstats.Stats(profiler, stream=out).sort_stats("cumulative").print_stats(limit)
+        return out.getvalue()
+
+    def dump_profiles(self, directory: str) -> List[str]:
+        """Write one <stage>.pstats file per profiled stage; returns the paths written."""
+        os.makedirs(directory, exist_ok=True)
+        paths = []
+        for name, profiler in self._profiles.items():
+            path = os.path.join(directory, f"{name}.pstats")
+            profiler.dump_stats(path)
+            paths.append(path)
+        return paths
@@ -0,0 +1,261 @@
+"""
+Pre-execution planning for a conversion run.
+
+plan_run() reads a sheet the way convert.run does and, without calling Jira
+or OpenAI, reports what the run would do: epic lookups/creates, story
+searches/creates, LLM calls with estimated prompt and completion tokens (and
+cost where the model price is known), and a projected wall time.
+
+The projection uses latencies measured by this process (service_metrics)
+when there are any, otherwise conservative defaults, together with the
+enrichment batching (batch size, workers, pause) and the tenant's Jira rate
+budget. Creates are upper bounds: epics and stories that already exist are
+found by the lookups and skipped.
+"""
+
+import json
+import math
+import os
+from typing import Any, Dict, List, Optional
+
+import pandas as pd
+
+from data_quality_checker import (
+    BATCH_PAUSE_SECONDS,
+    DEFAULT_BATCH_SIZE,
+    DEFAULT_MAX_WORKERS,
+    QUALITY_RESPONSE_SCHEMA,
+    SYSTEM_PROMPT,
+    DataQualityChecker,
+)
+from excel_parser import normalize_records
+from model_router import ModelRouter
+from service_metrics import JIRA_REQUEST_SECONDS, OPENAI_REQUEST_SECONDS
+from tenant_scheduler import default_budget, get_tenant_scheduler
+from utils import coalesce_str
+
+
+DEFAULT_JIRA_LATENCY = 0.3
+DEFAULT_LLM_LATENCY = 3.0
+# Rough English-text ratio; good enough for budgeting without a tokenizer dependency
+CHARS_PER_TOKEN = 4
+MESSAGE_OVERHEAD_TOKENS = 12
+# Summary, quality reason and formatting around the rewritten description
+COMPLETION_OVERHEAD_TOKENS = 60
+# USD per million (prompt, completion) tokens; override with data_quality.pricing
+MODEL_PRICES_PER_MILLION = {
+    "gpt-4o-mini": (0.15, 0.60),
+    "gpt-4o": (2.50, 10.00),
+}
+
+
+def estimate_tokens(text: str) -> int:
+    return math.ceil(len(text) / CHARS_PER_TOKEN) if text else 0
+
+
+def _read_sheet(excel_path: str, sheet_name: str) -> pd.DataFrame:
+    if excel_path.endswith(".csv"):
+        return pd.read_csv(excel_path, encoding="utf-8-sig")
+    return pd.read_excel(excel_path, sheet_name=sheet_name, engine="openpyxl")
+
+
+def _jira_rate(jira_base_url: Optional[str]) -> Dict[str, Optional[float]]:
+    """The rate budget run() would be paced by: the tenant's scheduler, or the process default."""
+    if jira_base_url:
+        scheduler = get_tenant_scheduler(jira_base_url)
+        if scheduler is None:
+            return {"rate": None, "burst": None}
+        return {"rate": scheduler.rate, "burst": scheduler.burst}
+    rate, burst = default_budget()
+    if rate > 0:
+        return {"rate": rate, "burst": burst}
+    return {"rate": None, "burst": None}
+
+
+def plan_jira(
+    records: List[Dict[str, Any]],
+    jira_base_url: Optional[str] = None,
+    latency: Optional[float] = None,
+    measured_latency: Optional[float] = None,
+) -> Dict[str, Any]:
+    """Count the Jira calls run() makes for these normalized records and project their time.
+
+    measured_latency replaces this process's own measurement, e.g. when
+    planning in a worker process for a server that made the calls.
+    """
+    epics = {coalesce_str(r.get("requirement")) for r in records} - {""}
+    stories = sum(1 for r in records if coalesce_str(r.get("requirement_id")))
+    calls = 2 * len(epics) + 2 * stories
+
+    measured = measured_latency if measured_latency is not None else JIRA_REQUEST_SECONDS.mean()
+    latency_source = "configured" if latency is not None else ("measured" if measured is not None else "default")
+    latency = latency if latency is not None else (measured if measured is not None else DEFAULT_JIRA_LATENCY)
+    budget = _jira_rate(jira_base_url)
+
+    # run() sends one request at a time, so the slower of latency and rate budget wins
+    seconds = calls * latency
+    if budget["rate"]:
+        seconds = max(seconds, max(calls - budget["burst"], 0) / budget["rate"])
+    return {
+        "epics": len(epics),
+        "stories": stories,
+        "epicLookups": len(epics),
+        "epicCreatesMax": len(epics),
+        "storySearches": stories,
+        "storyCreatesMax": stories,
+        "totalCalls": calls,
+        "latencySeconds": round(latency, 3),
+        "latencySource": latency_source,
+        "rateLimit": budget["rate"],
+        "estimatedSeconds": round(seconds, 1),
+    }
+
+
+def plan_llm(
+    df: pd.DataFrame,
+    quality_cfg: Optional[Dict[str, Any]] = None,
+    latency: Optional[float] = None,
+    measured_latencies: Optional[Dict[str, float]] = None,
+) -> Dict[str, Any]:
+    """Estimate LLM calls, tokens, cost and time for enriching this sheet.
+
+    measured_latencies (per model) replaces this process's own measurements.
+    """
+    quality_cfg = quality_cfg or {}
+    structured = bool(quality_cfg.get("structured_output", True))
+    router = ModelRouter.from_config(quality_cfg)
+    # Only prompt building, profiling and clustering are used; no request is sent
+    checker = DataQualityChecker(
+        os.getenv("OPENAI_API_KEY") or "planning-only",
+        structured_output=structured,
+        router=router,
+        duplicate_threshold=float(quality_cfg.get("duplicate_threshold", 0.8)),
+    )
+
+    prescreen = checker.profile(df)["prescreen"]
+    clusters = checker.find_duplicate_clusters(df)
+    duplicates = set()
+    for cluster in clusters:
+        members = [idx for idx in cluster if idx not in prescreen]
+        duplicates.update(members[1:])
+
+    fixed_prompt_tokens = estimate_tokens(SYSTEM_PROMPT) + MESSAGE_OVERHEAD_TOKENS
+    if structured:
+        fixed_prompt_tokens += estimate_tokens(json.dumps(QUALITY_RESPONSE_SCHEMA))
+    by_model: Dict[str, Dict[str, Any]] = {}
+    calls = 0
+    for idx, row in df.iterrows():
+        if idx in prescreen or idx in duplicates:
+            continue
+        tier = router.route(row)
+        prompt = checker.generate_single_record_prompt(row, idx, structured=structured)
+        description = row.get("Description")
+        description_tokens = estimate_tokens(str(description)) if pd.notna(description) else 0
+        stats = by_model.setdefault(tier.model, {"calls": 0, "promptTokens": 0, "completionTokens": 0})
+        stats["calls"] += 1
+        stats["promptTokens"] += fixed_prompt_tokens + estimate_tokens(prompt)
+        stats["completionTokens"] += min(tier.max_tokens, description_tokens + COMPLETION_OVERHEAD_TOKENS)
+        calls += 1
+
+    prices = dict(MODEL_PRICES_PER_MILLION)
+    for model, price in (quality_cfg.get("pricing") or {}).items():
+        prices[model] = (float(price["prompt"]), float(price["completion"]))
+    total_cost: Optional[float] = 0.0
+    weighted_latency = 0.0
+    latency_sources = set()
+    for model, stats in by_model.items():
+        if model in prices:
+            prompt_price, completion_price = prices[model]
+            stats["estimatedCostUsd"] = round((stats["promptTokens"] * prompt_price + stats["completionTokens"] * completion_price) / 1e6, 4)
+            if total_cost is not None:
+                total_cost += stats["estimatedCostUsd"]
+        else:
+            stats["estimatedCostUsd"] = None
+            total_cost = None
+        if measured_latencies is not None:
+            measured = measured_latencies.get(model)
+        else:
+            measured = OPENAI_REQUEST_SECONDS.mean(model=model, outcome="ok")
+        if latency is not None:
+            model_latency, source = latency, "configured"
+        elif measured is not None:
+            model_latency, source = measured, "measured"
+        else:
+            model_latency, source = DEFAULT_LLM_LATENCY, "default"
+        stats["latencySeconds"] = round(model_latency, 3)
+        latency_sources.add(source)
+        weighted_latency += model_latency * stats["calls"]
+    mean_latency = weighted_latency / calls if calls else 0.0
+
+    # data_quality_check: batches of DEFAULT_BATCH_SIZE rows, DEFAULT_MAX_WORKERS at a time, paused between batches
+    batches = math.ceil(calls / DEFAULT_BATCH_SIZE)
+    seconds = 0.0
+    for batch in range(batches):
+        rows_in_batch = min(DEFAULT_BATCH_SIZE, calls - batch * DEFAULT_BATCH_SIZE)
+        seconds += math.ceil(rows_in_batch / DEFAULT_MAX_WORKERS) * mean_latency
+    seconds += max(batches - 1, 0) * BATCH_PAUSE_SECONDS
+
+    return {
+        "rows": len(df),
+        "prescreened": len(prescreen),
+        "duplicates": len(duplicates),
+        "calls": calls,
+        "promptTokens": sum(stats["promptTokens"] for stats in by_model.values()),
+        "completionTokens": sum(stats["completionTokens"] for stats in by_model.values()),
+        "estimatedCostUsd": round(total_cost, 4) if total_cost is not None else None,
+        "byModel": by_model,
+        "latencySource": ",".join(sorted(latency_sources)) or None,
+        "batchSize": DEFAULT_BATCH_SIZE,
+        "maxWorkers": DEFAULT_MAX_WORKERS,
+        "estimatedSeconds": round(seconds, 1),
+    }
+
+
+def plan_run(
+    excel_path: str,
+    cfg: Dict[str, Any],
+    enable_quality_check: bool = True,
+    jira_base_url: Optional[str] = None,
+    jira_latency: Optional[float] = None,
+    llm_latency: Optional[float] = None,
+    measured_jira_latency: Optional[float] = None,
+    measured_llm_latencies: Optional[Dict[str, float]] = None,
+    df: Optional[pd.DataFrame] = None,
+) -> Dict[str, Any]:
+    """Plan a conversion of excel_path under a validated config without calling Jira or OpenAI.
+
+    Args:
+        excel_path: Sheet to plan for (.csv or Excel)
+        cfg: Validated config dict (as used by convert.run)
+        enable_quality_check: Whether LLM enrichment would run (data_quality.enabled wins, as in run())
+        jira_base_url: Tenant whose rate budget applies; the process default otherwise
+        jira_latency: Per-call Jira latency to assume instead of measured/default values
+        llm_latency: Per-call LLM latency to assume instead of measured/default values
+        measured_jira_latency: Mean Jira latency measured elsewhere, used instead of this process's metrics
+        measured_llm_latencies: Mean LLM latency per model measured elsewhere, used instead of this process's metrics
+        df: The sheet, if the caller has already read it from excel_path
+    """
+    excel_cfg = cfg.get("excel", {})
+    sheet_name = excel_cfg.get("sheet_name", "1. Requirements - Internal")
+    quality_cfg = cfg.get("data_quality", {}) or {}
+
+    if df is None:
+        df = _read_sheet(excel_path, sheet_name)
+    records = normalize_records(df.fillna("").to_dict(orient="records"), excel_cfg.get("columns", {}))
+    # Same guard as run(): rows without ID or epic never become tickets
+    records = [r for r in records if coalesce_str(r.get("requirement_id")) and coalesce_str(r.get("requirement"))]
+
+    plan: Dict[str, Any] = {"rows": len(df), "jira": plan_jira(records, jira_base_url, jira_latency, measured_jira_latency), "notes": []}
+    if quality_cfg.get("enabled", enable_quality_check):
+        plan["llm"] = plan_llm(df, quality_cfg, llm_latency, measured_llm_latencies)
+        if not os.getenv("OPENAI_API_KEY"):
+            plan["notes"].append("OPENAI_API_KEY is not set, so enrichment would be skipped")
+        plan["notes"].append("Structured responses that fail validation are re-asked; re-asks are not included")
+    else:
+        plan["llm"] = None
+    plan["notes"].append("Creates are upper bounds; existing epics and stories are skipped")
+
+    seconds = plan["jira"]["estimatedSeconds"] + (plan["llm"]["estimatedSeconds"] if plan["llm"] else 0.0)
+    plan["estimatedSeconds"] = round(seconds, 1)
+    plan["estimatedMinutes"] = round(seconds / 60, 1)
+    return plan
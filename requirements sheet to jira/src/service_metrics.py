@@ -0,0 +1,219 @@
+"""
+Process-wide service metrics rendered in the Prometheus text format.
+
+A minimal, dependency-free subset of the Prometheus client: labelled
+counters, gauges and histograms kept in one registry, plus callback metrics
+that are read at scrape time (e.g. active jobs, cache hits). The API serves
+REGISTRY.render() at /api/metrics; JiraClient, DataQualityChecker and
+convert.run feed the metrics defined at the bottom of this module.
+"""
+
+import math
+import threading
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple, Union
+
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0)
+
+LabelValues = Tuple[str, ...]
+Sample = Union[float, Dict[LabelValues, float]]
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str], extra: Optional[Tuple[str, str]] = None) -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(f'{extra[0]}="{extra[1]}"')
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+
+class _Metric:
+    kind = "untyped"
+
+    def __init__(self, name: str, documentation: str, labelnames: Iterable[str] = ()) -> None:
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+        self._function: Optional[Callable[[], Sample]] = None
+
+    def _key(self, labels: Dict[str, str]) -> LabelValues:
+        if set(labels) != set(self.labelnames):
+            raise ValueError(f"{self.name} expects labels {self.labelnames}, got {tuple(labels)}")
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    def set_function(self, fn: Callable[[], Sample]) -> None:
+        """Read the value at scrape time: a number, or {label values tuple: number} for labelled metrics."""
+        self._function = fn
+
+    def _samples(self) -> List[str]:
+        raise NotImplementedError
+
+    def render(self) -> str:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+        lines.extend(self._samples())
+        return "\n".join(lines)
+
+
+class _ValueMetric(_Metric):
+    def __init__(self, name: str, documentation: str, labelnames: Iterable[str] = ()) -> None:
+        super().__init__(name, documentation, labelnames)
+        self._values: Dict[LabelValues, float] = {}
+
+    def _add(self, amount: float, labels: Dict[str, str]) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def _samples(self) -> List[str]:
+        if self._function is not None:
+            value = self._function()
+            values = value if isinstance(value, dict) else {(): value}
+        else:
+            with self._lock:
+                values = dict(self._values)
+        return [f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(v)}" for key, v in sorted(values.items())]
+
+    def value(self, **labels: str) -> float:
+        with self._lock:
+            return self._values.get(self._key(labels), 0.0)
+
+
+class Counter(_ValueMetric):
+    kind = "counter"
+
+    def inc(self, amount: float = 1.0, **labels: str) -> None:
+        if amount < 0:
+            raise ValueError("Counters can only increase")
+        self._add(amount, labels)
+
+
+class Gauge(_ValueMetric):
+    kind = "gauge"
+
+    def inc(self, amount: float = 1.0, **labels: str) -> None:
+        self._add(amount, labels)
+
+    def dec(self, amount: float = 1.0, **labels: str) -> None:
+        self._add(-amount, labels)
+
+    def set(self, value: float, **labels: str) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = value
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, name: str, documentation: str, labelnames: Iterable[str] = (), buckets: Sequence[float] = DEFAULT_BUCKETS) -> None:
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # Per label set: per-bucket counts (non-cumulative, last is +Inf), sum
+        self._series: Dict[LabelValues, Tuple[List[int], List[float]]] = {}
+
+    def observe(self, value: float, **labels: str) -> None:
+        key = self._key(labels)
+        index = len(self.buckets)
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                index = i
+                break
+        with self._lock:
+            counts, total = self._series.setdefault(key, ([0] * (len(self.buckets) + 1), [0.0]))
+            counts[index] += 1
+            total[0] += value
+
+    def mean(self, **labels: str) -> Optional[float]:
+        """Mean observed value over every series matching the given labels; None without observations."""
+        positions = [(self.labelnames.index(name), str(value)) for name, value in labels.items()]
+        count, total = 0, 0.0
+        with self._lock:
+            for key, (counts, series_total) in self._series.items():
+                if all(key[i] == value for i, value in positions):
+                    count += sum(counts)
+                    total += series_total[0]
+        return total / count if count else None
+
+    def means(self, labelname: str, **labels: str) -> Dict[str, float]:
+        """Mean observed value per value of one label, over the series matching the other labels."""
+        index = self.labelnames.index(labelname)
+        positions = [(self.labelnames.index(name), str(value)) for name, value in labels.items()]
+        sums: Dict[str, List[float]] = {}
+        with self._lock:
+            for key, (counts, series_total) in self._series.items():
+                if all(key[i] == value for i, value in positions):
+                    entry = sums.setdefault(key[index], [0, 0.0])
+                    entry[0] += sum(counts)
+                    entry[1] += series_total[0]
+        return {value: total / count for value, (count, total) in sums.items() if count}
+
+    def _samples(self) -> List[str]:
+        with self._lock:
+            series = {key: (list(counts), total[0]) for key, (counts, total) in self._series.items()}
+        lines = []
+        for key, (counts, total) in sorted(series.items()):
+            cumulative = 0
+            for bound, count in zip(self.buckets + (math.inf,), counts):
+                cumulative += count
+                lines.append(f"{self.name}_bucket{_format_labels(self.labelnames, key, ('le', _format_value(bound)))} {cumulative}")
+            lines.append(f"{self.name}_sum{_format_labels(self.labelnames, key)} {_format_value(total)}")
+            lines.append(f"{self.name}_count{_format_labels(self.labelnames, key)} {cumulative}")
+        return lines
+
+
+class MetricsRegistry:
+    """Named collection of metrics rendered together for one scrape."""
+
+    def __init__(self) -> None:
+        self._metrics: Dict[str, _Metric] = {}
+        self._lock = threading.Lock()
+
+    def register(self, metric: _Metric) -> _Metric:
+        with self._lock:
+            if metric.name in self._metrics:
+                raise ValueError(f"Metric {metric.name} already registered")
+            self._metrics[metric.name] = metric
+        return metric
+
+    def render(self) -> str:
+        with self._lock:
+            metrics = list(self._metrics.values())
+        return "\n".join(metric.render() for metric in metrics) + "\n"
+
+
+REGISTRY = MetricsRegistry()
+
+
+def counter(name: str, documentation: str, labelnames: Iterable[str] = ()) -> Counter:
+    return REGISTRY.register(Counter(name, documentation, labelnames))
+
+
+def gauge(name: str, documentation: str, labelnames: Iterable[str] = ()) -> Gauge:
+    return REGISTRY.register(Gauge(name, documentation, labelnames))
+
+
+def histogram(name: str, documentation: str, labelnames: Iterable[str] = (), buckets: Sequence[float] = DEFAULT_BUCKETS) -> Histogram:
+    return REGISTRY.register(Histogram(name, documentation, labelnames, buckets))
+
+
+HTTP_REQUEST_SECONDS = histogram("peak3_http_request_duration_seconds", "API request latency by route", ["method", "endpoint", "status"])
+HTTP_REQUESTS_IN_FLIGHT = gauge("peak3_http_requests_in_flight", "API requests currently being handled")
+CONVERSIONS_IN_FLIGHT = gauge("peak3_conversions_in_flight", "Sheet conversions currently running")
+JOBS_ACTIVE = gauge("peak3_jobs_active", "Background conversion jobs queued or running")
+JIRA_REQUEST_SECONDS = histogram("peak3_jira_request_duration_seconds", "Outbound Jira API call latency per attempt", ["method", "endpoint", "status"])
+JIRA_RETRIES = counter("peak3_jira_retries_total", "Jira API attempts retried (429 and 5xx)", ["endpoint", "status"])
+OPENAI_REQUEST_SECONDS = histogram("peak3_openai_request_duration_seconds", "Outbound OpenAI chat completion latency", ["model", "outcome"])
+TICKETS = counter("peak3_jira_tickets_total", "Stories handled by conversions", ["outcome"])
+PARSE_TASKS_PENDING = gauge("peak3_parse_tasks_pending", "Sheet parse requests queued or running in the parse pool")
+PARSE_REJECTED = counter("peak3_parse_rejected_total", "Parse requests refused because the parse pool was full")
+CACHE_REQUESTS = counter("peak3_cache_requests_total", "Lookups in the service's result caches", ["cache", "result"])
@@ -0,0 +1,126 @@
+"""
+Near-duplicate detection for requirement descriptions.
+
+Requirement sheets often repeat the same journey for every tenant/partner with
+only the names swapped. This module builds MinHash signatures over normalized
+word shingles and uses LSH banding to find candidate pairs cheaply, so similar
+rows can share a single LLM enrichment call.
+"""
+
+import re
+import zlib
+from collections import defaultdict
+from typing import Any, Dict, Hashable, List, Optional, Sequence, Set
+
+import numpy as np
+
+from utils import coalesce_str
+
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+
+# Prime just above 2**32 so (a * x + b) stays inside uint64 for 32-bit hashes
+_MERSENNE_PRIME = np.uint64(4294967311)
+_MAX_HASH = np.uint64(0xFFFFFFFF)
+
+
+def normalize_text(text: Any) -> str:
+    """Lowercase and strip punctuation so cosmetic differences do not matter."""
+    return " ".join(_TOKEN_RE.findall(coalesce_str(text).lower()))
+
+
+def shingles(text: Any, k: int = 3) -> Set[str]:
+    """Return the set of k-word shingles of the normalized text."""
+    words = normalize_text(text).split()
+    if not words:
+        return set()
+    if len(words) <= k:
+        return {" ".join(words)}
+    return {" ".join(words[i:i + k]) for i in range(len(words) - k + 1)}
+
+
+class MinHashLSH:
+    """MinHash signatures with LSH banding for Jaccard near-duplicate search."""
+
+    def __init__(self, num_perm: int = 64, bands: int = 16, threshold: float = 0.8, shingle_size: int = 3, seed: int = 1) -> None:
+        if num_perm % bands:
+            raise ValueError("num_perm must be divisible by bands")
+        self.num_perm = num_perm
+        self.bands = bands
+        self.rows_per_band = num_perm // bands
+        self.threshold = threshold
+        self.shingle_size = shingle_size
+        rng = np.random.RandomState(seed)
+        self._a = rng.randint(1, 2**32 - 1, size=num_perm, dtype=np.uint64)
+        self._b = rng.randint(0, 2**32 - 1, size=num_perm, dtype=np.uint64)
+        self._signatures: Dict[Hashable, np.ndarray] = {}
+        self._buckets: List[Dict[bytes, List[Hashable]]] = [defaultdict(list) for _ in range(bands)]
+
+    def signature(self, shingle_set: Set[str]) -> Optional[np.ndarray]:
+        if not shingle_set:
+            return None
+        hashes = np.fromiter(
+            (zlib.crc32(s.encode("utf-8")) for s in shingle_set),
+            dtype=np.uint64,
+            count=len(shingle_set),
+        )
+        permuted = (np.outer(self._a, hashes) + self._b[:, None]) % _MERSENNE_PRIME
+        return (permuted & _MAX_HASH).min(axis=1)
+
+    def add(self, key: Hashable, text: Any) -> None:
+        sig = self.signature(shingles(text, self.shingle_size))
+        if sig is None:
+            return
+        self._signatures[key] = sig
+        for band in range(self.bands):
+            start = band * self.rows_per_band
+            band_key = sig[start:start + self.rows_per_band].tobytes()
+            self._buckets[band][band_key].append(key)
+
+    def similarity(self, left: Hashable, right: Hashable) -> float:
+        """Estimated Jaccard similarity of two indexed keys."""
+        return float(np.mean(self._signatures[left] == self._signatures[right]))
+
+    def clusters(self) -> List[List[Hashable]]:
+        """Group indexed keys into clusters of near-duplicates (size >= 2).
+
+        Candidate pairs come from shared LSH buckets and are confirmed against
+        the signature-estimated similarity before being merged.
+        """
+        parent: Dict[Hashable, Hashable] = {key: key for key in self._signatures}
+
+        def find(key: Hashable) -> Hashable:
+            while parent[key] != key:
+                parent[key] = parent[parent[key]]
+                key = parent[key]
+            return key
+
+        order = {key: pos for pos, key in enumerate(self._signatures)}
+        for buckets in self._buckets:
+            for members in buckets.values():
+                if len(members) < 2:
+                    continue
+                anchor = members[0]
+                for other in members[1:]:
+                    root_a, root_b = find(anchor), find(other)
+                    if root_a == root_b:
+                        continue
+                    if self.similarity(anchor, other) >= self.threshold:
+                        # Keep the earliest row as the root so it becomes the representative
+                        if order[root_a] <= order[root_b]:
+                            parent[root_b] = root_a
+                        else:
+                            parent[root_a] = root_b
+
+        groups: Dict[Hashable, List[Hashable]] = defaultdict(list)
+        for key in self._signatures:
+            groups[find(key)].append(key)
+        return [members for members in groups.values() if len(members) > 1]
+
+
+def find_near_duplicates(keys: Sequence[Hashable], texts: Sequence[Any], threshold: float = 0.8, num_perm: int = 64, bands: int = 16, shingle_size: int = 3) -> List[List[Hashable]]:
+    """Cluster near-duplicate texts; the first key of each cluster is its representative."""
+    index = MinHashLSH(num_perm=num_perm, bands=bands, threshold=threshold, shingle_size=shingle_size)
+    for key, text in zip(keys, texts):
+        index.add(key, text)
+    return index.clusters()
@@ -0,0 +1,94 @@
+"""
+Speculative background enrichment keyed by file hash.
+
+/api/validate starts LLM enrichment for an uploaded workbook in the
+background; /api/process later picks up the finished (or still running)
+result for the same file instead of starting from scratch.
+"""
+
+import logging
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional, Tuple
+
+
+logger = logging.getLogger(__name__)
+
+
+class SpeculativeEnrichment:
+    """Thread-safe registry of background enrichment jobs keyed by file hash."""
+
+    def __init__(self, max_workers: int = 2, ttl_seconds: float = 1800.0, max_entries: int = 32) -> None:
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="enrich")
+        self._jobs: Dict[str, Tuple[float, Future]] = {}
+        self._lock = threading.Lock()
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+
+    def start(self, key: str, fn: Callable[..., Any], *args: Any, prepare: Optional[Callable[[], Any]] = None, **kwargs: Any) -> Tuple[Future, bool]:
+        """Start fn in the background unless a live job for key already exists.
+        
+        Returns (future, started); started is False when an existing job was
+        reused. prepare(), if given, runs only for the caller that starts the
+        job (e.g. to copy the input) and its result becomes fn's first argument.
+        Failed jobs are not reused: the next start() for the key runs fn again.
+        """
+        with self._lock:
+            self._evict()
+            existing = self._jobs.get(key)
+            if existing is not None and not self._failed(existing[1]):
+                return existing[1], False
+            future: Future = Future()
+            future.set_running_or_notify_cancel()
+            self._jobs[key] = (time.time(), future)
+        try:
+            if prepare is not None:
+                args = (prepare(),) + args
+            inner = self._executor.submit(fn, *args, **kwargs)
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        inner.add_done_callback(lambda done: self._settle(future, done))
+        logger.info(f"Started speculative enrichment for {key[:12]}")
+        return future, True
+    
+    @staticmethod
+    def _failed(future: Future) -> bool:
+        return future.done() and future.exception() is not None
+    
+    @staticmethod
+    def _settle(future: Future, done: Future) -> None:
+        error = done.exception()
+        if error is not None:
+            future.set_exception(error)
+        else:
+            future.set_result(done.result())
+
+    def get(self, key: str) -> Optional[Future]:
+        with self._lock:
+            entry = self._jobs.get(key)
+            return entry[1] if entry else None
+
+    def result(self, key: str, timeout: Optional[float] = None) -> Any:
+        """Wait for the job for key and return its result; None if no job or it failed."""
+        future = self.get(key)
+        if future is None:
+            return None
+        if not future.done():
+            logger.info(f"Waiting for speculative enrichment {key[:12]} to finish")
+        try:
+            return future.result(timeout=timeout)
+        except Exception as e:
+            logger.warning(f"Speculative enrichment {key[:12]} failed: {e}")
+            return None
+
+    def _evict(self) -> None:
+        now = time.time()
+        for key, (started, future) in list(self._jobs.items()):
+            if future.done() and now - started > self.ttl_seconds:
+                del self._jobs[key]
+        if len(self._jobs) > self.max_entries:
+            finished = sorted((started, key) for key, (started, future) in self._jobs.items() if future.done())
+            for _, key in finished[:len(self._jobs) - self.max_entries]:
+                del self._jobs[key]
@@ -0,0 +1,146 @@
+"""
+Process-wide request scheduling per Jira tenant.
+
+Every JiraClient talking to the same Jira base URL draws from one shared
+token bucket, so concurrent conversions together stay at the tenant's quota
+instead of each retrying into a 429 storm. Waiting requests are queued per
+flow (one flow per conversion) and served round-robin, so a large job cannot
+starve small ones. A 429 pauses the whole tenant for its Retry-After.
+"""
+
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict, deque
+from typing import Any, Deque, Dict, Hashable, Optional, Tuple
+
+
+logger = logging.getLogger(__name__)
+
+
+def default_budget() -> Tuple[float, float]:
+    """(rate, burst) from JIRA_RATE_LIMIT / JIRA_RATE_BURST, read on use so .env values apply."""
+    return float(os.getenv("JIRA_RATE_LIMIT", "10")), float(os.getenv("JIRA_RATE_BURST", "10"))
+
+
+class TenantScheduler:
+    """Token bucket with round-robin fair queuing between flows."""
+
+    def __init__(self, rate: float = 10.0, burst: float = 10.0) -> None:
+        """
+        Args:
+            rate: Sustained requests per second allowed against the tenant (> 0)
+            burst: Bucket size, i.e. requests that may be sent back to back (>= 1)
+        """
+        if rate <= 0:
+            raise ValueError(f"Jira rate limit must be positive, got {rate}")
+        if burst < 1:
+            raise ValueError(f"Jira rate burst must be at least 1, got {burst}")
+        self.rate = rate
+        self.burst = burst
+        self._tokens = self.burst
+        self._updated = time.monotonic()
+        self._paused_until = 0.0
+        self._queues: "OrderedDict[Hashable, Deque[object]]" = OrderedDict()
+        self._cond = threading.Condition()
+        self.granted = 0
+        self.throttled = 0
+
+    def _refill(self, now: float) -> None:
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def _is_next(self, flow: Hashable, ticket: object) -> bool:
+        head_flow = next(iter(self._queues))
+        return head_flow == flow and self._queues[flow][0] is ticket
+
+    def acquire(self, flow: Hashable) -> float:
+        """Block until this flow may send one request; returns seconds waited."""
+        started = time.monotonic()
+        ticket = object()
+        with self._cond:
+            self._queues.setdefault(flow, deque()).append(ticket)
+            while True:
+                if not self._is_next(flow, ticket):
+                    self._cond.wait()
+                    continue
+                now = time.monotonic()
+                self._refill(now)
+                delay = self._paused_until - now
+                if delay <= 0 and self._tokens >= 1:
+                    self._tokens -= 1
+                    self.granted += 1
+                    queue = self._queues[flow]
+                    queue.popleft()
+                    # Round-robin: the flow goes to the back of the line (or leaves it)
+                    if queue:
+                        self._queues.move_to_end(flow)
+                    else:
+                        del self._queues[flow]
+                    self._cond.notify_all()
+                    return now - started
+                self._cond.wait(max(delay, (1 - self._tokens) / self.rate))
+
+    def penalize(self, seconds: float) -> None:
+        """Pause all flows for this tenant, e.g. after a 429 with Retry-After."""
+        with self._cond:
+            self.throttled += 1
+            self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+            self._tokens = 0.0
+            self._cond.notify_all()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._cond:
+            return {
+                "rate": self.rate,
+                "granted": self.granted,
+                "throttled": self.throttled,
+                "waitingFlows": len(self._queues),
+                "waitingRequests": sum(len(queue) for queue in self._queues.values()),
+            }
+
+
+# None marks a tenant configured as unlimited
+_schedulers: Dict[str, Optional[TenantScheduler]] = {}
+_schedulers_lock = threading.Lock()
+
+
+def _tenant_key(base_url: str) -> str:
+    return base_url.rstrip("/").lower()
+
+
+def get_tenant_scheduler(base_url: str) -> Optional[TenantScheduler]:
+    """Shared scheduler for a Jira base URL.
+
+    Returns None (unlimited) when the tenant was configured with rate <= 0,
+    or when JIRA_RATE_LIMIT <= 0 and the tenant has no budget of its own.
+    """
+    key = _tenant_key(base_url)
+    with _schedulers_lock:
+        if key in _schedulers:
+            return _schedulers[key]
+        rate, burst = default_budget()
+        if rate <= 0:
+            return None
+        scheduler = _schedulers[key] = TenantScheduler(rate, burst)
+        return scheduler
+
+
+def configure_tenant(base_url: str, rate: float, burst: Optional[float] = None) -> Optional[TenantScheduler]:
+    """Set the rate budget for one tenant (replacing any existing scheduler); rate <= 0 means unlimited."""
+    scheduler = None
+    if rate > 0:
+        scheduler = TenantScheduler(rate, burst if burst is not None else default_budget()[1])
+        logger.info(f"Jira rate budget for {base_url}: {rate}/s (burst {scheduler.burst:g})")
+    else:
+        logger.info(f"Jira rate budget for {base_url}: unlimited")
+    with _schedulers_lock:
+        _schedulers[_tenant_key(base_url)] = scheduler
+    return scheduler
+
+
+def scheduler_stats() -> Dict[str, Dict[str, Any]]:
+    with _schedulers_lock:
+        items = [(key, scheduler) for key, scheduler in _schedulers.items() if scheduler is not None]
+    return {key: scheduler.stats() for key, scheduler in items}
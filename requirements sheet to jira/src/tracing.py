@@ -0,0 +1,274 @@
+"""
+Lightweight request tracing.
+
+Spans form a tree per trace (an API request, a job or a CLI run): the Flask
+request, convert.run and its stages, per-row LLM enrichment, and every
+outbound Jira or OpenAI call. The current span is tracked in a contextvar;
+work handed to thread pools keeps its parent through bind().
+
+Finished spans go to the configured exporter:
+
+- TRACE_FILE=traces.jsonl appends one JSON object per span
+- OTLP_ENDPOINT=http://localhost:4318 posts OTLP/HTTP JSON batches to
+  <endpoint>/v1/traces (any OpenTelemetry collector, or a local stand-in)
+
+With neither set, tracing is off and spans cost next to nothing.
+"""
+
+import contextvars
+import json
+import logging
+import os
+import queue
+import secrets
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+import requests
+
+
+logger = logging.getLogger(__name__)
+
+SERVICE_NAME = "peak3-requirements-to-jira"
+
+
+class Span:
+    """One timed operation with attributes; ended by the start_span context manager."""
+
+    def __init__(self, name: str, trace_id: str, parent_id: Optional[str], attributes: Dict[str, Any]) -> None:
+        self.name = name
+        self.trace_id = trace_id
+        self.span_id = secrets.token_hex(8)
+        self.parent_id = parent_id
+        self.attributes = dict(attributes)
+        self.start_ns = time.time_ns()
+        self.end_ns: Optional[int] = None
+        self.status = "ok"
+        self.error: Optional[str] = None
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        self.attributes[key] = value
+
+    def set_attributes(self, **attributes: Any) -> None:
+        self.attributes.update(attributes)
+
+    def record_error(self, error: BaseException) -> None:
+        self.status = "error"
+        self.error = f"{type(error).__name__}: {error}"
+
+    def to_dict(self) -> Dict[str, Any]:
+        end_ns = self.end_ns or time.time_ns()
+        return {
+            "traceId": self.trace_id,
+            "spanId": self.span_id,
+            "parentSpanId": self.parent_id,
+            "name": self.name,
+            "startTimeUnixNano": self.start_ns,
+            "endTimeUnixNano": end_ns,
+            "durationMs": round((end_ns - self.start_ns) / 1e6, 3),
+            "attributes": self.attributes,
+            "status": self.status,
+            "error": self.error,
+        }
+
+
+class _NoopSpan:
+    """Stand-in used while tracing is off."""
+
+    trace_id = span_id = parent_id = None
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        pass
+
+    def set_attributes(self, **attributes: Any) -> None:
+        pass
+
+    def record_error(self, error: BaseException) -> None:
+        pass
+
+
+NOOP_SPAN = _NoopSpan()
+
+
+class JsonlExporter:
+    """Append each finished span as one JSON line."""
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._lock = threading.Lock()
+
+    def export(self, span: Span) -> None:
+        line = json.dumps(span.to_dict(), default=str)
+        with self._lock, open(self.path, "a", encoding="utf-8") as f:
+            f.write(line + "\n")
+
+    def shutdown(self) -> None:
+        pass
+
+
+class OtlpHttpExporter:
+    """Batch spans on a background thread and post them as OTLP/HTTP JSON."""
+
+    def __init__(self, endpoint: str, batch_size: int = 256, interval: float = 2.0) -> None:
+        self.url = endpoint.rstrip("/") + "/v1/traces"
+        self.batch_size = batch_size
+        self.interval = interval
+        self._queue: "queue.Queue[Optional[Span]]" = queue.Queue(maxsize=10000)
+        # Started with the first span, so configuring tracing at import starts no thread
+        # (the API forks its parse workers after import)
+        self._thread: Optional[threading.Thread] = None
+        self._thread_lock = threading.Lock()
+
+    def export(self, span: Span) -> None:
+        if self._thread is None:
+            with self._thread_lock:
+                if self._thread is None:
+                    self._thread = threading.Thread(target=self._worker, name="otlp-export", daemon=True)
+                    self._thread.start()
+        try:
+            self._queue.put_nowait(span)
+        except queue.Full:
+            pass  # Never block the traced work on a slow collector
+
+    def _worker(self) -> None:
+        batch: List[Span] = []
+        stopping = False
+        while not stopping:
+            deadline = time.monotonic() + self.interval
+            while len(batch) < self.batch_size:
+                try:
+                    span = self._queue.get(timeout=max(deadline - time.monotonic(), 0.01))
+                except queue.Empty:
+                    break
+                if span is None:
+                    stopping = True
+                    break
+                batch.append(span)
+            if batch:
+                self._post(batch)
+                batch = []
+
+    def _post(self, spans: List[Span]) -> None:
+        try:
+            requests.post(self.url, json=_otlp_payload(spans), timeout=5)
+        except requests.RequestException as e:
+            logger.warning(f"Dropped {len(spans)} span(s); OTLP export to {self.url} failed: {e}")
+
+    def shutdown(self) -> None:
+        if self._thread is None:
+            return
+        self._queue.put(None)
+        self._thread.join(timeout=5)
+
+
+def _otlp_value(value: Any) -> Dict[str, Any]:
+    if isinstance(value, bool):
+        return {"boolValue": value}
+    if isinstance(value, int):
+        return {"intValue": str(value)}
+    if isinstance(value, float):
+        return {"doubleValue": value}
+    return {"stringValue": str(value)}
+
+
+def _otlp_payload(spans: List[Span]) -> Dict[str, Any]:
+    return {"resourceSpans": [{
+        "resource": {"attributes": [{"key": "service.name", "value": {"stringValue": SERVICE_NAME}}]},
+        "scopeSpans": [{
+            "scope": {"name": __name__},
+            "spans": [{
+                "traceId": span.trace_id,
+                "spanId": span.span_id,
+                "parentSpanId": span.parent_id or "",
+                "name": span.name,
+                "kind": 1,
+                "startTimeUnixNano": str(span.start_ns),
+                "endTimeUnixNano": str(span.end_ns or span.start_ns),
+                "attributes": [{"key": k, "value": _otlp_value(v)} for k, v in span.attributes.items() if v is not None],
+                "status": {"code": 2, "message": span.error or ""} if span.status == "error" else {"code": 1},
+            } for span in spans],
+        }],
+    }]}
+
+
+_exporter: Optional[Any] = None
+_current: "contextvars.ContextVar[Optional[Span]]" = contextvars.ContextVar("current_span", default=None)
+
+
+def configure(exporter: Optional[Any]) -> None:
+    """Install an exporter (None turns tracing off)."""
+    global _exporter
+    previous, _exporter = _exporter, exporter
+    if previous is not None and previous is not exporter:
+        previous.shutdown()
+
+
+def configure_from_env() -> None:
+    """Enable tracing from TRACE_FILE or OTLP_ENDPOINT, if either is set."""
+    if os.getenv("OTLP_ENDPOINT"):
+        configure(OtlpHttpExporter(os.environ["OTLP_ENDPOINT"]))
+        logger.info(f"Tracing to OTLP collector at {os.environ['OTLP_ENDPOINT']}")
+    elif os.getenv("TRACE_FILE"):
+        configure(JsonlExporter(os.environ["TRACE_FILE"]))
+        logger.info(f"Tracing to {os.environ['TRACE_FILE']}")
+
+
+def is_enabled() -> bool:
+    return _exporter is not None
+
+
+def current_span() -> Optional[Span]:
+    return _current.get()
+
+
+def begin_span(name: str, parent: Optional[Span] = None, **attributes: Any) -> Any:
+    """Start a span and make it current; pair with finish_span (for hooks that cannot use `with`)."""
+    if _exporter is None:
+        return NOOP_SPAN, None
+    parent = parent or _current.get()
+    span = Span(name, parent.trace_id if parent else secrets.token_hex(16), parent.span_id if parent else None, attributes)
+    return span, _current.set(span)
+
+
+def finish_span(span: Any, token: Optional[contextvars.Token]) -> None:
+    if token is not None:
+        _current.reset(token)
+    if isinstance(span, Span):
+        span.end_ns = time.time_ns()
+        exporter = _exporter
+        if exporter is not None:
+            try:
+                exporter.export(span)
+            except Exception as e:
+                logger.warning(f"Span export failed: {e}")
+
+
+@contextmanager
+def start_span(name: str, **attributes: Any) -> Iterator[Any]:
+    """Run a block as a child of the current span (or as a new trace)."""
+    span, token = begin_span(name, **attributes)
+    try:
+        yield span
+    except BaseException as e:
+        span.record_error(e)
+        raise
+    finally:
+        finish_span(span, token)
+
+
+def bind(fn: Callable[..., Any]) -> Callable[..., Any]:
+    """Wrap fn so it runs under the caller's current span, e.g. on another thread."""
+    parent = _current.get()
+
+    def bound(*args: Any, **kwargs: Any) -> Any:
+        token = _current.set(parent)
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            _current.reset(token)
+    return bound
@@ -1,5 +1,8 @@
+import copy
+import hashlib
 import os
-from typing import Any, Dict, List, Optional
+import threading
+from typing import Any, Dict, List, Optional, Tuple
 
 import yaml
 from dotenv import load_dotenv
@@ -10,9 +13,60 @@ def load_env() -> None:
     load_dotenv(override=False)
 
 
+# Config sections that must be mappings when present
+CONFIG_SECTIONS = ("excel", "jira", "data_quality", "texting", "llm")
+
+# Parsed config files keyed by absolute path, with the (mtime, size) they were parsed at
+_config_cache: Dict[str, Tuple[Tuple[int, int], Dict[str, Any]]] = {}
+_config_cache_lock = threading.Lock()
+
+
+def validate_config(cfg: Any) -> Dict[str, Any]:
+    """Check the shape of a conversion config and return it.
+
+    Raises ValueError when the config or one of its sections is not a mapping,
+    so callers can use the sections without further type checks.
+    """
+    if not isinstance(cfg, dict):
+        raise ValueError("Config must be a mapping")
+    for section in CONFIG_SECTIONS:
+        if cfg.get(section) is not None and not isinstance(cfg[section], dict):
+            raise ValueError(f"Config section '{section}' must be a mapping")
+    if not isinstance((cfg.get("excel") or {}).get("columns", {}), dict):
+        raise ValueError("excel.columns must be a mapping")
+    if not isinstance((cfg.get("jira") or {}).get("priority_mapping", {}), dict):
+        raise ValueError("jira.priority_mapping must be a mapping")
+    return cfg
+
+
 def load_yaml_config(path: str) -> Dict[str, Any]:
-    with open(path, "r", encoding="utf-8") as f:
-        return yaml.safe_load(f) or {}
+    """Load and validate a YAML config, re-parsing only when the file changes.
+
+    Parsed configs are cached by path and invalidated by mtime/size; each call
+    returns its own copy so callers may modify it.
+    """
+    stat = os.stat(path)
+    key = os.path.abspath(path)
+    stamp = (stat.st_mtime_ns, stat.st_size)
+    with _config_cache_lock:
+        cached = _config_cache.get(key)
+    if cached is None or cached[0] != stamp:
+        with open(path, "r", encoding="utf-8") as f:
+            cfg = validate_config(yaml.safe_load(f) or {})
+        with _config_cache_lock:
+            _config_cache[key] = (stamp, cfg)
+    else:
+        cfg = cached[1]
+    return copy.deepcopy(cfg)
+
+
+def sha256_file(path: str, chunk_size: int = 1024 * 1024) -> str:
+    """Hex SHA-256 digest of a file, read in chunks."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
 
 
 def get_env(name: str, default: Optional[str] = None) -> Optional[str]: